@@ -0,0 +1,94 @@
+"""Micro-benchmark: keyword search over a synthetic local mirror.
+
+Usage:
+    python benchmarks/bench_fts.py [--messages 1000000] [--repeat 20]
+
+Builds a throwaway mirror through ``Mirror.apply`` (so the FTS5 index is
+maintained by the same triggers as ``sekha sync``) and prints one JSON
+object with index build time and per-query latency percentiles.
+"""
+import argparse
+import json
+import random
+import tempfile
+import time
+from itertools import accumulate
+from pathlib import Path
+from typing import Any, Dict, List
+
+from sekha_cli.mirror import Mirror
+from sekha_cli.stats import percentile
+
+MESSAGES_PER_CONVERSATION = 20
+PAGE_SIZE = 500
+VOCABULARY_SIZE = 50_000
+# Word frequencies follow Zipf's law like natural text, so a query's cost
+# depends on how common its words are. Queries pick words by frequency rank.
+VOCABULARY = [f"w{rank}" for rank in range(1, VOCABULARY_SIZE + 1)]
+CUM_WEIGHTS = list(accumulate(1 / rank for rank in range(1, VOCABULARY_SIZE + 1)))
+QUERIES = ("w20000", "w5000", "w1000 w2000", "w300 w400", "w1234*")
+
+
+def synthetic_page(
+    start: int, count: int, rng: random.Random
+) -> List[Dict[str, Any]]:
+    """Build ``count`` conversations numbered from ``start``."""
+    return [
+        {
+            "id": f"conv-{start + c:08d}",
+            "label": f"Bench{(start + c) % 10}",
+            "created_at": "2026-01-01T00:00:00Z",
+            "messages": [
+                {
+                    "role": "user" if i % 2 == 0 else "assistant",
+                    "content": " ".join(
+                        rng.choices(VOCABULARY, cum_weights=CUM_WEIGHTS, k=12 + i % 24)
+                    ),
+                }
+                for i in range(MESSAGES_PER_CONVERSATION)
+            ],
+        }
+        for c in range(count)
+    ]
+
+
+def run(messages: int = 100_000, repeat: int = 20) -> Dict[str, Any]:
+    """Index ``messages`` messages, then time each query ``repeat`` times."""
+    rng = random.Random(0)
+    conversations = messages // MESSAGES_PER_CONVERSATION
+    with tempfile.TemporaryDirectory() as tmp:
+        with Mirror(Path(tmp) / "mirror.sqlite3") as mirror:
+            started = time.perf_counter()
+            for start in range(0, conversations, PAGE_SIZE):
+                count = min(PAGE_SIZE, conversations - start)
+                mirror.apply(synthetic_page(start, count, rng))
+            build = time.perf_counter() - started
+
+            latencies = []
+            for _ in range(repeat):
+                for query in QUERIES:
+                    started = time.perf_counter()
+                    mirror.full_text_search(query, limit=10)
+                    latencies.append(time.perf_counter() - started)
+
+    return {
+        "benchmark": "fts_search",
+        "messages": conversations * MESSAGES_PER_CONVERSATION,
+        "build_seconds": build,
+        "queries": len(latencies),
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "max_ms": max(latencies) * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    print(json.dumps(run(args.messages, args.repeat)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Micro-benchmark: render synthetic conversations to Markdown.
+
+Usage:
+    python benchmarks/bench_markdown.py [--messages 100000] [--repeat 5]
+
+Prints one JSON object with the best wall time and messages per second.
+"""
+import argparse
+import io
+import json
+import time
+from typing import Any, Dict, List
+
+from sekha_cli.markdown import MarkdownRenderer
+
+MESSAGES_PER_CONVERSATION = 20
+
+
+def synthetic_conversations(messages: int) -> List[Dict[str, Any]]:
+    """Build conversations totalling ``messages`` messages of varied length."""
+    conversations = []
+    for start in range(0, messages, MESSAGES_PER_CONVERSATION):
+        count = min(MESSAGES_PER_CONVERSATION, messages - start)
+        conversations.append(
+            {
+                "id": f"conv-{start // MESSAGES_PER_CONVERSATION:08d}",
+                "label": "Bench",
+                "created_at": "2026-01-01T00:00:00Z",
+                "messages": [
+                    {
+                        "role": "user" if i % 2 == 0 else "assistant",
+                        "content": "lorem ipsum dolor sit amet " * (1 + i % 8),
+                    }
+                    for i in range(count)
+                ],
+            }
+        )
+    return conversations
+
+
+def run(messages: int = 100_000, repeat: int = 5) -> Dict[str, Any]:
+    """Render ``messages`` messages ``repeat`` times and report the best run."""
+    conversations = synthetic_conversations(messages)
+    renderer = MarkdownRenderer()
+    best = float("inf")
+    size = 0
+    for _ in range(repeat):
+        out = io.StringIO()
+        started = time.perf_counter()
+        for conv in conversations:
+            renderer.write(conv, out.write)
+        best = min(best, time.perf_counter() - started)
+        size = out.tell()
+    return {
+        "benchmark": "markdown_render",
+        "messages": messages,
+        "seconds": best,
+        "messages_per_second": messages / best if best else 0.0,
+        "output_chars": size,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    print(json.dumps(run(args.messages, args.repeat)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Run the full benchmark suite and save machine-readable results.
+
+Usage:
+    python benchmarks/run_suite.py [--sizes 1000,10000,100000]
+        [--latency-ms 1] [--output benchmarks/results/<version>.json]
+
+Runs every ``sekha bench`` scenario against the local stand-in controller at
+each size, plus the Markdown rendering and full-text search micro-benchmarks,
+and writes one JSON document. Compare two releases with ``sekha bench --compare OLD.json``.
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from bench_fts import run as run_fts
+from bench_markdown import run as run_markdown
+
+from sekha_cli import __version__
+from sekha_cli.bench import SUITE_SIZES, run_benchmarks
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", default=",".join(str(size) for size in SUITE_SIZES)
+    )
+    parser.add_argument("--latency-ms", type=float, default=1.0)
+    parser.add_argument(
+        "--output", type=Path, default=RESULTS_DIR / f"{__version__}.json"
+    )
+    args = parser.parse_args()
+
+    def report(result):
+        print(
+            f"{result['scenario']:>7} @ {result['size']:>7}: "
+            f"{result['wall_seconds']:.2f}s, {result['requests']} requests",
+            file=sys.stderr,
+        )
+
+    results = run_benchmarks(
+        sizes=[int(size) for size in args.sizes.split(",")],
+        latency=args.latency_ms / 1000,
+        on_result=report,
+    )
+    results["micro"] = [run_markdown(), run_fts()]
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    print(f"Results written to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
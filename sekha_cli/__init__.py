@@ -1,4 +1,9 @@
 """
 Sekha CLI - Command-line interface for Sekha AI Memory Controller.
 """
+import time as _time
+
+# Taken before anything else is imported, so ``--trace`` can report startup.
+STARTED = _time.perf_counter()
+
 __version__ = "0.1.0"
\ No newline at end of file
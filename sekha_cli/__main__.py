@@ -0,0 +1,24 @@
+"""Console entry point for ``sekha`` (also ``python -m sekha_cli``).
+
+Shell completion of labels and conversation ids is answered from the
+completion cache before click or the rest of the CLI is imported; every
+other invocation runs the click group in ``main``.
+"""
+import os
+
+
+def main() -> None:
+    """Run the CLI."""
+    if os.environ.get("_SEKHA_COMPLETE"):
+        from .completion import fast_complete
+
+        if fast_complete(os.environ):
+            return
+
+    from .main import cli
+
+    cli(prog_name="sekha")
+
+
+if __name__ == "__main__":
+    main()
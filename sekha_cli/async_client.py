@@ -0,0 +1,247 @@
+"""Asyncio client for high-fanout Sekha scripting."""
+import asyncio
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    TextIO,
+    Tuple,
+    TypeVar,
+)
+
+from .client import ARCHIVE_BATCH_SIZE, SekhaClient
+from .pipeline import retry_call
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+DEFAULT_CONCURRENCY = 16
+DEFAULT_TIMEOUT = 30.0
+
+
+class AsyncSekhaClient:
+    """Asyncio-native sibling of ``SekhaClient`` with the same methods.
+
+    Every call runs the synchronous SDK on a dedicated thread pool that
+    shares one ``SekhaClient`` and therefore one HTTP connection pool. A
+    semaphore caps requests in flight at ``concurrency`` and single-request
+    calls are bounded by ``timeout`` seconds. A timed-out call stops being
+    awaited, but its worker thread finishes the underlying request.
+
+    Example:
+        async with AsyncSekhaClient(url, key, concurrency=64) as client:
+            results = await asyncio.gather(*(client.query(q) for q in queries))
+    """
+
+    def __init__(
+        self,
+        base_url: str = "",
+        api_key: str = "",
+        concurrency: int = DEFAULT_CONCURRENCY,
+        timeout: Optional[float] = DEFAULT_TIMEOUT,
+        client: Optional[Any] = None,
+    ):
+        self.client = client or SekhaClient(base_url=base_url, api_key=api_key)
+        self.base_url = self.client.base_url
+        self.concurrency = max(concurrency, 1)
+        self.timeout = timeout
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.concurrency, thread_name_prefix="sekha-async"
+        )
+
+    async def __aenter__(self) -> "AsyncSekhaClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Shut down the worker pool."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def run(
+        self,
+        func: Callable[..., R],
+        *args: Any,
+        timeout: Optional[float] = None,
+        **kwargs: Any,
+    ) -> R:
+        """Run a blocking call on the pool under the concurrency limit."""
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(
+                self._executor, functools.partial(func, *args, **kwargs)
+            )
+            return await asyncio.wait_for(future, timeout)
+
+    async def run_timed(
+        self,
+        func: Callable[..., R],
+        *args: Any,
+        timeout: Optional[float] = None,
+        **kwargs: Any,
+    ) -> Tuple[R, float]:
+        """Like ``run``, also returning how long ``func`` itself took.
+
+        The clock runs on the worker thread around the call, so time spent
+        queued for a free slot is not counted.
+        """
+
+        def timed() -> Tuple[R, float]:
+            started = time.perf_counter()
+            result = func(*args, **kwargs)
+            return result, time.perf_counter() - started
+
+        return await self.run(timed, timeout=timeout)
+
+    async def query(
+        self, query: str, label: Optional[str] = None, limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """Search conversations with semantic query."""
+        return await self.run(
+            self.client.query, query, label=label, limit=limit, timeout=self.timeout
+        )
+
+    async def query_batch(
+        self, requests: Sequence[Dict[str, Any]]
+    ) -> List[List[Dict[str, Any]]]:
+        """Run several searches, in one request when the SDK supports it."""
+        return await self.run(self.client.query_batch, requests, timeout=self.timeout)
+
+    async def store_conversation(self, file_path: str, label: str) -> Dict[str, Any]:
+        """Store conversation from JSON file."""
+        return await self.run(
+            self.client.store_conversation, file_path, label, timeout=self.timeout
+        )
+
+    async def store_messages(
+        self,
+        messages: List[Dict[str, Any]],
+        label: str,
+        idempotency_key: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Store an already-loaded list of messages as a conversation."""
+        return await self.run(
+            self.client.store_messages,
+            messages,
+            label,
+            idempotency_key=idempotency_key,
+            timeout=self.timeout,
+        )
+
+    async def get_conversation(
+        self, conversation_id: str, cache: Optional[Any] = None
+    ) -> Dict[str, Any]:
+        """Get full conversation details."""
+        return await self.run(
+            self.client.get_conversation,
+            conversation_id,
+            cache=cache,
+            timeout=self.timeout,
+        )
+
+    async def archive(self, conversation_id: str) -> None:
+        """Archive a conversation."""
+        await self.run(self.client.archive, conversation_id, timeout=self.timeout)
+
+    async def get_pruning_suggestions(self) -> List[Dict[str, Any]]:
+        """Get pruning suggestions."""
+        return await self.run(
+            self.client.get_pruning_suggestions, timeout=self.timeout
+        )
+
+    async def list_labels(self, concurrency: int = 1) -> List[Dict[str, Any]]:
+        """List all labels with conversation counts (no per-call timeout)."""
+        return await self.run(self.client.list_labels, concurrency=concurrency)
+
+    async def export(self, label: str, format: str = "markdown") -> str:
+        """Export conversations by label (no per-call timeout)."""
+        return await self.run(self.client.export, label, format=format)
+
+    async def export_to(self, label: str, stream: TextIO, **kwargs: Any) -> int:
+        """Stream conversations with a label to a text stream."""
+        return await self.run(self.client.export_to, label, stream, **kwargs)
+
+    async def archive_many(
+        self, conversation_ids: Sequence[str], attempts: int = 3
+    ) -> AsyncIterator[Tuple[str, Optional[BaseException]]]:
+        """Archive many conversations, yielding ``(id, error)`` as each finishes.
+
+        Batches go to the controller's bulk endpoint when the SDK has one,
+        and ids of a failed batch fall back to ``concurrency`` single archives;
+        otherwise ids are archived concurrently, each retried with backoff.
+        """
+        if self.client._supports("archive_many"):
+            for start in range(0, len(conversation_ids), ARCHIVE_BATCH_SIZE):
+                batch = list(conversation_ids[start : start + ARCHIVE_BATCH_SIZE])
+                outcomes = await self.run(
+                    lambda b=batch: list(
+                        self.client.archive_many(
+                            b, concurrency=self.concurrency, attempts=attempts
+                        )
+                    )
+                )
+                for outcome in outcomes:
+                    yield outcome
+            return
+
+        async def archive_one(conversation_id: str) -> None:
+            await self.run(
+                retry_call,
+                self.client.archive,
+                conversation_id,
+                attempts=attempts,
+                timeout=self.timeout,
+            )
+
+        async for conversation_id, _, error in self.map_unordered(
+            archive_one, conversation_ids
+        ):
+            yield conversation_id, error
+
+    async def map_unordered(
+        self,
+        func: Callable[[T], Awaitable[Any]],
+        items: Iterable[T],
+    ) -> AsyncIterator[Tuple[T, Any, Optional[BaseException]]]:
+        """Await ``func`` over items, yielding ``(item, result, error)`` as done.
+
+        Items are pulled lazily, keeping at most ``2 * concurrency`` tasks
+        alive so arbitrarily long inputs run in bounded memory.
+        """
+        source = iter(items)
+        window = self.concurrency * 2
+        pending: Dict["asyncio.Future[Any]", T] = {}
+
+        def fill() -> None:
+            while len(pending) < window:
+                try:
+                    item = next(source)
+                except StopIteration:
+                    return
+                pending[asyncio.ensure_future(func(item))] = item
+
+        try:
+            fill()
+            while pending:
+                done, _ = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    item = pending.pop(task)
+                    error = task.exception()
+                    yield item, None if error else task.result(), error
+                fill()
+        finally:
+            for task in pending:
+                task.cancel()
@@ -0,0 +1,126 @@
+"""Batch execution of many semantic queries."""
+import json
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    TextIO,
+    Tuple,
+)
+
+BATCH_CHUNK_SIZE = 50
+
+
+def iter_batch_queries(
+    stream: TextIO, default_label: Optional[str], default_limit: int
+) -> Iterator[Dict[str, Any]]:
+    """Parse a batch file into query requests.
+
+    Each non-blank line is either plain query text or a JSON object with
+    ``query`` and optional ``label`` and ``limit``. Lines starting with ``#``
+    are comments.
+    """
+    for number, line in enumerate(stream, start=1):
+        text = line.strip()
+        if not text or text.startswith("#"):
+            continue
+
+        if text.startswith("{"):
+            try:
+                spec = json.loads(text)
+            except ValueError as e:
+                raise ValueError(f"Line {number}: invalid JSON ({e})") from e
+            if not spec.get("query"):
+                raise ValueError(f"Line {number}: missing 'query'")
+        else:
+            spec = {"query": text}
+
+        yield {
+            "query": spec["query"],
+            "label": spec.get("label", default_label),
+            "limit": int(spec.get("limit", default_limit)),
+        }
+
+
+async def run_query_batch(
+    aclient: Any, requests: Iterator[Dict[str, Any]]
+) -> AsyncIterator[Dict[str, Any]]:
+    """Run queries concurrently, yielding one result record per query.
+
+    Uses the controller's batch search endpoint in chunks when the SDK has
+    one, otherwise one search per query. Records are yielded in completion
+    order and carry the request, ``results`` or ``error``, and ``latency``
+    in seconds. Queries sent in a chunk have no latency of their own; their
+    records carry the ``chunk`` number and that request's ``chunk_latency``.
+    """
+    if aclient.client._supports("search_batch"):
+        async for record in _run_chunked(aclient, requests):
+            yield record
+        return
+
+    async def timed(request: Dict[str, Any]) -> float:
+        request["results"], latency = await aclient.run_timed(
+            aclient.client.query, **_search_args(request), timeout=aclient.timeout
+        )
+        return latency
+
+    async for request, latency, error in aclient.map_unordered(timed, requests):
+        yield _record(request, latency, error)
+
+
+async def _run_chunked(
+    aclient: Any, requests: Iterator[Dict[str, Any]]
+) -> AsyncIterator[Dict[str, Any]]:
+    """Send queries through the batch endpoint ``BATCH_CHUNK_SIZE`` at a time."""
+
+    async def timed(numbered: Tuple[int, List[Dict[str, Any]]]) -> float:
+        _, chunk = numbered
+        results, latency = await aclient.run_timed(
+            aclient.client.query_batch,
+            [_search_args(r) for r in chunk],
+            timeout=aclient.timeout,
+        )
+        for request, result in zip(chunk, results, strict=True):
+            request["results"] = result
+        return latency
+
+    chunks = enumerate(_chunks(requests))
+    async for (number, chunk), latency, error in aclient.map_unordered(timed, chunks):
+        for request in chunk:
+            record = _record(request, None, error)
+            record["chunk"] = number
+            record["chunk_latency"] = latency
+            yield record
+
+
+def _chunks(requests: Iterator[Dict[str, Any]]) -> Iterator[List[Dict[str, Any]]]:
+    chunk: List[Dict[str, Any]] = []
+    for request in requests:
+        chunk.append(request)
+        if len(chunk) == BATCH_CHUNK_SIZE:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _search_args(request: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "query": request["query"],
+        "label": request["label"],
+        "limit": request["limit"],
+    }
+
+
+def _record(
+    request: Dict[str, Any], latency: Optional[float], error: Optional[BaseException]
+) -> Dict[str, Any]:
+    record = dict(request)
+    if error is not None:
+        record["error"] = str(error)
+        record.pop("results", None)
+    record["latency"] = latency
+    return record
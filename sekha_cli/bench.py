@@ -0,0 +1,490 @@
+"""End-to-end CLI benchmarks against a local stand-in controller.
+
+``StandInServer`` is a small threaded HTTP server holding a synthetic
+dataset, with a configurable per-request latency and counters for requests
+and bytes. Each scenario runs ``sekha`` in a fresh interpreter whose
+``MemoryController`` is replaced by ``StandInController``, an HTTP client
+for that server, so everything above the SDK seam (paging, rendering,
+concurrency, startup) is exercised as in production.
+"""
+import atexit
+import http.client
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+from . import __version__
+
+SCENARIOS = ("query", "labels", "export", "store", "prune")
+DEFAULT_SIZES = (1_000, 10_000)
+SUITE_SIZES = (1_000, 10_000, 100_000)
+LABEL_COUNT = 10
+MESSAGES_PER_CONVERSATION = 4
+# One conversation in this many is suggested for pruning.
+PRUNE_EVERY = 100
+# Bulk store imports this fraction of the dataset size.
+STORE_FRACTION = 10
+
+BENCH_API_KEY = "sk-bench-0000000000000000"
+
+
+def make_conversation(index: int, label: Optional[str] = None) -> Dict[str, Any]:
+    """Build one deterministic synthetic conversation."""
+    return {
+        "id": f"conv-{index:08d}",
+        "label": label or f"Label-{index % LABEL_COUNT:02d}",
+        "created_at": f"2026-01-01T00:{index // 60 % 60:02d}:{index % 60:02d}Z",
+        "status": "active",
+        "messages": [
+            {
+                "role": "user" if i % 2 == 0 else "assistant",
+                "content": f"Message {i} of conversation {index}. " * (1 + i % 4),
+            }
+            for i in range(MESSAGES_PER_CONVERSATION)
+        ],
+    }
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    """Route JSON requests to the server's dataset."""
+
+    protocol_version = "HTTP/1.1"
+    server: "StandInServer"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        self._handle("GET")
+
+    def do_POST(self) -> None:
+        self._handle("POST")
+
+    def _handle(self, method: str) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        try:
+            status, result = self.server.route(
+                method, self.path, json.loads(body) if body else {}
+            )
+        except Exception as e:
+            status, result = 500, {"error": str(e)}
+
+        payload = json.dumps(result).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+        self.server.count(len(body), len(payload))
+
+
+class StandInServer(ThreadingHTTPServer):
+    """Local HTTP controller serving a synthetic dataset of ``size`` conversations."""
+
+    daemon_threads = True
+
+    def __init__(self, size: int, latency: float = 0.0):
+        super().__init__(("127.0.0.1", 0), _StandInHandler)
+        self.latency = latency
+        self.conversations: Dict[str, Dict[str, Any]] = {}
+        self.order: List[str] = []
+        self.by_label: Dict[str, List[str]] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        for index in range(size):
+            self._add(make_conversation(index))
+        self.reset_counters()
+
+    @property
+    def url(self) -> str:
+        """Base URL clients should use."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StandInServer":
+        """Serve requests on a background thread."""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and close the socket."""
+        self.shutdown()
+        self.server_close()
+
+    def reset_counters(self) -> None:
+        """Zero the request and byte counters."""
+        with self._lock:
+            self.requests = 0
+            self.bytes_received = 0
+            self.bytes_sent = 0
+
+    def count(self, received: int, sent: int) -> None:
+        """Account for one served request."""
+        with self._lock:
+            self.requests += 1
+            self.bytes_received += received
+            self.bytes_sent += sent
+
+    def route(self, method: str, path: str, body: Dict[str, Any]) -> Tuple[int, Any]:
+        """Answer one API request."""
+        parts = [p for p in urlparse(path).path.split("/") if p]
+        if method == "POST" and parts == ["search"]:
+            return 200, self._search(body)
+        if method == "POST" and parts == ["conversations"]:
+            with self._lock:
+                conv = make_conversation(len(self.conversations), body.get("label"))
+                conv["messages"] = body.get("messages", [])
+                self._add(conv)
+            return 201, {"id": conv["id"]}
+        if method == "GET" and parts == ["prune", "suggestions"]:
+            return 200, [
+                {"id": conv_id, "reason": "low importance"}
+                for n, conv_id in enumerate(self.order)
+                if n % PRUNE_EVERY == 0
+                and self.conversations[conv_id]["status"] != "archived"
+            ]
+        if len(parts) >= 2 and parts[0] == "conversations":
+            conv = self.conversations.get(parts[1])
+            if conv is None:
+                return 404, {"error": "Conversation not found"}
+            if method == "GET" and len(parts) == 2:
+                return 200, conv
+            if method == "POST" and parts[2:] == ["archive"]:
+                conv["status"] = "archived"
+                return 200, {}
+        return 404, {"error": f"No route for {method} {path}"}
+
+    def _add(self, conv: Dict[str, Any]) -> None:
+        self.conversations[conv["id"]] = conv
+        self.order.append(conv["id"])
+        self.by_label.setdefault(conv["label"], []).append(conv["id"])
+
+    def _search(self, body: Dict[str, Any]) -> List[Dict[str, Any]]:
+        label = body.get("label")
+        ids = self.by_label.get(label, []) if label else self.order
+        offset = int(body.get("offset") or 0)
+        limit = int(body.get("limit") or 10)
+        page = [self.conversations[i] for i in ids[offset : offset + limit]]
+
+        if body.get("query"):
+            return [
+                {
+                    "id": conv["id"],
+                    "label": conv["label"],
+                    "preview": conv["messages"][0]["content"],
+                    "score": 1.0 / (rank + 1),
+                }
+                for rank, conv in enumerate(page)
+            ]
+        fields = body.get("fields")
+        if fields:
+            return [{f: conv.get(f) for f in fields} for conv in page]
+        return page
+
+
+class StandInConfig:
+    """Stand-in for the SDK's ``MemoryConfig``."""
+
+    def __init__(self, base_url: str, api_key: str):
+        self.base_url = base_url
+        self.api_key = api_key
+
+
+class StandInController:
+    """Minimal ``MemoryController`` speaking to a ``StandInServer`` over HTTP.
+
+    One keep-alive connection is kept per thread, like a pooled SDK client.
+    """
+
+    def __init__(self, config: StandInConfig):
+        parsed = urlparse(config.base_url)
+        self._host = parsed.hostname or "127.0.0.1"
+        self._port = parsed.port or 80
+        self._headers = {
+            "Authorization": f"Bearer {config.api_key}",
+            "Content-Type": "application/json",
+        }
+        self._local = threading.local()
+
+    def search(
+        self,
+        query: str,
+        label: Optional[str] = None,
+        limit: int = 10,
+        offset: int = 0,
+        fields: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        body = {"query": query, "label": label, "limit": limit, "offset": offset}
+        if fields:
+            body["fields"] = fields
+        return self._request("POST", "/search", body)
+
+    def create(
+        self,
+        messages: List[Dict[str, Any]],
+        label: str,
+        idempotency_key: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        return self._request(
+            "POST", "/conversations", {"messages": messages, "label": label}
+        )
+
+    def get(self, conversation_id: str) -> Dict[str, Any]:
+        return self._request("GET", f"/conversations/{conversation_id}")
+
+    def archive(self, conversation_id: str) -> None:
+        self._request("POST", f"/conversations/{conversation_id}/archive", {})
+
+    def get_pruning_suggestions(self) -> List[Dict[str, Any]]:
+        return self._request("GET", "/prune/suggestions")
+
+    def _request(
+        self, method: str, path: str, body: Optional[Dict[str, Any]] = None
+    ) -> Any:
+        payload = json.dumps(body).encode("utf-8") if body is not None else None
+        for attempt in (1, 2):
+            conn = getattr(self._local, "conn", None)
+            if conn is None:
+                conn = http.client.HTTPConnection(self._host, self._port, timeout=60)
+                self._local.conn = conn
+            try:
+                conn.request(method, path, body=payload, headers=self._headers)
+                response = conn.getresponse()
+                data = response.read()
+                break
+            except (ConnectionError, http.client.HTTPException):
+                conn.close()
+                self._local.conn = None
+                if attempt == 2:
+                    raise
+        result = json.loads(data)
+        if response.status >= 400:
+            raise RuntimeError(result.get("error", f"HTTP {response.status}"))
+        return result
+
+
+def scenario_commands(
+    scenario: str, size: int, workdir: Path
+) -> Tuple[List[str], Optional[str]]:
+    """CLI arguments and stdin for one scenario."""
+    if scenario == "query":
+        return ["query", "benchmark query", "--limit", "10", "--format", "json"], None
+    if scenario == "labels":
+        return ["labels", "list"], None
+    if scenario == "export":
+        output = workdir / f"export-{size}.jsonl"
+        return [
+            "export",
+            "--label",
+            "Label-00",
+            "--output",
+            str(output),
+            "--format",
+            "jsonl",
+        ], None
+    if scenario == "store":
+        source = workdir / f"import-{size}.jsonl"
+        with source.open("w", encoding="utf-8") as f:
+            for index in range(max(size // STORE_FRACTION, 1)):
+                conv = make_conversation(index, "Imported")
+                f.write(json.dumps({"messages": conv["messages"]}) + "\n")
+        return [
+            "store",
+            "--input",
+            str(source),
+            "--label",
+            "Imported",
+            "--journal",
+            str(workdir / f"journal-{size}"),
+            "--retry-file",
+            str(workdir / f"failed-{size}.jsonl"),
+        ], None
+    if scenario == "prune":
+        return ["prune"], "y\n"
+    raise ValueError(f"Unknown scenario: {scenario}")
+
+
+def run_scenario(
+    server: StandInServer, scenario: str, size: int, workdir: Path
+) -> Dict[str, Any]:
+    """Run one scenario in a fresh interpreter and measure it."""
+    args, stdin = scenario_commands(scenario, size, workdir)
+    rss_file = workdir / "peak-rss"
+    rss_file.unlink(missing_ok=True)
+    env = dict(
+        os.environ,
+        SEKHA_API_URL=server.url,
+        SEKHA_API_KEY=BENCH_API_KEY,
+        SEKHA_NO_DAEMON="1",
+        SEKHA_CACHE_DIR=str(workdir / "cache"),
+        SEKHA_BENCH_RSS_FILE=str(rss_file),
+    )
+    env.pop("SEKHA_CACHE", None)
+
+    server.reset_counters()
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "sekha_cli.bench", *args],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        env=env,
+    )
+    stderr, peak_rss_kb = _wait_with_peak_rss(proc, stdin)
+    wall = time.perf_counter() - started
+    if rss_file.exists():
+        peak_rss_kb = int(rss_file.read_text())
+
+    return {
+        "scenario": scenario,
+        "size": size,
+        "latency_ms": server.latency * 1000,
+        "wall_seconds": wall,
+        "requests": server.requests,
+        "bytes_sent": server.bytes_sent,
+        "bytes_received": server.bytes_received,
+        "peak_rss_kb": peak_rss_kb,
+        "exit_code": proc.returncode,
+        "error": stderr.decode("utf-8", "replace").strip()[-500:]
+        if proc.returncode
+        else None,
+    }
+
+
+def run_benchmarks(
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    scenarios: Sequence[str] = SCENARIOS,
+    latency: float = 0.001,
+    on_result: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> Dict[str, Any]:
+    """Run every scenario at every dataset size.
+
+    Returns ``{"meta": ..., "results": [...]}``, ready to be saved as JSON
+    and compared against another release with ``compare_results``.
+    """
+    results = []
+    with tempfile.TemporaryDirectory(prefix="sekha-bench-") as tmp:
+        for size in sizes:
+            server = StandInServer(size, latency=latency).start()
+            try:
+                for scenario in scenarios:
+                    result = run_scenario(server, scenario, size, Path(tmp))
+                    results.append(result)
+                    if on_result is not None:
+                        on_result(result)
+            finally:
+                server.stop()
+    return {
+        "meta": {
+            "version": __version__,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "started_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        },
+        "results": results,
+    }
+
+
+def compare_results(
+    baseline: Dict[str, Any], current: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    """Pair up matching scenarios and report how wall time and RSS changed."""
+    previous = {(r["scenario"], r["size"]): r for r in baseline.get("results", [])}
+    rows = []
+    for result in current.get("results", []):
+        before = previous.get((result["scenario"], result["size"]))
+        if before is None:
+            continue
+        rows.append(
+            {
+                "scenario": result["scenario"],
+                "size": result["size"],
+                "wall_ratio": _ratio(result["wall_seconds"], before["wall_seconds"]),
+                "rss_ratio": _ratio(result["peak_rss_kb"], before["peak_rss_kb"]),
+                "requests_delta": result["requests"] - before["requests"],
+            }
+        )
+    return rows
+
+
+def _ratio(new: Optional[float], old: Optional[float]) -> Optional[float]:
+    return new / old if new is not None and old else None
+
+
+def _wait_with_peak_rss(
+    proc: "subprocess.Popen[bytes]", stdin: Optional[str]
+) -> Tuple[bytes, Optional[int]]:
+    """Feed ``stdin``, collect stderr and reap the child with its peak RSS (KiB).
+
+    ``os.wait4`` reports resource usage for that one child; where it is
+    missing (Windows) the RSS is ``None``.
+    """
+    if not hasattr(os, "wait4"):
+        _, stderr = proc.communicate(stdin.encode() if stdin else None)
+        return stderr, None
+
+    assert proc.stdin is not None and proc.stderr is not None
+    if stdin:
+        proc.stdin.write(stdin.encode())
+    proc.stdin.close()
+    stderr = proc.stderr.read()
+    proc.stderr.close()
+    _, status, usage = os.wait4(proc.pid, 0)
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    peak = usage.ru_maxrss
+    return stderr, peak // 1024 if sys.platform == "darwin" else peak
+
+
+def _peak_rss_from_proc() -> Optional[int]:
+    """This process's own peak RSS (``VmHWM``) in KiB, on Linux.
+
+    Unlike ``ru_maxrss``, it is not inflated by the parent's memory at fork.
+    """
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def _child_main(argv: List[str]) -> None:
+    """Run the CLI with the SDK controller swapped for the stand-in."""
+    rss_file = os.environ.get("SEKHA_BENCH_RSS_FILE")
+    if rss_file:
+
+        def record_peak_rss() -> None:
+            peak = _peak_rss_from_proc()
+            if peak is not None:
+                Path(rss_file).write_text(str(peak))
+
+        atexit.register(record_peak_rss)
+
+    from . import client as client_module
+
+    client_module.MemoryConfig = StandInConfig
+    client_module.MemoryController = StandInController
+
+    from .main import cli
+
+    cli.main(args=argv, prog_name="sekha")
+
+
+if __name__ == "__main__":
+    _child_main(sys.argv[1:])
@@ -0,0 +1,283 @@
+"""Local on-disk caches for controller responses."""
+import hashlib
+import json
+import sqlite3
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+DEFAULT_TTL = 300
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS query_cache (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS query_cache_accessed ON query_cache (accessed_at);
+CREATE TABLE IF NOT EXISTS cache_stats (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+_OBJECT_SCHEMA = """
+CREATE TABLE IF NOT EXISTS objects (
+    digest TEXT PRIMARY KEY,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS conversation_refs (
+    id TEXT PRIMARY KEY,
+    digest TEXT NOT NULL REFERENCES objects (digest),
+    etag TEXT,
+    updated_at TEXT,
+    status TEXT,
+    fetched_at REAL NOT NULL
+);
+"""
+
+# Conversations in these states are treated as immutable and never revalidated.
+IMMUTABLE_STATUSES = ("archived",)
+
+
+def open_database(path: Path, check_same_thread: bool = True) -> sqlite3.Connection:
+    """Open (and create if needed) a cache database."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path), timeout=5, check_same_thread=check_same_thread)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+class QueryCache:
+    """SQLite-backed cache of search results with TTL and LRU eviction."""
+
+    def __init__(
+        self,
+        path: Path,
+        ttl: float = DEFAULT_TTL,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.conn = open_database(path)
+        self.conn.executescript(_SCHEMA)
+
+    @staticmethod
+    def key(base_url: str, query: str, label: Optional[str], limit: int) -> str:
+        """Build the cache key for a search."""
+        raw = json.dumps([base_url.rstrip("/"), query, label, limit])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return a fresh cached value, or ``None`` on a miss."""
+        now = time.time()
+        row = self.conn.execute(
+            "SELECT value, created_at FROM query_cache WHERE key = ?", (key,)
+        ).fetchone()
+
+        with self.conn:
+            if row is None or now - row[1] > self.ttl:
+                if row is not None:
+                    self.conn.execute("DELETE FROM query_cache WHERE key = ?", (key,))
+                self._bump("misses")
+                return None
+
+            self.conn.execute(
+                "UPDATE query_cache SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self._bump("hits")
+        return json.loads(row[0])
+
+    def put(self, key: str, value: Any) -> None:
+        """Store a value and evict least recently used entries over budget."""
+        payload = json.dumps(value, separators=(",", ":"))
+        size = len(payload.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+
+        now = time.time()
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO query_cache "
+                "(key, value, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, payload, size, now, now),
+            )
+            self._evict()
+
+    def stats(self) -> Dict[str, Any]:
+        """Report entry count, bytes used and hit rate."""
+        entries, used = self.conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM query_cache"
+        ).fetchone()
+        counters = dict(self.conn.execute("SELECT name, value FROM cache_stats"))
+        hits = counters.get("hits", 0)
+        misses = counters.get("misses", 0)
+        lookups = hits + misses
+        return {
+            "path": str(self.path),
+            "entries": entries,
+            "bytes": used,
+            "max_bytes": self.max_bytes,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+        }
+
+    def clear(self) -> int:
+        """Remove every entry and reset counters; returns entries removed."""
+        with self.conn:
+            removed = self.conn.execute("DELETE FROM query_cache").rowcount
+            self.conn.execute("DELETE FROM cache_stats")
+        self.conn.execute("VACUUM")
+        return removed
+
+    def close(self) -> None:
+        """Close the database."""
+        self.conn.close()
+
+    def _bump(self, name: str) -> None:
+        self.conn.execute(
+            "INSERT INTO cache_stats (name, value) VALUES (?, 1) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + 1",
+            (name,),
+        )
+
+    def _evict(self) -> None:
+        (used,) = self.conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM query_cache"
+        ).fetchone()
+        if used <= self.max_bytes:
+            return
+
+        rows = self.conn.execute(
+            "SELECT key, size FROM query_cache ORDER BY accessed_at"
+        ).fetchall()
+        stale = []
+        for key, size in rows:
+            if used <= self.max_bytes:
+                break
+            stale.append((key,))
+            used -= size
+        self.conn.executemany("DELETE FROM query_cache WHERE key = ?", stale)
+
+
+class CachedConversation:
+    """A conversation read from the local cache plus its validators."""
+
+    def __init__(
+        self,
+        conversation: Dict[str, Any],
+        etag: Optional[str],
+        updated_at: Optional[str],
+        status: Optional[str],
+        fetched_at: float,
+    ):
+        self.conversation = conversation
+        self.etag = etag
+        self.updated_at = updated_at
+        self.status = status
+        self.fetched_at = fetched_at
+
+    @property
+    def immutable(self) -> bool:
+        """Whether the conversation can be served without revalidation."""
+        return self.status in IMMUTABLE_STATUSES
+
+
+class ConversationCache:
+    """Content-addressed store of full conversations.
+
+    Bodies are stored once per sha256 digest (zlib-compressed); each id points
+    at its latest digest along with the ETag/``updated_at`` validators needed
+    to revalidate it.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.conn = open_database(path)
+        self.conn.executescript(_OBJECT_SCHEMA)
+
+    def get(self, conversation_id: str) -> Optional[CachedConversation]:
+        """Look up a cached conversation by id."""
+        row = self.conn.execute(
+            "SELECT o.body, r.etag, r.updated_at, r.status, r.fetched_at "
+            "FROM conversation_refs r JOIN objects o ON o.digest = r.digest "
+            "WHERE r.id = ?",
+            (conversation_id,),
+        ).fetchone()
+        if row is None:
+            return None
+        body, etag, updated_at, status, fetched_at = row
+        conversation = json.loads(zlib.decompress(body))
+        return CachedConversation(conversation, etag, updated_at, status, fetched_at)
+
+    def put(self, conversation: Dict[str, Any]) -> str:
+        """Store a conversation under its id and return its content digest."""
+        payload = json.dumps(conversation, sort_keys=True, separators=(",", ":"))
+        raw = payload.encode("utf-8")
+        digest = hashlib.sha256(raw).hexdigest()
+
+        previous = self.conn.execute(
+            "SELECT digest FROM conversation_refs WHERE id = ?", (conversation["id"],)
+        ).fetchone()
+
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR IGNORE INTO objects (digest, body, size) VALUES (?, ?, ?)",
+                (digest, zlib.compress(raw), len(raw)),
+            )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO conversation_refs "
+                "(id, digest, etag, updated_at, status, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    conversation["id"],
+                    digest,
+                    conversation.get("etag"),
+                    conversation.get("updated_at"),
+                    conversation.get("status"),
+                    time.time(),
+                ),
+            )
+            if previous and previous[0] != digest:
+                self.conn.execute(
+                    "DELETE FROM objects WHERE digest = ? AND NOT EXISTS "
+                    "(SELECT 1 FROM conversation_refs WHERE digest = ?)",
+                    (previous[0], previous[0]),
+                )
+        return digest
+
+    def touch(self, conversation_id: str) -> None:
+        """Mark a cached conversation as just revalidated."""
+        with self.conn:
+            self.conn.execute(
+                "UPDATE conversation_refs SET fetched_at = ? WHERE id = ?",
+                (time.time(), conversation_id),
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        """Report cached conversation count and uncompressed bytes."""
+        conversations, used = self.conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(o.size), 0) "
+            "FROM conversation_refs r JOIN objects o ON o.digest = r.digest"
+        ).fetchone()
+        return {"conversations": conversations, "bytes": used}
+
+    def clear(self) -> int:
+        """Remove every cached conversation; returns how many were removed."""
+        with self.conn:
+            removed = self.conn.execute("DELETE FROM conversation_refs").rowcount
+            self.conn.execute("DELETE FROM objects")
+        self.conn.execute("VACUUM")
+        return removed
+
+    def close(self) -> None:
+        """Close the database."""
+        self.conn.close()
@@ -1,24 +1,68 @@
 """Sekha API client for CLI operations."""
+import inspect
+import io
 import json
-from typing import Any, Dict, List, Optional
+from datetime import datetime
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Collection,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    TextIO,
+    Tuple,
+    Union,
+)
 
 from sekha import MemoryController, MemoryConfig
 
+from .incremental import conversation_timestamp, parse_timestamp
+from .markdown import MarkdownRenderer, MarkdownTemplate
+from .metrics import MeteredController, registry
+from .output import MarkdownWriter, OutputFile, RecordWriter, record_writer
+from .pipeline import prefetch_pages, retry_call, run_bounded
+from .trace import TracedController, traced, tracer
+
+if TYPE_CHECKING:
+    from .cache import ConversationCache
+    from .mirror import Mirror
+
+EXPORT_FORMATS = ("markdown", "json", "jsonl")
+DEFAULT_PAGE_SIZE = 100
+LABEL_SCAN_PAGE_SIZE = 500
+LABEL_SCAN_FIELDS = ("id", "label")
+ARCHIVE_BATCH_SIZE = 100
+
 
 class SekhaClient:
     """Enhanced client for Sekha CLI operations."""
     
-    def __init__(self, base_url: str, api_key: str):
+    def __init__(self, base_url: str, api_key: str, controller: Any = None):
+        """Connect to the controller, or wrap ``controller`` (a local mirror)."""
         self.base_url = base_url.rstrip("/")
         self.api_key = api_key
-        self.controller = MemoryController(
-            MemoryConfig(base_url=base_url, api_key=api_key)
-        )
+        if controller is None:
+            controller = MemoryController(
+                MemoryConfig(base_url=base_url, api_key=api_key)
+            )
+            if registry.enabled:
+                controller = MeteredController(controller)
+        self.controller = controller
+        if tracer.enabled:
+            self.controller = TracedController(self.controller)
         self.headers = {
             "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json"
         }
+        self.last_labels_path: Optional[str] = None
+        self.last_export_watermark: Optional[str] = None
+        self.last_export_watermark_ids: List[str] = []
     
+    @traced("client.query")
     def query(self, query: str, label: Optional[str] = None, limit: int = 10) -> List[Dict[str, Any]]:
         """Search conversations with semantic query."""
         try:
@@ -26,7 +70,24 @@ class SekhaClient:
             return response
         except Exception as e:
             raise RuntimeError(f"Query failed: {str(e)}") from e
+
+    @traced("client.query_batch")
+    def query_batch(
+        self, requests: Sequence[Dict[str, Any]]
+    ) -> List[List[Dict[str, Any]]]:
+        """Run several searches, in one request when the SDK has a batch endpoint.
+
+        Each request holds ``query``, ``label`` and ``limit``; results come back
+        in the same order.
+        """
+        if not self._supports("search_batch"):
+            return [self.query(**request) for request in requests]
+        try:
+            return list(self.controller.search_batch(list(requests)))
+        except Exception as e:
+            raise RuntimeError(f"Query failed: {str(e)}") from e
     
+    @traced("client.store_conversation")
     def store_conversation(self, file_path: str, label: str) -> Dict[str, Any]:
         """Store conversation from JSON file."""
         with open(file_path) as f:
@@ -36,60 +97,347 @@ class SekhaClient:
         if not messages:
             raise ValueError("No messages found in file")
         
-        result = self.controller.create(messages=messages, label=label)
+        return self.store_messages(messages, label)
+
+    @traced("client.store_messages")
+    def store_messages(
+        self,
+        messages: List[Dict[str, Any]],
+        label: str,
+        idempotency_key: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Store an already-loaded list of messages as a conversation.
+
+        ``idempotency_key`` is forwarded when the SDK accepts one, so a retried
+        create is deduplicated by the controller.
+        """
+        kwargs: Dict[str, Any] = {"messages": messages, "label": label}
+        if idempotency_key and self._accepts(self.controller.create, "idempotency_key"):
+            kwargs["idempotency_key"] = idempotency_key
+        result = self.controller.create(**kwargs)
         return {"id": result["id"], "label": label}
     
-    def list_labels(self) -> List[Dict[str, Any]]:
-        """List all labels with conversation counts."""
-        # Get all conversations with empty query
-        conversations = self.controller.search("", limit=1000)
-        label_counts = {}
-        
-        for conv in conversations:
-            label = conv.get("label", "Unknown")
-            label_counts[label] = label_counts.get(label, 0) + 1
-        
-        return [{"name": name, "count": count} for name, count in sorted(label_counts.items())]
+    @traced("client.list_labels")
+    def list_labels(self, concurrency: int = 1) -> List[Dict[str, Any]]:
+        """List all labels with conversation counts.
+
+        Uses the controller's label aggregation endpoint when available and
+        otherwise falls back to a paginated, metadata-only scan. The path
+        taken is recorded in ``last_labels_path``.
+        """
+        labels, self.last_labels_path = self.count_labels(concurrency)
+        return labels
+
+    def count_labels(self, concurrency: int = 1) -> Tuple[List[Dict[str, Any]], str]:
+        """List labels like ``list_labels``, returning ``(labels, path)``.
 
+        Safe to call from several threads: nothing is recorded on the client.
+        """
+        if self._supports("label_counts"):
+            path = "aggregate"
+            label_counts = self._normalize_label_counts(self.controller.label_counts())
+        else:
+            path = "scan"
+            label_counts = {}
+            pages = self.iter_pages(
+                page_size=LABEL_SCAN_PAGE_SIZE,
+                concurrency=concurrency,
+                fields=LABEL_SCAN_FIELDS,
+            )
+            for page in pages:
+                for conv in page:
+                    label = conv.get("label", "Unknown")
+                    label_counts[label] = label_counts.get(label, 0) + 1
+
+        labels = [
+            {"name": name, "count": count}
+            for name, count in sorted(label_counts.items())
+        ]
+        return labels, path
+
+    @traced("client.export")
     def export(self, label: str, format: str = "markdown") -> str:
         """Export conversations by label."""
-        # Get all conversations and filter by label
-        all_conversations = self.controller.search("", limit=1000)
-        conversations = [c for c in all_conversations if c.get("label") == label]
-        
+        buffer = io.StringIO()
+        self.export_to(label, buffer, format=format)
+        return buffer.getvalue()
+
+    @traced("client.export_to")
+    def export_to(
+        self,
+        label: str,
+        stream: Union[TextIO, OutputFile],
+        format: str = "markdown",
+        page_size: int = DEFAULT_PAGE_SIZE,
+        concurrency: int = 1,
+        since: Optional[datetime] = None,
+        template: Optional[MarkdownTemplate] = None,
+        seen_ids: Collection[str] = (),
+    ) -> int:
+        """Stream conversations with a label to a text stream, page by page.
+
+        ``json`` is a compact array with one conversation per line and
+        ``jsonl`` has one conversation per line with no enclosing array.
+        A chunked ``OutputFile`` is rotated between conversations. With
+        ``since``, only conversations created or updated at or after it are
+        written, except ``seen_ids`` changed exactly at ``since``; the newest
+        timestamp seen is left in ``last_export_watermark`` and the ids
+        changed at it in ``last_export_watermark_ids``. ``template``
+        customizes Markdown output. Returns the number of
+        conversations written.
+        """
+        if format not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported format: {format}")
+
         if format == "markdown":
-            return self._export_markdown(conversations)
-        elif format == "json":
-            return json.dumps(conversations, indent=2)
+            writer: RecordWriter = MarkdownWriter(stream, MarkdownRenderer(template))
         else:
-            raise ValueError(f"Unsupported format: {format}")
-    
-    def get_conversation(self, conversation_id: str) -> Dict[str, Any]:
-        """Get full conversation details."""
-        return self.controller.get(conversation_id)
+            writer = record_writer(format, stream)
+        writer.begin()
+
+        count = 0
+        pages = self._iter_export_pages(
+            label, page_size, concurrency, since, seen_ids=seen_ids
+        )
+        for page in pages:
+            for conv in page:
+                writer.write(conv)
+                count += 1
+            stream.flush()
+
+        writer.end()
+        return count
+
+    @traced("client.export_columnar")
+    def export_columnar(
+        self,
+        label: str,
+        path: Path,
+        format: str = "parquet",
+        page_size: int = DEFAULT_PAGE_SIZE,
+        concurrency: int = 1,
+        since: Optional[datetime] = None,
+    ) -> Tuple[int, int]:
+        """Export conversations with a label as a Parquet or Arrow message table.
+
+        Each fetched page is written as its own row group. Needs ``pyarrow``.
+        Returns ``(conversations, rows)``.
+        """
+        from .columnar import write_columnar
+
+        pages = self._iter_export_pages(label, page_size, concurrency, since)
+        return write_columnar(pages, path, format=format)
+
+    def iter_pages(
+        self,
+        label: Optional[str] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        concurrency: int = 1,
+        fields: Optional[Sequence[str]] = None,
+        since: Optional[datetime] = None,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Yield conversations one page at a time, filtered by label server-side.
+
+        With ``concurrency`` above one, that many page requests are kept in
+        flight while pages are still yielded in offset order. ``fields``
+        restricts each record to those keys and ``since`` skips older
+        conversations, when the controller supports them.
+        """
+        def fetch(offset: int, limit: int) -> List[Dict[str, Any]]:
+            return self._fetch_page(label, offset, limit, fields=fields, since=since)
+
+        return prefetch_pages(fetch, page_size, concurrency=concurrency)
+
+    @traced("client.sync_to")
+    def sync_to(
+        self,
+        mirror: "Mirror",
+        page_size: int = DEFAULT_PAGE_SIZE,
+        concurrency: int = 1,
+        full: bool = False,
+    ) -> Tuple[int, int]:
+        """Pull conversations changed since the mirror's watermark into it.
+
+        With ``full``, everything is pulled again and conversations the
+        controller no longer returns are dropped from the mirror. Returns
+        ``(synced, removed)``.
+        """
+        since = None if full else parse_timestamp(mirror.watermark)
+        mirror.begin(full=full)
+        synced = 0
+        for page in self._iter_export_pages(None, page_size, concurrency, since):
+            synced += mirror.apply(page)
+        removed = mirror.finish(self.last_export_watermark)
+        return synced, removed
+
+    @traced("client.get_conversation")
+    def get_conversation(
+        self, conversation_id: str, cache: Optional["ConversationCache"] = None
+    ) -> Dict[str, Any]:
+        """Get full conversation details.
+
+        With a ``cache``, archived conversations are served locally and other
+        cached ones are revalidated with a conditional get (``if_none_match``
+        / ``if_modified_since``) when the SDK supports it; a ``None`` reply
+        means "not modified" and skips the transfer.
+        """
+        if cache is None:
+            return self.controller.get(conversation_id)
+
+        cached = cache.get(conversation_id)
+        if cached is not None:
+            if cached.immutable:
+                return cached.conversation
+
+            conditions: Dict[str, Any] = {}
+            if cached.etag and self._accepts(self.controller.get, "if_none_match"):
+                conditions["if_none_match"] = cached.etag
+            if cached.updated_at and self._accepts(
+                self.controller.get, "if_modified_since"
+            ):
+                conditions["if_modified_since"] = cached.updated_at
+
+            if conditions:
+                conv = self.controller.get(conversation_id, **conditions)
+                if conv is None:
+                    cache.touch(conversation_id)
+                    return cached.conversation
+                cache.put(conv)
+                return conv
+
+        conv = self.controller.get(conversation_id)
+        if conv.get("id"):
+            cache.put(conv)
+        return conv
     
+    @traced("client.get_pruning_suggestions")
     def get_pruning_suggestions(self) -> List[Dict[str, Any]]:
         """Get pruning suggestions."""
         return self.controller.get_pruning_suggestions()
     
+    @traced("client.archive")
     def archive(self, conversation_id: str) -> None:
         """Archive a conversation."""
         self.controller.archive(conversation_id)
+
+    @traced("client.archive_many")
+    def archive_many(
+        self,
+        conversation_ids: Sequence[str],
+        concurrency: int = 1,
+        attempts: int = 3,
+    ) -> Iterator[Tuple[str, Optional[BaseException]]]:
+        """Archive many conversations, yielding ``(id, error)`` as each finishes.
+
+        Uses the controller's bulk ``archive_many`` endpoint in batches when
+        available; a failed batch, or an SDK without one, falls back to a
+        bounded pool of single archives retried with backoff. A failing id is
+        reported instead of aborting the rest.
+        """
+        def archive_one(conversation_id: str) -> None:
+            retry_call(self.archive, conversation_id, attempts=attempts)
+
+        pending: List[str] = list(conversation_ids)
+        if self._supports("archive_many"):
+            pending = []
+            for start in range(0, len(conversation_ids), ARCHIVE_BATCH_SIZE):
+                batch = list(conversation_ids[start : start + ARCHIVE_BATCH_SIZE])
+                try:
+                    retry_call(self.controller.archive_many, batch, attempts=attempts)
+                except Exception:
+                    pending.extend(batch)
+                    continue
+                for conversation_id in batch:
+                    yield conversation_id, None
+
+        for conversation_id, _, error in run_bounded(
+            archive_one, pending, concurrency
+        ):
+            yield conversation_id, error
     
-    def _export_markdown(self, conversations: List[Dict[str, Any]]) -> str:
-        """Export conversations as markdown."""
-        output = []
-        
-        for conv in conversations:
-            output.append(f"# {conv.get('label', 'Unlabeled')}\n")
-            output.append(f"**Created:** {conv.get('created_at', 'Unknown')}\n")
-            output.append(f"**ID:** {conv.get('id')}\n\n")
-            
-            for msg in conv.get("messages", []):
-                role = msg.get("role", "unknown")
-                content = msg.get("content", "")
-                output.append(f"**{role.capitalize()}:** {content}\n\n")
-            
-            output.append("---\n\n")
-        
-        return "".join(output)
\ No newline at end of file
+    def _iter_export_pages(
+        self,
+        label: Optional[str],
+        page_size: int,
+        concurrency: int,
+        since: Optional[datetime],
+        seen_ids: Collection[str] = (),
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Yield export pages filtered by ``since``, tracking the watermark.
+
+        Conversations in ``seen_ids`` that changed exactly at ``since`` were
+        written by the previous export and are skipped.
+        """
+        newest: Optional[datetime] = None
+        self.last_export_watermark = None
+        self.last_export_watermark_ids = []
+        pages = self.iter_pages(
+            label=label, page_size=page_size, concurrency=concurrency, since=since
+        )
+        for page in pages:
+            kept = []
+            for conv in page:
+                changed = conversation_timestamp(conv)
+                if changed is not None and (newest is None or changed > newest):
+                    newest = changed
+                    self.last_export_watermark = changed.isoformat()
+                    self.last_export_watermark_ids = []
+                if changed is not None and changed == newest and conv.get("id"):
+                    self.last_export_watermark_ids.append(conv["id"])
+                if since is None or changed is None or changed > since:
+                    kept.append(conv)
+                elif changed == since and conv.get("id") not in seen_ids:
+                    kept.append(conv)
+            yield kept
+
+    def _fetch_page(
+        self,
+        label: Optional[str],
+        offset: int,
+        limit: int,
+        fields: Optional[Sequence[str]] = None,
+        since: Optional[datetime] = None,
+    ) -> List[Dict[str, Any]]:
+        """Fetch a single page of conversations.
+
+        An SDK without ``offset`` can only return the first page.
+        """
+        kwargs: Dict[str, Any] = {"label": label, "limit": limit}
+        if self._accepts(self.controller.search, "offset"):
+            kwargs["offset"] = offset
+        elif offset:
+            return []
+        if fields and self._accepts(self.controller.search, "fields"):
+            kwargs["fields"] = list(fields)
+        if since and self._accepts(self.controller.search, "updated_since"):
+            kwargs["updated_since"] = since.isoformat()
+        return self.controller.search("", **kwargs)
+
+    def _supports(self, method: str) -> bool:
+        """Check whether the controller SDK implements an optional endpoint."""
+        controller = self.controller
+        while isinstance(controller, (MeteredController, TracedController)):
+            controller = controller.wrapped
+        return callable(getattr(type(controller), method, None))
+
+    @staticmethod
+    def _accepts(func: Any, parameter: str) -> bool:
+        """Check whether an SDK method accepts a keyword argument."""
+        try:
+            params = inspect.signature(func).parameters.values()
+        except (TypeError, ValueError):
+            return False
+        return any(
+            p.name == parameter or p.kind is inspect.Parameter.VAR_KEYWORD
+            for p in params
+        )
+
+    @staticmethod
+    def _normalize_label_counts(raw: Any) -> Dict[str, int]:
+        """Accept label counts as a mapping or as a list of records."""
+        if isinstance(raw, dict):
+            return {str(name): int(count) for name, count in raw.items()}
+        return {
+            str(item.get("label", item.get("name", "Unknown"))): int(item["count"])
+            for item in raw
+        }
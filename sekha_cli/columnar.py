@@ -0,0 +1,89 @@
+"""Columnar (Parquet / Arrow IPC) export with one row per message.
+
+Requires the optional ``pyarrow`` package, imported only when a columnar
+export runs.
+"""
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Tuple
+
+from .incremental import parse_timestamp
+
+COLUMNAR_FORMATS = ("parquet", "arrow")
+
+
+def _pyarrow() -> Any:
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise RuntimeError(
+            "Columnar export needs the pyarrow package "
+            "(pip install 'sekha-cli[parquet]')"
+        ) from e
+    return pyarrow
+
+
+def message_schema(pa: Any) -> Any:
+    """Arrow schema of the exported message table.
+
+    Low-cardinality columns stay plain strings: Parquet dictionary-encodes
+    them on its own, and Arrow IPC files cannot change a dictionary between
+    batches.
+    """
+    return pa.schema(
+        [
+            ("conversation_id", pa.string()),
+            ("label", pa.string()),
+            ("created_at", pa.timestamp("us", tz="UTC")),
+            ("message_index", pa.int32()),
+            ("role", pa.string()),
+            ("content", pa.string()),
+        ]
+    )
+
+
+def page_to_batch(pa: Any, schema: Any, conversations: List[Dict[str, Any]]) -> Any:
+    """Flatten a page of conversations into one record batch of messages."""
+    columns: Dict[str, List[Any]] = {name: [] for name in schema.names}
+    for conv in conversations:
+        created_at = parse_timestamp(conv.get("created_at"))
+        for index, msg in enumerate(conv.get("messages", [])):
+            columns["conversation_id"].append(conv.get("id"))
+            columns["label"].append(conv.get("label"))
+            columns["created_at"].append(created_at)
+            columns["message_index"].append(index)
+            columns["role"].append(msg.get("role"))
+            columns["content"].append(msg.get("content"))
+    return pa.RecordBatch.from_pydict(columns, schema=schema)
+
+
+def write_columnar(
+    pages: Iterable[List[Dict[str, Any]]], path: Path, format: str = "parquet"
+) -> Tuple[int, int]:
+    """Write pages of conversations to a Parquet or Arrow IPC file.
+
+    Each page becomes one row group (Parquet) or record batch (Arrow), so
+    only a single page is held in memory. Returns ``(conversations, rows)``.
+    """
+    if format not in COLUMNAR_FORMATS:
+        raise ValueError(f"Unsupported format: {format}")
+
+    pa = _pyarrow()
+    schema = message_schema(pa)
+    if format == "parquet":
+        import pyarrow.parquet as pq
+
+        writer = pq.ParquetWriter(str(path), schema)
+    else:
+        writer = pa.ipc.new_file(str(path), schema)
+
+    conversations = rows = 0
+    try:
+        for page in pages:
+            batch = page_to_batch(pa, schema, page)
+            conversations += len(page)
+            if batch.num_rows:
+                writer.write_batch(batch)
+                rows += batch.num_rows
+    finally:
+        writer.close()
+    return conversations, rows
@@ -0,0 +1,325 @@
+"""Shell completion of labels and conversation ids from a local cache.
+
+Commands that see labels or conversations (query, store, sync, labels list,
+conversation show) append them to a small text file, so completing
+``--label`` or a conversation id never calls the controller. A stale cache
+is refreshed, and the file rewritten, by a detached
+``sekha completion-refresh``.
+
+``fast_complete`` answers the common cases straight from the console entry
+point, before click or the rest of the CLI is imported, so a TAB costs
+little more than interpreter startup. Anything else goes through click,
+whose parameters use ``complete_labels`` and ``complete_conversation_ids``.
+The completion path avoids even ``json`` and ``re``: the cache is one
+tab-separated record per line.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import time
+
+# Importing typing costs more than the rest of a completion, so annotations
+# stay unevaluated and the names exist only for type checkers.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+    Item = Tuple[str, str]
+
+COMPLETE_VAR = "_SEKHA_COMPLETE"
+SHELLS = ("bash", "zsh", "fish")
+# Options of the ``sekha`` group that take a value, skipped when working out
+# which subcommand is being completed.
+GLOBAL_VALUE_OPTIONS = (
+    "--api-url",
+    "--api-key",
+    "--trace-file",
+    "--metrics-file",
+    "--metrics-format",
+)
+CACHE_NAME = "completion.tsv"
+MAX_CONVERSATIONS = 500
+HELP_LENGTH = 60
+# Refresh in the background when the cache is older than this, at most
+# once per interval.
+REFRESH_AFTER = 600
+# Appended rows are compacted away once the file grows past this many bytes.
+COMPACT_AFTER = 256 * 1024
+
+
+def cache_path() -> str:
+    """Completion cache file, next to the other local caches."""
+    # Same location as Config._get_default_cache_dir(), without importing
+    # config (and pathlib) on the completion path.
+    cache_dir = os.environ.get("SEKHA_CACHE_DIR") or os.path.join(
+        os.path.expanduser("~"), ".cache", "sekha"
+    )
+    return os.path.join(cache_dir, CACHE_NAME)
+
+
+def load(path: Optional[str] = None) -> Dict[str, Any]:
+    """Cached labels and conversations; empty if there is no usable cache.
+
+    Rows are stored oldest first; the latest row for a conversation wins
+    and the newest ``MAX_CONVERSATIONS`` come back first.
+    """
+    data: Dict[str, Any] = {"labels": [], "conversations": [], "updated_at": 0.0}
+    labels = set()
+    conversations: Dict[str, Dict[str, str]] = {}
+    try:
+        with open(path or cache_path(), encoding="utf-8") as f:
+            for line in f:
+                fields = line.rstrip("\n").split("\t")
+                if fields[0] == "label" and len(fields) == 2:
+                    labels.add(fields[1])
+                elif fields[0] == "conversation" and len(fields) == 4:
+                    conversations.pop(fields[1], None)
+                    conversations[fields[1]] = {
+                        "id": fields[1],
+                        "label": fields[2],
+                        "preview": fields[3],
+                    }
+                elif fields[0] == "updated_at" and len(fields) == 2:
+                    data["updated_at"] = float(fields[1])
+    except (OSError, ValueError):
+        pass
+    data["labels"] = sorted(labels)
+    data["conversations"] = list(reversed(conversations.values()))[:MAX_CONVERSATIONS]
+    return data
+
+
+def remember(
+    labels: Iterable[str] = (),
+    conversations: Iterable[Mapping[str, Any]] = (),
+    path: Optional[str] = None,
+    refreshed: bool = False,
+) -> None:
+    """Add labels and recently seen conversations to the cache.
+
+    Rows are appended, so a command remembering a few conversations never
+    rewrites the file; the first conversation given counts as the newest.
+    ``refreshed`` marks a full refresh, which resets the staleness clock,
+    replaces the labels and compacts the file, as does growing past
+    ``COMPACT_AFTER`` bytes. Failures are ignored: completion data is never
+    worth failing a command.
+    """
+    path = path or cache_path()
+    labels = [_field(label) for label in labels if label]
+    rows = []
+    for conv in conversations:
+        if not conv.get("id"):
+            continue
+        label = _field(conv.get("label") or "")
+        preview = _field(conv.get("preview") or _first_message(conv))
+        rows.append(
+            f"conversation\t{_field(conv['id'])}\t{label}\t{preview[:HELP_LENGTH]}"
+        )
+        if label:
+            labels.append(label)
+    rows.reverse()
+    rows[:0] = [f"label\t{label}" for label in dict.fromkeys(labels)]
+    if not rows and not refreshed:
+        return
+
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("".join(row + "\n" for row in rows))
+        if refreshed:
+            data = load(path)
+            # A refresh that fetched labels replaces them, dropping deleted ones.
+            if labels:
+                data["labels"] = sorted(set(labels))
+            data["updated_at"] = time.time()
+            _write(path, data)
+        elif os.path.getsize(path) > COMPACT_AFTER:
+            _write(path, load(path))
+    except OSError:
+        pass
+
+
+def _write(path: str, data: Mapping[str, Any]) -> None:
+    """Replace the cache with one row per label and conversation."""
+    lines = [f"updated_at\t{data['updated_at']}"]
+    lines.extend(f"label\t{label}" for label in data["labels"])
+    lines.extend(
+        f"conversation\t{c['id']}\t{c['label']}\t{c['preview']}"
+        for c in reversed(data["conversations"])
+    )
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    os.replace(tmp, path)
+
+
+def _field(value: Any) -> str:
+    """One line of text without tabs, safe to store as a field."""
+    return " ".join(str(value).split())
+
+
+def _first_message(conv: Mapping[str, Any]) -> str:
+    for msg in conv.get("messages") or []:
+        if msg.get("content"):
+            return str(msg["content"])
+    return ""
+
+
+def label_items(incomplete: str, data: Mapping[str, Any]) -> List[Item]:
+    """Cached labels starting with ``incomplete``."""
+    return [
+        (label, "")
+        for label in data.get("labels", [])
+        if label.startswith(incomplete)
+    ]
+
+
+def conversation_items(incomplete: str, data: Mapping[str, Any]) -> List[Item]:
+    """Cached conversation ids starting with ``incomplete``, newest first."""
+    items = []
+    for conv in data.get("conversations", []):
+        if conv["id"].startswith(incomplete):
+            label = conv.get("label")
+            preview = conv.get("preview", "")
+            items.append((conv["id"], f"[{label}] {preview}" if label else preview))
+    return items
+
+
+def refresh_in_background(data: Mapping[str, Any], path: Optional[str] = None) -> bool:
+    """Start a detached refresh if the cache is stale; True if one started."""
+    path = path or cache_path()
+    now = time.time()
+    if now - data.get("updated_at", 0) < REFRESH_AFTER:
+        return False
+    marker = f"{path}.refresh"
+    try:
+        if now - os.stat(marker).st_mtime < REFRESH_AFTER:
+            return False
+    except OSError:
+        pass
+    try:
+        os.makedirs(os.path.dirname(marker), exist_ok=True)
+        with open(marker, "w"):
+            pass
+        import subprocess
+
+        subprocess.Popen(
+            [sys.executable, "-m", "sekha_cli.main", "completion-refresh"],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+    except OSError:
+        return False
+    return True
+
+
+def complete_labels(ctx: Any, param: Any, incomplete: str) -> List[Any]:
+    """Click ``shell_complete`` callback for ``--label``."""
+    return _click_items(label_items(incomplete, _load_and_refresh()))
+
+
+def complete_conversation_ids(ctx: Any, param: Any, incomplete: str) -> List[Any]:
+    """Click ``shell_complete`` callback for conversation id arguments."""
+    return _click_items(conversation_items(incomplete, _load_and_refresh()))
+
+
+def _load_and_refresh() -> Dict[str, Any]:
+    data = load()
+    refresh_in_background(data)
+    return data
+
+
+def _click_items(items: List[Item]) -> List[Any]:
+    from click.shell_completion import CompletionItem
+
+    return [CompletionItem(value, help=help_ or None) for value, help_ in items]
+
+
+def completion_args(shell: str, environ: Mapping[str, str]) -> Tuple[List[str], str]:
+    """Words before the cursor and the word being completed, as click reads them."""
+    words = _split(environ["COMP_WORDS"])
+    if shell == "fish":
+        incomplete = environ.get("COMP_CWORD", "")
+        if incomplete:
+            incomplete = _split(incomplete)[0]
+        args = words[1:]
+        if incomplete and args and args[-1] == incomplete:
+            args.pop()
+        return args, incomplete
+    cword = int(environ["COMP_CWORD"])
+    args = words[1:cword]
+    return args, words[cword] if cword < len(words) else ""
+
+
+def _split(line: str) -> List[str]:
+    """Split like click (with shlex), importing shlex only when quoting is used."""
+    if not any(char in line for char in "\"'\\"):
+        return line.split()
+    import shlex
+
+    return shlex.split(line)
+
+
+def format_item(shell: str, value: str, help_: str) -> str:
+    """One completion in the format click's shell scripts expect."""
+    if shell == "zsh":
+        if not help_:
+            return f"plain\n{value}\n_"
+        # zsh's _describe splits value from help at the first unescaped colon.
+        value = value.replace(":", "\\:")
+        return f"plain\n{value}\n{help_}"
+    if shell == "fish" and help_:
+        return f"plain,{value}\t{help_}"
+    return f"plain,{value}"
+
+
+def fast_complete(environ: Mapping[str, str]) -> bool:
+    """Answer a completion request from the cache, if it is one we know.
+
+    Handles a ``--label`` value and the ids taken by ``conversation show``
+    and ``conversation archive``; returns False for anything else so click
+    completes it.
+    """
+    shell, _, action = environ.get(COMPLETE_VAR, "").partition("_")
+    if shell not in SHELLS or action != "complete":
+        return False
+    try:
+        args, incomplete = completion_args(shell, environ)
+    except (KeyError, ValueError):
+        return False
+    if incomplete.startswith("-"):
+        return False
+
+    if args and args[-1] == "--label":
+        complete = label_items
+    elif _completes_conversation_id(_command_words(args)):
+        complete = conversation_items
+    else:
+        return False
+
+    data = load()
+    items = complete(incomplete, data)
+    sys.stdout.write("".join(format_item(shell, *item) + "\n" for item in items))
+    sys.stdout.flush()
+    refresh_in_background(data)
+    return True
+
+
+def _command_words(args: List[str]) -> List[str]:
+    """``args`` without the leading global options and their values."""
+    words = list(args)
+    while words and words[0].startswith("-"):
+        option = words.pop(0)
+        if option in GLOBAL_VALUE_OPTIONS and words:
+            words.pop(0)
+    return words
+
+
+def _completes_conversation_id(words: List[str]) -> bool:
+    """Whether the word being completed is a conversation id argument."""
+    if words == ["conversation", "show"]:
+        return True
+    # archive takes any number of ids, after options or between them.
+    return words[:2] == ["conversation", "archive"] and words[-1] != "--concurrency"
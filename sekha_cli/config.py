@@ -4,8 +4,6 @@ from pathlib import Path
 from typing import Optional
 from urllib.parse import urlparse
 
-import yaml
-
 
 class Config:
     """Sekha CLI configuration management."""
@@ -37,6 +35,8 @@ class Config:
         if not config_path.exists():
             raise FileNotFoundError(f"Config file not found: {config_path}")
         
+        import yaml
+
         with open(config_path) as f:
             data = yaml.safe_load(f) or {}
         
@@ -58,6 +58,8 @@ class Config:
             }
         }
         
+        import yaml
+
         with open(config_path, "w") as f:
             yaml.dump(data, f, default_flow_style=False)
     
@@ -74,6 +76,14 @@ class Config:
         config_dir = Path.home() / ".config" / "sekha"
         return config_dir / "config.yaml"
     
+    @staticmethod
+    def _get_default_cache_dir() -> Path:
+        """Get the directory for local caches and journals."""
+        override = os.environ.get("SEKHA_CACHE_DIR")
+        if override:
+            return Path(override)
+        return Path.home() / ".cache" / "sekha"
+    
     def is_valid(self) -> bool:
         """Check if configuration is valid."""
         return bool(self.base_url and self.api_key)
\ No newline at end of file
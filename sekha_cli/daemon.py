@@ -0,0 +1,291 @@
+"""Long-running daemon that keeps a warm client behind a Unix socket.
+
+The wire protocol is newline-delimited JSON: each request is
+``{"method": ..., "args": [...], "kwargs": {...}}`` and each response is
+``{"ok": true, "result": ...}`` or ``{"ok": false, "error": ..., "type": ...}``.
+A ``list_labels`` response also names the counting path in ``labels_path``.
+This module only uses the standard library at import time so the forwarding
+path never loads the SDK.
+"""
+import hashlib
+import json
+import os
+import socket
+import socketserver
+import stat
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from .trace import tracer
+
+# Client methods the daemon will run on behalf of the CLI.
+FORWARDED_METHODS = (
+    "query",
+    "store_conversation",
+    "get_conversation",
+    "list_labels",
+    "get_pruning_suggestions",
+    "archive",
+)
+
+CONNECT_TIMEOUT = 0.2
+
+
+def is_supported() -> bool:
+    """Whether this platform has Unix domain sockets."""
+    return hasattr(socket, "AF_UNIX")
+
+
+def socket_path(base_url: str, api_key: str) -> Path:
+    """Socket location for a given controller and key.
+
+    The path is derived from both so a daemon is never reused with different
+    credentials. ``SEKHA_RUNTIME_DIR`` overrides the directory.
+    """
+    runtime_dir = os.environ.get("SEKHA_RUNTIME_DIR") or os.environ.get(
+        "XDG_RUNTIME_DIR"
+    )
+    if runtime_dir:
+        directory = Path(runtime_dir) / "sekha"
+    else:
+        uid = os.getuid() if hasattr(os, "getuid") else "user"
+        directory = Path(tempfile.gettempdir()) / f"sekha-{uid}"
+    digest = hashlib.sha256(f"{base_url.rstrip('/')}\n{api_key}".encode()).hexdigest()
+    return directory / f"daemon-{digest[:16]}.sock"
+
+
+class DaemonError(RuntimeError):
+    """A forwarded call failed on the daemon, or its socket is unsafe to use."""
+
+
+def check_socket_dir(directory: Path) -> None:
+    """Refuse a socket directory another local user could tamper with.
+
+    Without ``XDG_RUNTIME_DIR`` the socket lives under the shared temporary
+    directory, where anyone can create ``sekha-<uid>`` first and plant a
+    socket of their own. The directory must be a real directory (not a
+    symlink), owned by us and closed to group and others.
+    """
+    info = os.lstat(directory)
+    if not stat.S_ISDIR(info.st_mode):
+        raise DaemonError(f"Socket directory {directory} is not a directory")
+    if hasattr(os, "getuid") and info.st_uid != os.getuid():
+        raise DaemonError(f"Socket directory {directory} is owned by another user")
+    if info.st_mode & 0o077:
+        raise DaemonError(
+            f"Socket directory {directory} is accessible to other users "
+            f"(mode {stat.S_IMODE(info.st_mode):o})"
+        )
+
+
+class DaemonClient:
+    """Drop-in stand-in for ``SekhaClient`` that forwards to a running daemon.
+
+    Methods the daemon does not serve (streaming exports, bulk helpers) fall
+    through to a local ``SekhaClient`` built on first use.
+    """
+
+    def __init__(self, sock: socket.socket, base_url: str, api_key: str):
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self._sock = sock
+        self._reader = sock.makefile("r", encoding="utf-8")
+        self._local: Any = None
+        self._lock = threading.Lock()
+        self.last_labels_path: Optional[str] = None
+
+    @classmethod
+    def connect(cls, base_url: str, api_key: str) -> Optional["DaemonClient"]:
+        """Connect to the daemon for these credentials, if one is running.
+
+        A socket in a directory that fails ``check_socket_dir`` is never
+        trusted; the CLI then talks to the controller directly.
+        """
+        if not is_supported():
+            return None
+        path = socket_path(base_url, api_key)
+        try:
+            check_socket_dir(path.parent)
+        except (OSError, DaemonError):
+            return None
+        if not path.exists():
+            return None
+
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(CONNECT_TIMEOUT)
+        try:
+            sock.connect(str(path))
+        except OSError:
+            sock.close()
+            return None
+        sock.settimeout(None)
+        return cls(sock, base_url, api_key)
+
+    def call(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        """Run one request on the daemon and return its result."""
+        return self.request(method, *args, **kwargs).get("result")
+
+    def request(self, method: str, *args: Any, **kwargs: Any) -> Dict[str, Any]:
+        """Run one request on the daemon and return the whole response."""
+        request = json.dumps({"method": method, "args": args, "kwargs": kwargs})
+        with tracer.span(f"daemon.{method}") as span:
+            with self._lock:
+                self._sock.sendall(request.encode("utf-8") + b"\n")
+                line = self._reader.readline()
+            span.set(bytes=len(line))
+        if not line:
+            raise DaemonError("Daemon closed the connection")
+
+        response = json.loads(line)
+        if not response.get("ok"):
+            raise DaemonError(response.get("error", "Unknown daemon error"))
+        return response
+
+    def query(self, query: str, label: Optional[str] = None, limit: int = 10) -> Any:
+        """Forward a semantic search."""
+        return self.call("query", query, label=label, limit=limit)
+
+    def store_conversation(self, file_path: str, label: str) -> Any:
+        """Forward a store; the daemon reads the file itself."""
+        return self.call("store_conversation", os.path.abspath(file_path), label)
+
+    def get_conversation(self, conversation_id: str, cache: Any = None) -> Any:
+        """Forward a conversation read.
+
+        Any ``cache`` other than ``None`` asks the daemon to read through its
+        own cache handle; nothing is opened on this side.
+        """
+        return self.call(
+            "get_conversation", conversation_id, use_cache=cache is not None
+        )
+
+    def list_labels(self, concurrency: int = 1) -> Any:
+        """Forward a label listing, keeping the counting path the daemon used."""
+        response = self.request("list_labels", concurrency=concurrency)
+        self.last_labels_path = response.get("labels_path") or "daemon"
+        return response.get("result")
+
+    def get_pruning_suggestions(self) -> Any:
+        """Forward a pruning suggestions request."""
+        return self.call("get_pruning_suggestions")
+
+    def archive(self, conversation_id: str) -> None:
+        """Forward an archive."""
+        self.call("archive", conversation_id)
+
+    def close(self) -> None:
+        """Close the connection to the daemon."""
+        self._reader.close()
+        self._sock.close()
+
+    def direct(self) -> Any:
+        """The local ``SekhaClient`` for calls the daemon does not serve.
+
+        The connection carries one request at a time, so commands that fan
+        requests out with ``--concurrency`` use this client instead.
+        """
+        if self._local is None:
+            from .client import SekhaClient
+
+            self._local = SekhaClient(base_url=self.base_url, api_key=self.api_key)
+        return self._local
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.direct(), name)
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Serve newline-delimited JSON requests on one connection."""
+
+    server: "DaemonServer"
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+            except ValueError:
+                response: Dict[str, Any] = {"ok": False, "error": "Malformed request"}
+            else:
+                response = self.server.dispatch(request)
+            try:
+                payload = json.dumps(response)
+            except (TypeError, ValueError) as e:
+                payload = json.dumps({"ok": False, "error": f"Unserializable: {e}"})
+            self.wfile.write(payload.encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+
+class DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Threaded Unix socket server wrapping one warm client."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        path: Path,
+        client: Any,
+        cache_factory: Optional[Callable[[], Any]] = None,
+    ):
+        path.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+        check_socket_dir(path.parent)
+        if path.exists():
+            path.unlink()
+        self.client = client
+        self.cache_factory = cache_factory
+        self.started_at = time.time()
+        self.requests = 0
+        self._requests_lock = threading.Lock()
+        super().__init__(str(path), _RequestHandler)
+        os.chmod(path, 0o600)
+        self.path = path
+
+    def dispatch(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Run one request and build its response."""
+        method = request.get("method")
+        args = request.get("args") or []
+        kwargs = request.get("kwargs") or {}
+
+        if method == "ping":
+            return {
+                "ok": True,
+                "result": {
+                    "pid": os.getpid(),
+                    "base_url": getattr(self.client, "base_url", None),
+                    "uptime": time.time() - self.started_at,
+                    "requests": self.requests,
+                },
+            }
+        if method == "shutdown":
+            threading.Thread(target=self.shutdown, daemon=True).start()
+            return {"ok": True, "result": None}
+        if method not in FORWARDED_METHODS:
+            return {"ok": False, "error": f"Unsupported method: {method}"}
+
+        with self._requests_lock:
+            self.requests += 1
+        extra: Dict[str, Any] = {}
+        cache = None
+        try:
+            if method == "get_conversation":
+                if kwargs.pop("use_cache", False) and self.cache_factory:
+                    cache = self.cache_factory()
+                    kwargs["cache"] = cache
+            if method == "list_labels":
+                # Each connection gets the path its own call took.
+                result, extra["labels_path"] = self.client.count_labels(*args, **kwargs)
+            else:
+                result = getattr(self.client, method)(*args, **kwargs)
+        except Exception as e:
+            return {"ok": False, "error": str(e), "type": type(e).__name__}
+        finally:
+            if cache is not None:
+                cache.close()
+        return {"ok": True, "result": result, **extra}
+
+    def server_close(self) -> None:
+        super().server_close()
+        if self.path.exists():
+            self.path.unlink()
@@ -0,0 +1,390 @@
+"""Interactive fuzzy finder behind ``sekha find``.
+
+Every keystroke re-ranks an in-memory index of ids, labels and previews
+with an fzf-style subsequence score, so typing never waits on the network.
+Remote semantic search runs on a worker thread once typing pauses; a reply
+for anything but the latest query is dropped, and queued requests for
+superseded queries are cancelled before they are sent.
+"""
+import heapq
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+SCORE_MATCH = 16
+BONUS_CONSECUTIVE = 8
+BONUS_BOUNDARY = 10
+MAX_GAP_PENALTY = 6
+RANK_CHUNK = 2000
+DEFAULT_DEBOUNCE = 0.25
+
+Entry = Dict[str, Any]
+
+
+def fuzzy_score(pattern: str, text: str) -> Optional[int]:
+    """Score ``pattern`` as a subsequence of ``text`` (both lowercase).
+
+    Returns ``None`` when some character is missing. Consecutive matches and
+    matches at the start of a word score higher; gaps cost a little.
+    """
+    found = text.find(pattern)
+    if found >= 0:
+        # Contiguous match: the best possible spacing, found in one C scan.
+        score = (SCORE_MATCH + BONUS_CONSECUTIVE) * len(pattern) - BONUS_CONSECUTIVE
+        if found == 0 or not text[found - 1].isalnum():
+            score += BONUS_BOUNDARY
+        return score
+
+    score = 0
+    position = -1
+    for char in pattern:
+        found = text.find(char, position + 1)
+        if found < 0:
+            return None
+        score += SCORE_MATCH
+        if found == position + 1 and position >= 0:
+            score += BONUS_CONSECUTIVE
+        elif found == 0 or not text[found - 1].isalnum():
+            score += BONUS_BOUNDARY
+        if position >= 0:
+            score -= min(found - position - 1, MAX_GAP_PENALTY)
+        position = found
+    return score
+
+
+class FinderIndex:
+    """Conversations searchable by fuzzy match on label, preview and id."""
+
+    def __init__(self, entries: Iterable[Entry] = ()):
+        self.entries: List[Entry] = []
+        self.haystacks: List[str] = []
+        self.version = 0
+        self._ids: Dict[str, int] = {}
+        self._last: Optional[Ranking] = None
+        self.add(entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def add(self, entries: Iterable[Entry]) -> None:
+        """Add or refresh entries, keyed by id."""
+        for entry in entries:
+            conversation_id = entry.get("id")
+            if not conversation_id:
+                continue
+            haystack = " ".join(
+                str(entry.get(key) or "") for key in ("label", "preview", "id")
+            ).lower()
+            slot = self._ids.get(conversation_id)
+            if slot is None:
+                self._ids[conversation_id] = len(self.entries)
+                self.entries.append(entry)
+                self.haystacks.append(haystack)
+            else:
+                self.entries[slot] = entry
+                self.haystacks[slot] = haystack
+        self.version += 1
+
+    def rank(self, pattern: str, limit: int = 50) -> List[Entry]:
+        """Best ``limit`` entries for ``pattern``, in index order when empty."""
+        ranking = Ranking(self, pattern, limit, previous=self._last)
+        while not ranking.step(len(self.entries)):
+            pass
+        self._last = ranking
+        return ranking.results
+
+
+class Ranking:
+    """Fuzzy ranking of one pattern, computed a chunk at a time.
+
+    The UI loop calls ``step`` between keystrokes, so a large index never
+    blocks typing; ``results`` holds the best entries scored so far. When
+    the pattern extends the previous one, only what that ranking matched
+    (plus what it had not reached yet) is scored, since nothing else can
+    match.
+    """
+
+    def __init__(
+        self,
+        index: FinderIndex,
+        pattern: str,
+        limit: int,
+        previous: Optional["Ranking"] = None,
+    ):
+        self.index = index
+        self.pattern = "".join(pattern.lower().split())
+        self.limit = limit
+        self.version = index.version
+        self.results: List[Entry] = []
+        self.matched: List[int] = []
+        self._best: List[Tuple[int, int, int]] = []
+        self._position = 0
+        self.done = not self.pattern
+        if self.done:
+            self.results = index.entries[:limit]
+            self.candidates: Sequence[int] = []
+        elif (
+            previous is not None
+            and previous.pattern
+            and previous.version == index.version
+            and self.pattern.startswith(previous.pattern)
+        ):
+            self.candidates = previous.remaining()
+        else:
+            self.candidates = range(len(index.entries))
+
+    def remaining(self) -> List[int]:
+        """Entries that may still match: matched so far plus those not scored."""
+        return self.matched + list(self.candidates[self._position :])
+
+    def step(self, count: int = RANK_CHUNK) -> bool:
+        """Score up to ``count`` more entries; True once ranking is complete."""
+        if self.done:
+            return True
+        pattern = self.pattern
+        haystacks = self.index.haystacks
+        best = self._best
+        end = self._position + count
+        for slot in self.candidates[self._position : end]:
+            haystack = haystacks[slot]
+            score = fuzzy_score(pattern, haystack)
+            if score is None:
+                continue
+            self.matched.append(slot)
+            # Shorter texts win ties: the match covers more of them.
+            key = (score, -len(haystack), -slot)
+            if len(best) < self.limit:
+                heapq.heappush(best, key)
+            elif key > best[0]:
+                heapq.heapreplace(best, key)
+        self._position = end
+        self.done = end >= len(self.candidates)
+        entries = self.index.entries
+        self.results = [entries[-slot] for _, _, slot in sorted(best, reverse=True)]
+        return self.done
+
+
+class RemoteSearch:
+    """Debounced background search that only keeps the newest reply.
+
+    ``schedule`` records what the user typed; ``poll``, called from the UI
+    loop, submits it once ``debounce`` seconds pass without another change
+    and returns ``(query, results, error)`` when the reply for the current
+    query arrives.
+    """
+
+    def __init__(
+        self,
+        search: Callable[[str], List[Entry]],
+        debounce: float = DEFAULT_DEBOUNCE,
+        clock: Callable[[], float] = time.monotonic,
+        executor: Optional[ThreadPoolExecutor] = None,
+    ):
+        self.search = search
+        self.debounce = debounce
+        self.clock = clock
+        self.executor = executor or ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="sekha-find"
+        )
+        self.query = ""
+        self.changed_at = 0.0
+        self.submitted: Optional[str] = None
+        self._future: Optional[Future] = None
+        self._future_query: Optional[str] = None
+
+    @property
+    def busy(self) -> bool:
+        """Whether a search for the current query is pending or running."""
+        return bool(self.query) and (
+            self.submitted != self.query or self._future is not None
+        )
+
+    def schedule(self, query: str) -> None:
+        """Note the current query; it is sent once typing pauses."""
+        query = query.strip()
+        if query != self.query:
+            self.query = query
+            self.changed_at = self.clock()
+
+    def poll(self) -> Optional[Tuple[str, List[Entry], Optional[Exception]]]:
+        """Submit a due search and collect a finished one."""
+        if (
+            self.query
+            and self.query != self.submitted
+            and self.clock() - self.changed_at >= self.debounce
+        ):
+            if self._future is not None:
+                # Not started yet: never send it. Running: its reply is ignored.
+                self._future.cancel()
+            self.submitted = self.query
+            self._future_query = self.query
+            self._future = self.executor.submit(self.search, self.query)
+
+        future = self._future
+        if future is None or not future.done():
+            return None
+        self._future = None
+        if future.cancelled() or self._future_query != self.query:
+            return None
+        try:
+            return self._future_query, future.result(), None
+        except Exception as e:
+            return self._future_query, [], e
+
+    def close(self) -> None:
+        """Stop the worker without waiting for an in-flight request."""
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+class Finder:
+    """Keyboard-driven state of the finder, independent of the terminal."""
+
+    def __init__(
+        self,
+        index: FinderIndex,
+        remote: Optional[RemoteSearch] = None,
+        limit: int = 50,
+    ):
+        self.index = index
+        self.remote = remote
+        self.limit = limit
+        self.query = ""
+        self.selected = 0
+        self.results: List[Entry] = []
+        self.remote_results: List[Entry] = []
+        self.status = ""
+        self.ranking = Ranking(index, "", limit)
+        self.refresh()
+
+    @property
+    def busy(self) -> bool:
+        """Whether local ranking is still in progress."""
+        return not self.ranking.done
+
+    def refresh(self) -> None:
+        """Start re-ranking for the current query, scoring the first chunk now."""
+        self.ranking = Ranking(self.index, self.query, self.limit, self.ranking)
+        self.ranking.step()
+        self._merge()
+
+    def _merge(self) -> None:
+        """Local matches first, then remote hits for this query not among them."""
+        local = self.ranking.results
+        seen = {entry["id"] for entry in local}
+        extra = [
+            dict(entry, remote=True)
+            for entry in self.remote_results
+            if entry.get("id") not in seen
+        ]
+        self.results = local + extra
+        self.selected = min(self.selected, max(len(self.results) - 1, 0))
+
+    def type(self, text: str) -> None:
+        """Append typed text."""
+        self.set_query(self.query + text)
+
+    def backspace(self) -> None:
+        """Delete the last character."""
+        self.set_query(self.query[:-1])
+
+    def set_query(self, query: str) -> None:
+        """Replace the query and re-rank."""
+        if query == self.query:
+            return
+        self.query = query
+        self.selected = 0
+        self.remote_results = []
+        if self.remote is not None:
+            self.remote.schedule(query)
+        self.refresh()
+
+    def move(self, delta: int) -> None:
+        """Move the selection up or down."""
+        if self.results:
+            self.selected = max(0, min(self.selected + delta, len(self.results) - 1))
+
+    def tick(self) -> bool:
+        """Rank another chunk and collect remote replies; True if anything changed."""
+        changed = False
+        if not self.ranking.done:
+            self.ranking.step()
+            self._merge()
+            changed = True
+        reply = self.remote.poll() if self.remote is not None else None
+        if reply is None:
+            return changed
+        query, results, error = reply
+        if error is not None:
+            self.status = f"remote search failed: {error}"
+            return True
+        self.status = ""
+        self.index.add(results)
+        self.remote_results = results
+        self.refresh()
+        return True
+
+    @property
+    def choice(self) -> Optional[Entry]:
+        """The highlighted entry."""
+        return self.results[self.selected] if self.results else None
+
+
+def run_curses(finder: Finder) -> Optional[Entry]:
+    """Run the finder in the terminal; returns the chosen entry."""
+    import curses
+
+    def loop(screen: Any) -> Optional[Entry]:
+        dirty = True
+        while True:
+            if dirty:
+                _draw(curses, screen, finder)
+            # Poll for keys between ranking chunks; otherwise wake up now and
+            # then so remote replies show up while the user waits.
+            screen.timeout(0 if finder.busy else 30)
+            try:
+                key = screen.get_wch()
+            except curses.error:
+                dirty = finder.tick()
+                continue
+            dirty = True
+            if key in ("\n", "\r", curses.KEY_ENTER):
+                return finder.choice
+            elif key in ("\x1b", "\x03", "\x07"):
+                return None
+            elif key in (curses.KEY_UP, "\x10", "\x0b"):
+                finder.move(-1)
+            elif key in (curses.KEY_DOWN, "\x0e"):
+                finder.move(1)
+            elif key in (curses.KEY_BACKSPACE, "\x7f", "\x08"):
+                finder.backspace()
+            elif key == "\x15":
+                finder.set_query("")
+            elif isinstance(key, str) and key.isprintable():
+                finder.type(key)
+
+    return curses.wrapper(loop)
+
+
+def _draw(curses: Any, screen: Any, finder: Finder) -> None:
+    """Render prompt, status line and results."""
+    height, width = screen.getmaxyx()
+    screen.erase()
+    remote = finder.remote
+    busy = " ranking..." if finder.busy else ""
+    if remote is not None and remote.busy:
+        busy += " searching..."
+    status = f"{len(finder.results)}/{len(finder.index)}{busy} {finder.status}"
+    screen.addnstr(1, 0, status, width - 1, curses.A_DIM)
+    for row, entry in enumerate(finder.results[: max(height - 2, 0)]):
+        marker = "~" if entry.get("remote") else " "
+        preview = " ".join(str(entry.get("preview") or "").split())
+        line = (
+            f"{marker}{str(entry.get('id', ''))[:12]:<12}  "
+            f"{str(entry.get('label') or '')[:20]:<20}  {preview}"
+        )
+        attr = curses.A_REVERSE if row == finder.selected else curses.A_NORMAL
+        screen.addnstr(row + 2, 0, line, width - 1, attr)
+    prompt = f"> {finder.query}"
+    screen.addnstr(0, 0, prompt, width - 1)
+    screen.move(0, min(len(prompt), width - 1))
+    screen.refresh()
@@ -0,0 +1,133 @@
+"""Keyword search over the local mirror with SQLite FTS5 and BM25 ranking.
+
+The index is an external-content FTS5 table over the mirror's ``messages``
+table, kept current by triggers, so every ``sekha sync`` (or imported
+export) updates it incrementally and message text is stored only once.
+"""
+import re
+import sqlite3
+from typing import Any, Dict, List, Optional
+
+# Control characters never found in message text, used to mark matches in
+# snippets before they are turned into Markdown or rich markup.
+MATCH_START = "\x02"
+MATCH_END = "\x03"
+SNIPPET_TOKENS = 16
+
+_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
+    content,
+    content='messages',
+    content_rowid='rowid',
+    tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS messages_fts_insert AFTER INSERT ON messages BEGIN
+    INSERT INTO messages_fts (rowid, content) VALUES (new.rowid, new.content);
+END;
+CREATE TRIGGER IF NOT EXISTS messages_fts_delete AFTER DELETE ON messages BEGIN
+    INSERT INTO messages_fts (messages_fts, rowid, content)
+    VALUES ('delete', old.rowid, old.content);
+END;
+CREATE TRIGGER IF NOT EXISTS messages_fts_update AFTER UPDATE ON messages BEGIN
+    INSERT INTO messages_fts (messages_fts, rowid, content)
+    VALUES ('delete', old.rowid, old.content);
+    INSERT INTO messages_fts (rowid, content) VALUES (new.rowid, new.content);
+END;
+"""
+
+_TERM = re.compile(r"\w+\*?", re.UNICODE)
+
+
+def enable_fts(conn: sqlite3.Connection) -> bool:
+    """Create the index and its triggers; False if SQLite lacks FTS5.
+
+    A mirror synced before the index existed is indexed in one pass here.
+    """
+    (exists,) = conn.execute(
+        "SELECT COUNT(*) FROM sqlite_master WHERE name = 'messages_fts'"
+    ).fetchone()
+    try:
+        with conn:
+            conn.executescript(_SCHEMA)
+            if not exists:
+                conn.execute(
+                    "INSERT INTO messages_fts (messages_fts) VALUES ('rebuild')"
+                )
+    except sqlite3.OperationalError as e:
+        if "fts5" in str(e):
+            return False
+        raise
+    return True
+
+
+def match_expression(keywords: str) -> str:
+    """Turn free-form keywords into an FTS5 query matching all of them.
+
+    Each word is quoted so punctuation and FTS5 operators in the input are
+    taken literally; a trailing ``*`` keeps its prefix-match meaning.
+    """
+    terms = []
+    for term in _TERM.findall(keywords):
+        if term.endswith("*"):
+            terms.append(f'"{term[:-1]}"*')
+        else:
+            terms.append(f'"{term}"')
+    if not terms:
+        raise ValueError("No searchable words in the query")
+    return " ".join(terms)
+
+
+def search(
+    conn: sqlite3.Connection,
+    keywords: str,
+    label: Optional[str] = None,
+    limit: int = 10,
+    raw: bool = False,
+) -> List[Dict[str, Any]]:
+    """Best-matching messages, most relevant first.
+
+    ``raw`` passes ``keywords`` through as FTS5 query syntax (phrases,
+    ``OR``, ``NEAR``). Snippets mark matches with ``MATCH_START`` and
+    ``MATCH_END``.
+    """
+    expression = keywords if raw else match_expression(keywords)
+    # Ranking runs inside the FTS5 table alone so ``ORDER BY rank LIMIT``
+    # stops early and snippets are built only for the rows returned. A label
+    # filter restricts the rowids in the same query, before the limit.
+    where = "messages_fts MATCH ?"
+    params: List[Any] = [MATCH_START, MATCH_END, expression]
+    if label is not None:
+        where += (
+            " AND rowid IN (SELECT m.rowid FROM messages m "
+            "JOIN conversations c ON c.id = m.conversation_id WHERE c.label = ?)"
+        )
+        params.append(label)
+    params.append(limit)
+    sql = (
+        "SELECT m.conversation_id, c.label, c.created_at, m.position, m.role, "
+        "f.snippet, f.rank FROM ("
+        "SELECT rowid, rank, "
+        f"snippet(messages_fts, 0, ?, ?, '...', {SNIPPET_TOKENS}) AS snippet "
+        f"FROM messages_fts WHERE {where} ORDER BY rank LIMIT ?"
+        ") f "
+        "JOIN messages m ON m.rowid = f.rowid "
+        "JOIN conversations c ON c.id = m.conversation_id "
+        "ORDER BY f.rank"
+    )
+    return [
+        {
+            "id": row[0],
+            "label": row[1],
+            "created_at": row[2],
+            "message_index": row[3],
+            "role": row[4],
+            "snippet": row[5],
+            "score": -row[6],
+        }
+        for row in conn.execute(sql, params)
+    ]
+
+
+def highlight(snippet: str, start: str, end: str) -> str:
+    """Replace the match markers in a snippet."""
+    return snippet.replace(MATCH_START, start).replace(MATCH_END, end)
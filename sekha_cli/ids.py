@@ -0,0 +1,180 @@
+"""Index of known conversation ids for resolving short prefixes.
+
+``sekha query`` shows ids cut to 12 characters; ``conversation show`` and
+``conversation archive`` accept such a prefix and resolve it here, without
+asking the controller. The index is a file of sorted, fixed-width,
+NUL-padded records behind a small header, memory-mapped and searched with
+``bisect``, so a lookup reads O(log n) records however many ids are known.
+Commands that see ids (query, store, sync) add them to a small unsorted log
+next to the index, which is merged into the sorted records once it holds
+``MERGE_AFTER`` ids; a query adding a few ids never rewrites the index.
+"""
+import bisect
+import mmap
+import os
+import struct
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Set, Tuple
+
+MAGIC = b"SKID"
+# Magic and record width in bytes.
+HEADER = struct.Struct("<4sI")
+MAX_CANDIDATES = 10
+# Ids held in the unsorted log before it is merged into the sorted records.
+MERGE_AFTER = 1000
+# Sorts after every byte that can appear in UTF-8 text, so ``prefix + END``
+# is the upper bound of all ids starting with ``prefix``.
+END = b"\xff"
+
+
+class _Records:
+    """Sequence view of the records in a mapped index, padding stripped."""
+
+    def __init__(self, buffer: Optional[mmap.mmap], width: int):
+        self.buffer = buffer
+        self.width = width
+
+    def __len__(self) -> int:
+        if self.buffer is None:
+            return 0
+        return (len(self.buffer) - HEADER.size) // self.width
+
+    def __getitem__(self, index: int) -> bytes:
+        start = HEADER.size + index * self.width
+        return self.buffer[start : start + self.width].rstrip(b"\0")
+
+    def raw(self, start: int, end: int) -> bytes:
+        """Records ``start`` to ``end`` as stored, padding included."""
+        return self.buffer[
+            HEADER.size + start * self.width : HEADER.size + end * self.width
+        ]
+
+
+class IdIndex:
+    """Sorted conversation ids in one file, shared by every sekha process.
+
+    Merges write a new file and rename it over the old one, so readers
+    never see a partial index; concurrent writers can at worst drop each
+    other's additions, which the next query or sync adds back.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.log_path = path.with_name(f"{path.name}.log")
+
+    def lookup(
+        self, prefix: str, limit: int = MAX_CANDIDATES
+    ) -> Tuple[List[str], int]:
+        """First ``limit`` ids starting with ``prefix``, and how many there are."""
+        key = prefix.encode("utf-8")
+        logged = [i for i in self._logged() if i.startswith(key)]
+        with self._mapped() as records:
+            start = bisect.bisect_left(records, key)
+            end = bisect.bisect_left(records, key + END, lo=start)
+            found = [records[i] for i in range(start, min(end, start + limit))]
+            extra = {i for i in logged if not _contains(records, i)}
+        matches = sorted(extra.union(found))[:limit]
+        return [i.decode("utf-8") for i in matches], end - start + len(extra)
+
+    def add(self, ids: Iterable[str]) -> int:
+        """Add ids not indexed yet; returns how many were new.
+
+        New ids are appended to the log; once it holds ``MERGE_AFTER`` ids
+        they are merged into the sorted records in one rewrite.
+        """
+        wanted = {i.encode("utf-8") for i in ids if i and "\n" not in i}
+        logged = set(self._logged())
+        with self._mapped() as records:
+            new = [i for i in wanted - logged if not _contains(records, i)]
+        if not new:
+            return 0
+        if len(logged) + len(new) < MERGE_AFTER:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.log_path, "ab") as f:
+                f.write(b"".join(i + b"\n" for i in sorted(new)))
+        else:
+            self._merge(logged.union(new))
+        return len(new)
+
+    def __len__(self) -> int:
+        logged = set(self._logged())
+        with self._mapped() as records:
+            return len(records) + sum(not _contains(records, i) for i in logged)
+
+    def _logged(self) -> List[bytes]:
+        """Ids in the log, in the order they were added."""
+        try:
+            with open(self.log_path, "rb") as f:
+                return [line.rstrip(b"\n") for line in f if line.strip()]
+        except OSError:
+            return []
+
+    def _merge(self, ids: Set[bytes]) -> None:
+        """Write ``ids`` into the sorted records and empty the log.
+
+        New records are spliced between unchanged runs of the old file, so
+        merging into a large index copies bytes instead of decoding every
+        record.
+        """
+        with self._mapped() as records:
+            new = sorted(i for i in ids if not _contains(records, i))
+            width = max((len(i) for i in new), default=1)
+            if len(records) and width <= records.width:
+                width = records.width
+                chunks = []
+                previous = 0
+                for key in new:
+                    position = bisect.bisect_left(records, key, lo=previous)
+                    chunks.append(records.raw(previous, position))
+                    chunks.append(key.ljust(width, b"\0"))
+                    previous = position
+                chunks.append(records.raw(previous, len(records)))
+            else:
+                # Longer ids than before: every record is padded again.
+                width = max(width, records.width if len(records) else 0)
+                known = {records[i] for i in range(len(records))}
+                chunks = [i.ljust(width, b"\0") for i in sorted(known.union(new))]
+        self._write(width, chunks)
+        try:
+            self.log_path.unlink()
+        except OSError:
+            pass
+
+    @contextmanager
+    def _mapped(self) -> Iterator[_Records]:
+        """Map the file read-only; missing or unrecognised files read as empty."""
+        try:
+            f = open(self.path, "rb")
+        except OSError:
+            yield _Records(None, 1)
+            return
+        with f:
+            try:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # empty file
+                yield _Records(None, 1)
+                return
+            with buffer:
+                magic, width = (b"", 0)
+                if len(buffer) >= HEADER.size:
+                    magic, width = HEADER.unpack_from(buffer)
+                if magic != MAGIC or width < 1:
+                    yield _Records(None, 1)
+                else:
+                    yield _Records(buffer, width)
+
+    def _write(self, width: int, chunks: List[bytes]) -> None:
+        """Replace the index with padded records of ``width`` bytes."""
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp, "wb") as f:
+            f.write(HEADER.pack(MAGIC, width))
+            f.writelines(chunks)
+        os.replace(tmp, self.path)
+
+
+def _contains(records: _Records, key: bytes) -> bool:
+    """Whether ``key`` is one of the sorted ``records``."""
+    index = bisect.bisect_left(records, key)
+    return index < len(records) and records[index] == key
@@ -0,0 +1,178 @@
+"""Incremental exports: watermarks, delta files and snapshot rebuilds.
+
+An incremental export directory holds numbered delta files plus a
+``manifest.json`` recording the label, format, the newest
+``updated_at``/``created_at`` seen so far (the watermark), the ids that
+changed exactly at the watermark and every delta written. The next export
+starts at the watermark and skips those ids, so an unchanged label gives
+an empty delta without missing conversations that share the timestamp.
+Replaying the deltas in order, keeping the latest copy of each
+conversation, rebuilds a full snapshot.
+"""
+import json
+import os
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from .output import RecordWriter, iter_records
+
+MANIFEST_NAME = "manifest.json"
+DELTA_SUFFIXES = {"markdown": ".md", "json": ".json", "jsonl": ".jsonl"}
+SNAPSHOT_FORMATS = ("json", "jsonl")
+
+
+def parse_timestamp(value: Any) -> Optional[datetime]:
+    """Parse an ISO-8601 timestamp, treating naive values as UTC."""
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def conversation_timestamp(conv: Dict[str, Any]) -> Optional[datetime]:
+    """When a conversation last changed: ``updated_at``, else ``created_at``."""
+    return parse_timestamp(conv.get("updated_at")) or parse_timestamp(
+        conv.get("created_at")
+    )
+
+
+class ExportManifest:
+    """Watermark and delta history of one incremental export directory."""
+
+    def __init__(
+        self,
+        directory: Path,
+        label: str,
+        format: str,
+        watermark: Optional[str] = None,
+        deltas: Optional[List[Dict[str, Any]]] = None,
+        watermark_ids: Optional[List[str]] = None,
+    ):
+        self.directory = directory
+        self.label = label
+        self.format = format
+        self.watermark = watermark
+        self.deltas = deltas or []
+        self.watermark_ids = watermark_ids or []
+
+    @classmethod
+    def load(cls, directory: Path) -> Optional["ExportManifest"]:
+        """Read the manifest in ``directory``, if there is one."""
+        path = directory / MANIFEST_NAME
+        if not path.exists():
+            return None
+        with path.open(encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(
+            directory,
+            data["label"],
+            data["format"],
+            watermark=data.get("watermark"),
+            deltas=data.get("deltas", []),
+            watermark_ids=data.get("watermark_ids", []),
+        )
+
+    @property
+    def since(self) -> Optional[datetime]:
+        """The stored watermark as a timestamp."""
+        return parse_timestamp(self.watermark)
+
+    def next_delta_path(self) -> Path:
+        """Path for the next delta file."""
+        suffix = DELTA_SUFFIXES[self.format]
+        return self.directory / f"delta-{len(self.deltas) + 1:06d}{suffix}"
+
+    def record_delta(
+        self,
+        path: Path,
+        since: Optional[datetime],
+        watermark: Optional[str],
+        count: int,
+        watermark_ids: Sequence[str] = (),
+    ) -> None:
+        """Add a written delta and advance the watermark."""
+        self.deltas.append(
+            {
+                "file": path.name,
+                "since": since.isoformat() if since else None,
+                "watermark": watermark,
+                "count": count,
+                "written_at": time.time(),
+            }
+        )
+        self.advance(watermark, watermark_ids)
+
+    def advance(
+        self, watermark: Optional[str], watermark_ids: Sequence[str] = ()
+    ) -> None:
+        """Move the watermark forward, never back.
+
+        ``watermark_ids`` are the conversations that changed at ``watermark``;
+        they are added to the known ones when the watermark stays the same.
+        """
+        new = parse_timestamp(watermark)
+        if new is None:
+            return
+        if self.since is None or new > self.since:
+            self.watermark = watermark
+            self.watermark_ids = list(watermark_ids)
+        elif new == self.since:
+            known = set(self.watermark_ids)
+            self.watermark_ids.extend(i for i in watermark_ids if i not in known)
+
+    def save(self) -> None:
+        """Write the manifest atomically."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / MANIFEST_NAME
+        tmp = path.with_suffix(".tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "label": self.label,
+                    "format": self.format,
+                    "watermark": self.watermark,
+                    "watermark_ids": self.watermark_ids,
+                    "deltas": self.deltas,
+                },
+                f,
+                indent=2,
+            )
+        os.replace(tmp, path)
+
+
+def rebuild_snapshot(manifest: ExportManifest, writer: RecordWriter) -> int:
+    """Replay deltas into ``writer``, keeping only each conversation's latest copy.
+
+    Runs in two passes so only conversation ids, not bodies, are held in
+    memory. Returns the number of conversations written.
+    """
+    if manifest.format not in SNAPSHOT_FORMATS:
+        raise ValueError(f"Cannot rebuild a snapshot from {manifest.format} deltas")
+
+    latest: Dict[Any, int] = {}
+    for position, conv in enumerate(_iter_deltas(manifest)):
+        latest[conv.get("id")] = position
+
+    writer.begin()
+    for position, conv in enumerate(_iter_deltas(manifest)):
+        if latest[conv.get("id")] == position:
+            writer.write(conv)
+    writer.end()
+    return writer.count
+
+
+def _iter_deltas(manifest: ExportManifest) -> Iterator[Dict[str, Any]]:
+    """Yield every conversation from every delta, oldest first.
+
+    Deltas are streamed one record at a time in either format, so a rebuild
+    never holds a whole delta in memory.
+    """
+    for delta in manifest.deltas:
+        yield from iter_records(manifest.directory / delta["file"])
@@ -0,0 +1,202 @@
+"""Bulk conversation import from directories, globs and JSONL streams."""
+import glob
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, TextIO, Tuple
+
+GLOB_CHARS = ("*", "?", "[")
+IMPORT_SUFFIXES = (".json", ".jsonl")
+JOURNAL_COMPLETE = "# complete"
+
+
+class ImportItem:
+    """A single conversation to import, parsed lazily by the worker."""
+
+    def __init__(self, source: str, path: Optional[Path] = None, text: str = ""):
+        self.source = source
+        self.path = path
+        self.text = text
+        self.size = len(text.encode("utf-8"))
+        self.data: Optional[Dict[str, Any]] = None
+        self.digest: Optional[str] = None
+
+    def load(self) -> Dict[str, Any]:
+        """Read and parse the conversation, remembering it for retries."""
+        if self.path is not None:
+            self.text = self.path.read_text(encoding="utf-8")
+            self.size = len(self.text.encode("utf-8"))
+        data = json.loads(self.text)
+        if not isinstance(data, dict):
+            raise ValueError("Expected a JSON object")
+        self.data = data
+        return data
+
+
+class ImportJournal:
+    """Append-only checkpoint of content hashes that were already stored.
+
+    Each line is ``<sha256> <conversation id>``. Lines are flushed as they are
+    written so an interrupted import keeps everything completed so far; an
+    import that runs to the end adds a ``JOURNAL_COMPLETE`` line.
+    """
+
+    def __init__(self, path: Path, resume: bool = False):
+        self.path = path
+        self.done: Set[str] = set()
+        if resume and path.exists():
+            with path.open(encoding="utf-8") as f:
+                self.done = {
+                    line.split(" ", 1)[0]
+                    for line in f
+                    if line.strip() and not line.startswith("#")
+                }
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = path.open("a" if resume else "w", encoding="utf-8")
+
+    def __contains__(self, digest: object) -> bool:
+        return digest in self.done
+
+    def add(self, digest: str, conversation_id: str) -> None:
+        """Record a stored conversation."""
+        self.done.add(digest)
+        self._file.write(f"{digest} {conversation_id}\n")
+        self._file.flush()
+
+    def finish(self) -> None:
+        """Mark the import as run to the end."""
+        self._file.write(JOURNAL_COMPLETE + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        """Close the journal file."""
+        self._file.close()
+
+    @staticmethod
+    def unfinished(path: Path) -> bool:
+        """Whether ``path`` holds checkpoints of an import that was interrupted."""
+        try:
+            with path.open("rb") as f:
+                size = f.seek(0, os.SEEK_END)
+                f.seek(max(size - len(JOURNAL_COMPLETE) - 1, 0))
+                tail = f.read()
+        except FileNotFoundError:
+            return False
+        return size > 0 and tail != f"{JOURNAL_COMPLETE}\n".encode()
+
+
+def default_journal_path(directory: Path, source: str) -> Path:
+    """Journal for one import source, so imports of other inputs keep theirs."""
+    key = source if source == "-" else str(Path(source).resolve())
+    digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+    return directory / f"import-{digest[:16]}.journal"
+
+
+class ImportSummary:
+    """Running totals for a bulk import."""
+
+    def __init__(self) -> None:
+        self.stored = 0
+        self.skipped = 0
+        self.failed: List[ImportItem] = []
+        self.errors: Dict[str, str] = {}
+        self.bytes = 0
+
+    def record(
+        self, item: ImportItem, result: Any, error: Optional[BaseException]
+    ) -> None:
+        """Account for one finished item; a ``None`` result means skipped."""
+        self.bytes += item.size
+        if error is not None:
+            self.failed.append(item)
+            self.errors[item.source] = str(error)
+        elif result is None:
+            self.skipped += 1
+        else:
+            self.stored += 1
+
+    def write_retry_file(self, path: Path) -> None:
+        """Write failed inputs as JSONL that can be fed back to ``sekha store``.
+
+        Inputs that could not be parsed keep their original text in ``_raw``.
+        """
+        with path.open("w", encoding="utf-8") as f:
+            for item in self.failed:
+                record: Dict[str, Any] = dict(item.data or {})
+                if item.data is None and item.text:
+                    record["_raw"] = item.text.rstrip("\n")
+                record["_source"] = item.source
+                record["_error"] = self.errors[item.source]
+                f.write(json.dumps(record) + "\n")
+
+
+def iter_import_items(source: str) -> Iterator[ImportItem]:
+    """Expand a directory, glob, JSON/JSONL file or ``-`` (stdin) into items."""
+    if source == "-":
+        yield from _iter_jsonl(sys.stdin, "<stdin>")
+        return
+
+    path = Path(source)
+    if path.is_dir():
+        files = sorted(p for p in path.rglob("*") if p.suffix in IMPORT_SUFFIXES)
+    elif any(ch in source for ch in GLOB_CHARS):
+        files = sorted(Path(p) for p in glob.glob(source, recursive=True))
+    elif path.exists():
+        files = [path]
+    else:
+        raise FileNotFoundError(f"No such file, directory or pattern: {source}")
+
+    for file in files:
+        if not file.is_file():
+            continue
+        if file.suffix == ".jsonl":
+            with file.open(encoding="utf-8") as f:
+                yield from _iter_jsonl(f, str(file))
+        else:
+            yield ImportItem(str(file), path=file)
+
+
+def content_hash(messages: List[Dict[str, Any]], label: str) -> str:
+    """Hash a conversation's label and messages independent of key order."""
+    canonical = json.dumps(
+        {"label": label, "messages": messages},
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def prepare_item(
+    item: ImportItem,
+    default_label: Optional[str],
+    journal: Optional[ImportJournal] = None,
+) -> Optional[Tuple[List[Dict[str, Any]], str]]:
+    """Parse one item into ``(messages, label)``, preferring the record's label.
+
+    Returns ``None`` when the journal shows the same content was already
+    stored. The content hash is left on ``item.digest``.
+    """
+    data = item.load()
+    messages = data.get("messages", [])
+    if not messages:
+        raise ValueError("No messages found")
+
+    label = data.get("label") or default_label
+    if not label:
+        raise ValueError("No label in record and no --label given")
+
+    item.digest = content_hash(messages, label)
+    if journal is not None and item.digest in journal:
+        return None
+    return messages, label
+
+
+def _iter_jsonl(stream: TextIO, name: str) -> Iterator[ImportItem]:
+    """Yield one item per non-blank JSONL line."""
+    for number, line in enumerate(stream, start=1):
+        if line.strip():
+            yield ImportItem(f"{name}:{number}", text=line)
@@ -1,16 +1,54 @@
-"""Sekha CLI - Command-line interface for Sekha AI Memory Controller."""
+"""Sekha CLI - Command-line interface for Sekha AI Memory Controller.
+
+Heavy dependencies (rich, the Sekha SDK and its HTTP stack, yaml) are imported
+inside the commands that use them so that ``--help``, ``config`` and shell
+hooks start quickly.
+"""
 import json
+import os
+import sys
+import time
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, TextIO, Tuple
 
 import click
-from rich.console import Console
-from rich.table import Table
 
-from .client import SekhaClient
+from . import STARTED, completion
 from .config import Config
+from .trace import SUMMARY_COLUMNS, format_summary, tracer
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+    from rich.console import Console
+
+    from .cache import ConversationCache, QueryCache
+    from .client import SekhaClient
+    from .daemon import DaemonClient
+    from .ids import IdIndex
+    from .markdown import MarkdownTemplate
+    from .mirror import Mirror
+
+
+class _LazyConsole:
+    """Console proxy that defers importing rich until the first print."""
+
+    def __init__(self) -> None:
+        self._console: Optional["Console"] = None
+
+    def get(self) -> "Console":
+        """Return the real rich console, creating it on first use."""
+        if self._console is None:
+            from rich.console import Console
 
-console = Console()
+            self._console = Console()
+        return self._console
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.get(), name)
+
+
+console = _LazyConsole()
 
 
 @click.group()
@@ -25,130 +63,766 @@ console = Console()
     envvar="SEKHA_API_KEY",
     help="Sekha API key (can use SEKHA_API_KEY env var)",
 )
+@click.option(
+    "--no-daemon",
+    is_flag=True,
+    envvar="SEKHA_NO_DAEMON",
+    help="Talk to the controller directly even if a daemon is running",
+)
+@click.option(
+    "--trace",
+    is_flag=True,
+    envvar="SEKHA_TRACE",
+    help="Print a timing summary of the command's spans to stderr",
+)
+@click.option(
+    "--trace-file",
+    type=click.Path(dir_okay=False, path_type=Path),
+    envvar="SEKHA_TRACE_FILE",
+    help="Write spans as a Chrome trace (chrome://tracing, Perfetto)",
+)
+@click.option(
+    "--metrics-file",
+    type=click.Path(dir_okay=False, path_type=Path),
+    envvar="SEKHA_METRICS_FILE",
+    help="Add controller request metrics to this Prometheus textfile or OTLP file",
+)
+@click.option(
+    "--metrics-format",
+    type=click.Choice(["prometheus", "otlp"]),
+    envvar="SEKHA_METRICS_FORMAT",
+    help="Metrics file format (default: from the extension, .json/.jsonl is OTLP)",
+)
 @click.pass_context
-def cli(ctx: click.Context, api_url: str, api_key: Optional[str]):
-    """Sekha CLI - Memory management from the command line."""
+def cli(
+    ctx: click.Context,
+    api_url: str,
+    api_key: Optional[str],
+    no_daemon: bool,
+    trace: bool,
+    trace_file: Optional[Path],
+    metrics_file: Optional[Path],
+    metrics_format: Optional[str],
+):
+    """Sekha CLI - Memory management from the command line.
+
+    \b
+    Example:
+        sekha --trace query "token limits"
+        sekha --trace-file slow.json export --label Work --output work.md
+        sekha --metrics-file /var/lib/node_exporter/sekha.prom prune --dry-run
+    """
     ctx.ensure_object(dict)
+    ctx.obj["api_url"] = api_url
+    ctx.obj["api_key"] = api_key
+    ctx.obj["use_daemon"] = not no_daemon
+    if trace or trace_file:
+        _start_tracing(ctx, trace, trace_file)
+    if metrics_file:
+        _start_metrics(ctx, metrics_file, metrics_format)
+
+
+def _start_tracing(
+    ctx: click.Context, summary: bool, trace_file: Optional[Path]
+) -> None:
+    """Record spans for this invocation and report them when it finishes."""
+    tracer.enable()
+    tracer.add("startup", STARTED)
+    # Close callbacks run last-in first-out, so the command span below has
+    # finished by the time the report is written.
+    ctx.call_on_close(lambda: _finish_tracing(summary, trace_file))
+    ctx.with_resource(tracer.span(f"command.{ctx.invoked_subcommand}"))
+
+
+def _start_metrics(ctx: click.Context, path: Path, format: Optional[str]) -> None:
+    """Record controller request metrics and flush them when the command ends.
+
+    Requests forwarded to a running daemon are counted by the daemon itself.
+    """
+    from .metrics import registry
+
+    registry.enable()
+    ctx.obj["metrics"] = (path, format)
+
+    def finish() -> None:
+        try:
+            registry.flush(path, format)
+        except OSError as e:
+            click.echo(f"Warning: could not write metrics to {path}: {e}", err=True)
+        finally:
+            registry.disable()
+
+    ctx.call_on_close(finish)
+
+
+def _finish_tracing(summary: bool, trace_file: Optional[Path]) -> None:
+    """Print the span summary and write the Chrome trace."""
+    try:
+        if trace_file is not None:
+            tracer.write_chrome_trace(trace_file)
+        if summary:
+            from rich.console import Console
+            from rich.table import Table
+
+            table = Table(title="Trace (ms)")
+            table.add_column(SUMMARY_COLUMNS[0], no_wrap=True)
+            for column in SUMMARY_COLUMNS[1:]:
+                table.add_column(column, justify="right")
+            for row in format_summary(tracer.summary()):
+                table.add_row(*row)
+            Console(stderr=True).print(table)
+    finally:
+        tracer.disable()
+
+
+def _resolve_connection(ctx: click.Context) -> Tuple[str, str]:
+    """Work out the controller URL and API key from options or config."""
+    api_url = ctx.obj.get("api_url", Config.DEFAULT_BASE_URL)
+    api_key = ctx.obj.get("api_key")
 
     # Try to load config if API key not provided
     if not api_key:
-        try:
-            config = Config.load()
-            api_key = config.api_key
-            api_url = config.base_url
-        except FileNotFoundError:
-            pass
+        with tracer.span("config.load"):
+            try:
+                config = Config.load()
+                api_key = config.api_key
+                api_url = config.base_url
+            except FileNotFoundError:
+                pass
 
     if not api_key:
         raise click.ClickException(
             "API key required. Set --api-key option or "
             "SEKHA_API_KEY environment variable"
         )
+    return api_url, api_key
+
+
+def _get_client(ctx: click.Context) -> "SekhaClient":
+    """Build the API client on first use.
+
+    Commands that never talk to the controller don't pay for importing the
+    SDK or reading the config file. When a ``sekha daemon`` is running for
+    the same controller and key, calls are forwarded to it instead. Commands
+    run with ``--local`` read from the ``sekha sync`` mirror.
+    """
+    if "client" not in ctx.obj and ctx.obj.get("local"):
+        ctx.obj["client"] = _get_local_client(ctx)
+    if "client" not in ctx.obj:
+        api_url, api_key = _resolve_connection(ctx)
+
+        if ctx.obj.get("use_daemon", True):
+            from .daemon import DaemonClient
+
+            with tracer.span("daemon.connect") as span:
+                remote = DaemonClient.connect(api_url, api_key)
+                span.set(found=remote is not None)
+            if remote is not None:
+                ctx.obj["client"] = remote
+                return remote
+
+        with tracer.span("client.init"):
+            from .client import SekhaClient
+
+            ctx.obj["client"] = SekhaClient(base_url=api_url, api_key=api_key)
+    return ctx.obj["client"]
+
+
+def _get_bulk_client(ctx: click.Context) -> "SekhaClient":
+    """Client for commands that fan requests out with ``--concurrency``.
+
+    A daemon connection serves one request at a time, so these commands
+    talk to the controller directly even when a daemon is running.
+    """
+    client = _get_client(ctx)
+    if ctx.obj.get("use_daemon", True) and not ctx.obj.get("local"):
+        from .daemon import DaemonClient
+
+        if isinstance(client, DaemonClient):
+            return client.direct()
+    return client
+
+
+def _mirror_base_url(ctx: click.Context) -> str:
+    """Controller URL whose mirror to use, without requiring an API key."""
+    api_url = ctx.obj.get("api_url", Config.DEFAULT_BASE_URL)
+    if not ctx.obj.get("api_key"):
+        try:
+            api_url = Config.load().base_url
+        except FileNotFoundError:
+            pass
+    return api_url
+
+
+def _open_mirror(api_url: str) -> "Mirror":
+    """Open the local mirror of a controller."""
+    from .mirror import Mirror, mirror_path
+
+    return Mirror(mirror_path(Config._get_default_cache_dir(), api_url))
+
+
+def _remember_mirror(mirror: "Mirror") -> None:
+    """Refresh shell completions and the id index from a synced mirror."""
+    completion.remember(
+        labels=mirror.label_counts(),
+        conversations=mirror.entries(limit=completion.MAX_CONVERSATIONS),
+        refreshed=True,
+    )
+    _index_ids(mirror.ids())
+
+
+def _get_local_client(ctx: click.Context) -> "SekhaClient":
+    """Client answering from the local mirror instead of the controller."""
+    api_url = _mirror_base_url(ctx)
+    mirror = _open_mirror(api_url)
+    if mirror.last_sync is None:
+        mirror.close()
+        raise click.ClickException(
+            f"No local mirror of {api_url} yet; run `sekha sync` first"
+        )
+
+    from .client import SekhaClient
+    from .mirror import MirrorController
+
+    return SekhaClient(
+        base_url=api_url, api_key="", controller=MirrorController(mirror)
+    )
+
+
+def _open_query_cache(ttl: float = 300) -> "QueryCache":
+    """Open the local query result cache."""
+    from .cache import QueryCache
+
+    max_bytes = int(os.environ.get("SEKHA_CACHE_MAX_BYTES", 50 * 1024 * 1024))
+    return QueryCache(
+        Config._get_default_cache_dir() / "cache.sqlite3",
+        ttl=ttl,
+        max_bytes=max_bytes,
+    )
+
 
-    ctx.obj["client"] = SekhaClient(base_url=api_url, api_key=api_key)
+def _open_conversation_cache() -> "ConversationCache":
+    """Open the local conversation object cache."""
+    from .cache import ConversationCache
+
+    return ConversationCache(Config._get_default_cache_dir() / "cache.sqlite3")
+
+
+def _open_id_index() -> "IdIndex":
+    """Open the local index of known conversation ids."""
+    from .ids import IdIndex
+
+    return IdIndex(Config._get_default_cache_dir() / "ids.idx")
+
+
+def _index_ids(ids: Iterable[str]) -> None:
+    """Remember ids so their prefixes resolve; never fails the command."""
+    try:
+        _open_id_index().add(ids)
+    except OSError as e:
+        click.echo(f"Warning: could not update the id index: {e}", err=True)
+
+
+def _resolve_id(prefix: str) -> str:
+    """Full conversation id for a prefix of a known id.
+
+    Unknown prefixes are passed through unchanged for the controller to
+    judge; an ambiguous one lists its candidates.
+    """
+    matches, total = _open_id_index().lookup(prefix)
+    if total == 0 or matches[0] == prefix:
+        return prefix
+    if total == 1:
+        return matches[0]
+
+    previews = {
+        conv["id"]: f"[{conv['label']}] {conv['preview']}"
+        for conv in completion.load()["conversations"]
+        if conv["id"] in matches
+    }
+    lines = [f"  {match}  {previews.get(match, '')}".rstrip() for match in matches]
+    if total > len(matches):
+        lines.append(f"  ... and {total - len(matches)} more")
+    raise click.ClickException(
+        f"Ambiguous id prefix '{prefix}' matches {total} conversations:\n"
+        + "\n".join(lines)
+    )
 
 
 @cli.command()
-@click.argument("query")
-@click.option("--label", help="Filter by label")
+@click.argument("query", required=False)
+@click.option(
+    "--label", help="Filter by label", shell_complete=completion.complete_labels
+)
 @click.option("--limit", default=10, help="Max results", type=int)
+@click.option(
+    "--batch",
+    type=click.File("r"),
+    help="Run one query per line of FILE ('-' for stdin), streaming JSONL",
+)
+@click.option(
+    "--concurrency",
+    default=16,
+    type=click.IntRange(min=1),
+    help="Queries in flight in batch mode",
+)
 @click.option(
     "--format",
-    type=click.Choice(["json", "text"]),
+    type=click.Choice(["json", "jsonl", "text"]),
     default="text",
     help="Output format",
 )
+@click.option(
+    "--cache/--no-cache",
+    "use_cache",
+    default=False,
+    envvar="SEKHA_CACHE",
+    help="Serve repeated searches from the local cache (or set SEKHA_CACHE=1)",
+)
+@click.option(
+    "--refresh",
+    is_flag=True,
+    help="Bypass cached results and store the fresh ones",
+)
+@click.option(
+    "--cache-ttl",
+    default=300,
+    envvar="SEKHA_CACHE_TTL",
+    type=click.FloatRange(min=0),
+    help="Seconds a cached result stays fresh",
+)
+@click.option(
+    "--local",
+    is_flag=True,
+    help="Answer from the local mirror kept by `sekha sync`",
+)
 @click.pass_context
 def query(
     ctx: click.Context,
-    query: str,
+    query: Optional[str],
     label: Optional[str],
     limit: int,
+    batch: Optional[TextIO],
+    concurrency: int,
     format: str,
+    use_cache: bool,
+    refresh: bool,
+    cache_ttl: float,
+    local: bool,
 ):
     """Search conversations with semantic query.
 
+    \b
     Example:
         sekha query "token limits" --label Work --limit 10
+        sekha query "token limits" --cache --cache-ttl 600
+        sekha query "token limits" --format jsonl | jq .id
+        sekha query --batch queries.txt --label Work --concurrency 32
+        sekha query "token limits" --local
+
+    With --local, every word must appear in the label, preview or message
+    text of a mirrored conversation; newest matches come first.
+
+    Batch files hold one query per line, either plain text or JSON such as
+    {"query": "token limits", "label": "Work", "limit": 5}. Results are
+    written to stdout as JSON lines in completion order and a latency
+    summary goes to stderr. Batch mode does not use the query cache.
     """
-    client: SekhaClient = ctx.obj["client"]
+    if bool(query) == bool(batch):
+        raise click.UsageError("Pass either a QUERY or --batch FILE")
+    if local:
+        ctx.obj["local"] = True
+        use_cache = False
+    if batch:
+        _query_batch(_get_bulk_client(ctx), batch, label, limit, concurrency)
+        return
 
+    cache = None
     try:
-        results = client.query(query, label=label, limit=limit)
+        results = None
+        if use_cache:
+            api_url, _ = _resolve_connection(ctx)
+            cache = _open_query_cache(cache_ttl)
+            cache_key = cache.key(api_url, query, label, limit)
+            if not refresh:
+                results = cache.get(cache_key)
 
-        if format == "json":
-            click.echo(json.dumps(results, indent=2))
+        if results is None:
+            client = _get_client(ctx)
+            results = client.query(query, label=label, limit=limit)
+            if cache is not None:
+                cache.put(cache_key, results)
+            completion.remember(conversations=results)
+            _index_ids(r.get("id") for r in results)
+
+        if format in ("json", "jsonl"):
+            _echo_records(format, results)
         else:
             if not results:
                 console.print("[yellow]No results found.[/yellow]")
                 return
 
-            table = Table(title=f"Search: '{query}'")
-            table.add_column("ID", style="cyan", no_wrap=True)
-            table.add_column("Label", style="magenta")
-            table.add_column("Preview", style="white")
-
-            for r in results:
-                preview = r.get("preview", "")[:100] + "..."
-                table.add_row(
-                    r.get("id", "")[:12],
-                    r.get("label", ""),
-                    preview,
-                )
+            with tracer.span("render.table", rows=len(results)):
+                from rich.table import Table
+
+                table = Table(title=f"Search: '{query}'")
+                table.add_column("ID", style="cyan", no_wrap=True)
+                table.add_column("Label", style="magenta")
+                table.add_column("Preview", style="white")
+
+                for r in results:
+                    preview = r.get("preview", "")[:100] + "..."
+                    table.add_row(
+                        r.get("id", "")[:12],
+                        r.get("label", ""),
+                        preview,
+                    )
+
+                console.print(table)
+
+    except click.ClickException:
+        raise
+    except Exception as e:
+        raise click.ClickException(f"Search failed: {str(e)}") from e
+    finally:
+        if cache is not None:
+            cache.close()
+
+
+def _echo_records(format: str, records: Iterable[Any]) -> None:
+    """Stream records to stdout as compact JSON or JSON Lines."""
+    from .output import record_writer
+
+    writer = record_writer(format, sys.stdout, flush_each=True)
+    writer.begin()
+    for record in records:
+        writer.write(record)
+    writer.end()
+
+
+def _query_batch(
+    client: "SekhaClient",
+    batch: TextIO,
+    label: Optional[str],
+    limit: int,
+    concurrency: int,
+) -> None:
+    """Run every query in ``batch`` concurrently over one client.
+
+    Each result is echoed as a JSON line as soon as it completes; the
+    p50/p95/p99 latency and throughput summary is written to stderr. With
+    a batch endpoint, latency is measured per batch request, not per query.
+    """
+    import asyncio
+
+    from .async_client import AsyncSekhaClient
+    from .batch import iter_batch_queries, run_query_batch
+    from .output import JsonLinesWriter
+    from .stats import latency_summary
 
-            console.print(table)
+    latencies = []
+    chunk_latencies: Dict[int, float] = {}
+    queries = 0
+    failed = 0
+    writer = JsonLinesWriter(sys.stdout, flush_each=True)
+    started = time.perf_counter()
 
+    async def run() -> None:
+        nonlocal queries, failed
+        async with AsyncSekhaClient(client=client, concurrency=concurrency) as aclient:
+            requests = iter_batch_queries(batch, label, limit)
+            async for record in run_query_batch(aclient, requests):
+                queries += 1
+                if "error" in record:
+                    failed += 1
+                if record["latency"] is not None:
+                    latencies.append(record["latency"])
+                    record["latency_ms"] = round(record["latency"] * 1000, 3)
+                del record["latency"]
+                chunk_latency = record.pop("chunk_latency", None)
+                if chunk_latency is not None:
+                    chunk_latencies[record["chunk"]] = chunk_latency
+                    record["chunk_latency_ms"] = round(chunk_latency * 1000, 3)
+                writer.write(record)
+
+    try:
+        asyncio.run(run())
     except Exception as e:
         raise click.ClickException(f"Search failed: {str(e)}") from e
 
+    elapsed = time.perf_counter() - started
+    if chunk_latencies:
+        summary = latency_summary(list(chunk_latencies.values()), elapsed)
+        measured = f"latency per batch request ({summary['count']} sent)"
+    else:
+        summary = latency_summary(latencies, elapsed)
+        measured = "latency"
+    throughput = queries / elapsed if elapsed > 0 else 0.0
+    click.echo(
+        f"{queries} queries, {failed} failed in {elapsed:.2f}s "
+        f"({throughput:.1f} q/s); {measured} "
+        f"p50 {summary['p50'] * 1000:.1f} ms, "
+        f"p95 {summary['p95'] * 1000:.1f} ms, "
+        f"p99 {summary['p99'] * 1000:.1f} ms",
+        err=True,
+    )
+    if failed:
+        raise click.exceptions.Exit(1)
+
 
 @cli.command()
 @click.option(
     "--file",
     type=click.Path(exists=True, path_type=Path),
-    required=True,
     help="JSON file with conversation data",
 )
-@click.option("--label", required=True, help="Label for the conversation")
+@click.option(
+    "--input",
+    "source",
+    help="Directory, glob or JSONL file to bulk import ('-' for stdin)",
+)
+@click.option(
+    "--label",
+    help="Label for the conversation",
+    shell_complete=completion.complete_labels,
+)
+@click.option(
+    "--concurrency",
+    default=8,
+    type=click.IntRange(min=1),
+    help="Parallel store requests in bulk mode",
+)
+@click.option(
+    "--retry-file",
+    type=click.Path(path_type=Path),
+    default="sekha-import-failed.jsonl",
+    show_default=True,
+    help="Where failed bulk inputs are written",
+)
+@click.option(
+    "--journal",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Checkpoint journal for bulk imports "
+    "(default: one per input under ~/.cache/sekha/import-journals)",
+)
+@click.option(
+    "--resume",
+    is_flag=True,
+    help="Skip inputs the journal records as already stored",
+)
+@click.option(
+    "--force",
+    is_flag=True,
+    help="Start over even if an interrupted import left its journal",
+)
 @click.pass_context
-def store(ctx: click.Context, file: Path, label: str):
-    """Store conversation from file.
+def store(
+    ctx: click.Context,
+    file: Optional[Path],
+    source: Optional[str],
+    label: Optional[str],
+    concurrency: int,
+    retry_file: Path,
+    journal: Optional[Path],
+    resume: bool,
+    force: bool,
+):
+    """Store conversation from file, or bulk import many.
 
+    \b
     Example:
         sekha store --file conversation.json --label "Imported"
+        sekha store --input "archive/**/*.json" --label "Archive" --concurrency 16
+        sekha store --input nightly.jsonl --label "Nightly" --resume
     """
-    client: SekhaClient = ctx.obj["client"]
+    if bool(file) == bool(source):
+        raise click.UsageError("Pass exactly one of --file or --input")
+
+    client = _get_client(ctx)
+
+    if source:
+        from .ingest import ImportJournal, default_journal_path
+
+        journal_path = journal or default_journal_path(
+            Config._get_default_cache_dir() / "import-journals", source
+        )
+        if not (resume or force) and ImportJournal.unfinished(journal_path):
+            raise click.UsageError(
+                f"An interrupted import left its journal at {journal_path}; "
+                "pass --resume to continue it or --force to start over"
+            )
+        _bulk_store(
+            _get_bulk_client(ctx),
+            source,
+            label,
+            concurrency,
+            retry_file,
+            journal_path,
+            resume,
+        )
+        return
+
+    if not label:
+        raise click.UsageError("--label is required with --file")
 
     try:
         result = client.store_conversation(str(file), label)
+        completion.remember(conversations=[{"id": result["id"], "label": label}])
+        _index_ids([result["id"]])
         console.print(f"[green]Stored conversation: {result['id']}[/green]")
 
     except Exception as e:
         raise click.ClickException(f"Store failed: {str(e)}") from e
 
 
+def _bulk_store(
+    client: "SekhaClient",
+    source: str,
+    label: Optional[str],
+    concurrency: int,
+    retry_file: Path,
+    journal_path: Path,
+    resume: bool,
+) -> None:
+    """Import every conversation under ``source`` through a worker pool.
+
+    Completed inputs are checkpointed by content hash so ``--resume`` after a
+    crash only sends what is left. The journal is marked complete once every
+    input has been tried.
+    """
+    import asyncio
+
+    from rich.progress import Progress, SpinnerColumn, TextColumn, TimeElapsedColumn
+
+    from .async_client import AsyncSekhaClient
+    from .ingest import ImportJournal, ImportSummary, iter_import_items, prepare_item
+
+    try:
+        journal = ImportJournal(journal_path, resume=resume)
+    except OSError as e:
+        raise click.ClickException(f"Store failed: {str(e)}") from e
+
+    summary = ImportSummary()
+    stored_ids: List[str] = []
+    started = time.perf_counter()
+
+    async def run_import(progress: Any, task: Any) -> None:
+        async def store_one(item: Any) -> Any:
+            prepared = await aclient.run(prepare_item, item, label, journal)
+            if prepared is None:
+                return None
+            messages, item_label = prepared
+            return await aclient.store_messages(
+                messages, item_label, idempotency_key=item.digest
+            )
+
+        async with AsyncSekhaClient(
+            client=client, concurrency=concurrency
+        ) as aclient:
+            outcomes = aclient.map_unordered(store_one, iter_import_items(source))
+            async for item, result, error in outcomes:
+                summary.record(item, result, error)
+                if result is not None:
+                    stored_ids.append(result["id"])
+                    if item.digest:
+                        journal.add(item.digest, result["id"])
+                elapsed = max(time.perf_counter() - started, 1e-9)
+                processed = summary.stored + summary.skipped + len(summary.failed)
+                rate = (
+                    f"{processed / elapsed:.1f} conv/s, "
+                    f"{summary.bytes / elapsed / 1_000_000:.2f} MB/s"
+                )
+                progress.update(task, completed=summary.stored, rate=rate)
+
+    try:
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            TextColumn("{task.completed} stored"),
+            TextColumn("[cyan]{task.fields[rate]}"),
+            TimeElapsedColumn(),
+            console=console.get(),
+        ) as progress:
+            task = progress.add_task("Importing", total=None, rate="")
+            asyncio.run(run_import(progress, task))
+        journal.finish()
+
+    except Exception as e:
+        raise click.ClickException(f"Store failed: {str(e)}") from e
+    finally:
+        journal.close()
+        _index_ids(stored_ids)
+
+    elapsed = time.perf_counter() - started
+    console.print(
+        f"[green]Stored {summary.stored} conversations[/green] "
+        f"({summary.bytes / 1_000_000:.2f} MB in {elapsed:.1f}s)"
+    )
+    if summary.skipped:
+        console.print(f"[yellow]Skipped {summary.skipped} already stored[/yellow]")
+    if summary.failed:
+        summary.write_retry_file(retry_file)
+        console.print(
+            f"[red]{len(summary.failed)} failed[/red], "
+            f"inputs written to {retry_file}"
+        )
+        for item in summary.failed[:10]:
+            console.print(f"  - {item.source}: {summary.errors[item.source]}")
+        raise click.exceptions.Exit(1)
+
+
 @cli.group()
 def labels():
     """Manage conversation labels."""
 
 
 @labels.command("list")
+@click.option(
+    "--concurrency",
+    default=4,
+    type=click.IntRange(min=1),
+    help="Page requests kept in flight",
+)
+@click.option(
+    "--timing",
+    is_flag=True,
+    help="Show which counting path ran and how long it took",
+)
+@click.option(
+    "--local",
+    is_flag=True,
+    help="Answer from the local mirror kept by `sekha sync`",
+)
 @click.pass_context
-def list_labels(ctx: click.Context):
+def list_labels(ctx: click.Context, concurrency: int, timing: bool, local: bool):
     """List all labels with conversation counts.
 
+    \b
     Example:
-        sekha labels list
+        sekha labels list --timing
+        sekha labels list --local
     """
-    client: SekhaClient = ctx.obj["client"]
+    ctx.obj["local"] = local
+    client = _get_client(ctx)
 
     try:
-        labels_list = client.list_labels()
+        started = time.perf_counter()
+        labels_list = client.list_labels(concurrency=concurrency)
+        elapsed = time.perf_counter() - started
+        completion.remember(labels=[label["name"] for label in labels_list])
+
+        if timing:
+            console.print(
+                f"[dim]Counted labels via {client.last_labels_path} "
+                f"in {elapsed * 1000:.1f} ms[/dim]"
+            )
 
         if not labels_list:
             console.print("[yellow]No labels found.[/yellow]")
             return
 
+        from rich.table import Table
+
         table = Table(title="Labels")
         table.add_column("Label", style="cyan")
         table.add_column("Count", style="magenta", justify="right")
@@ -167,38 +841,102 @@ def conversation():
     """Conversation operations."""
 
 
+def _get_conversation(client: Any, conversation_id: str, use_cache: bool) -> Any:
+    """Fetch a conversation, reading through the local cache if asked.
+
+    A daemon reads through its own cache handle, so the cache is only opened
+    here for a direct client, and closed once the read is done.
+    """
+    from .daemon import DaemonClient
+
+    if not use_cache or isinstance(client, DaemonClient):
+        return client.get_conversation(conversation_id, cache=use_cache or None)
+    conv_cache = _open_conversation_cache()
+    try:
+        return client.get_conversation(conversation_id, cache=conv_cache)
+    finally:
+        conv_cache.close()
+
+
 @conversation.command("show")
-@click.argument("conversation_id")
+@click.argument("conversation_id", shell_complete=completion.complete_conversation_ids)
 @click.option(
     "--format",
-    type=click.Choice(["json", "markdown", "text"]),
+    type=click.Choice(["json", "jsonl", "markdown", "text"]),
     default="text",
     help="Output format",
 )
+@click.option(
+    "--cache/--no-cache",
+    "use_cache",
+    default=True,
+    help="Keep a local copy and revalidate it instead of re-downloading",
+)
+@click.option(
+    "--offline",
+    is_flag=True,
+    help="Serve from the local cache without contacting the controller",
+)
+@click.option(
+    "--template",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    envvar="SEKHA_MARKDOWN_TEMPLATE",
+    help="YAML/JSON Markdown template (title, header, role_format, truncate, "
+    "separator)",
+)
+@click.option(
+    "--local",
+    is_flag=True,
+    help="Answer from the local mirror kept by `sekha sync`",
+)
 @click.pass_context
 def show_conversation(
     ctx: click.Context,
     conversation_id: str,
     format: str,
+    use_cache: bool,
+    offline: bool,
+    template: Optional[Path],
+    local: bool,
 ):
     """Show conversation details.
 
+    \b
     Example:
-        sekha conversation show <id> --format markdown
+        sekha conversation show 3f2a9c1e --format markdown
+        sekha conversation show <id> --format markdown --template brief.yaml
+        sekha conversation show <id> --offline
+        sekha conversation show <id> --local
     """
-    client: SekhaClient = ctx.obj["client"]
-
+    ctx.obj["local"] = local
     try:
-        conv = client.get_conversation(conversation_id)
+        conversation_id = _resolve_id(conversation_id)
+        if local:
+            use_cache = False
+        if offline:
+            conv_cache = _open_conversation_cache()
+            try:
+                cached = conv_cache.get(conversation_id)
+            finally:
+                conv_cache.close()
+            if cached is None:
+                raise click.ClickException(
+                    f"Conversation {conversation_id} is not in the local cache"
+                )
+            conv = cached.conversation
+        else:
+            conv = _get_conversation(_get_client(ctx), conversation_id, use_cache)
+        completion.remember(conversations=[{"id": conversation_id, **conv}])
+
+        if format in ("json", "jsonl"):
+            from .output import dumps_compact
 
-        if format == "json":
-            click.echo(json.dumps(conv, indent=2))
+            click.echo(dumps_compact(conv))
         elif format == "markdown":
-            console.print(f"# {conv.get('label', 'Unlabeled')}\n")
-            for msg in conv.get("messages", []):
-                role = msg.get("role", "unknown").capitalize()
-                content = msg.get("content", "")
-                console.print(f"**{role}:** {content}\n")
+            from .markdown import MarkdownRenderer
+
+            MarkdownRenderer(_load_template(template)).write(conv, sys.stdout.write)
+            sys.stdout.flush()
         else:
             console.print(f"Label: {conv.get('label', 'Unlabeled')}")
             console.print(f"Created: {conv.get('created_at', 'Unknown')}")
@@ -208,24 +946,73 @@ def show_conversation(
                 content = msg.get("content", "")[:100]
                 console.print(f"  {role}: {content}...")
 
+    except click.ClickException:
+        raise
     except Exception as e:
         raise click.ClickException(f"Show conversation failed: {str(e)}") from e
 
 
+@conversation.command("archive")
+@click.argument(
+    "conversation_ids",
+    nargs=-1,
+    required=True,
+    shell_complete=completion.complete_conversation_ids,
+)
+@click.option(
+    "--concurrency",
+    default=8,
+    type=click.IntRange(min=1),
+    help="Parallel archive requests",
+)
+@click.pass_context
+def archive_conversations(
+    ctx: click.Context, conversation_ids: Tuple[str, ...], concurrency: int
+):
+    """Archive conversations by id or unambiguous id prefix.
+
+    \b
+    Example:
+        sekha conversation archive 3f2a9c1e
+        sekha conversation archive 3f2a9c1e 77b04d2a --concurrency 4
+    """
+    ids = list(dict.fromkeys(_resolve_id(i) for i in conversation_ids))
+    client = _get_client(ctx)
+    failed = {}
+    try:
+        for conversation_id, error in client.archive_many(ids, concurrency=concurrency):
+            if error is not None:
+                failed[conversation_id] = error
+    except Exception as e:
+        raise click.ClickException(f"Archive failed: {str(e)}") from e
+
+    console.print(f"[green]Archived {len(ids) - len(failed)} conversations.[/green]")
+    if failed:
+        for conversation_id, error in failed.items():
+            console.print(f"  - [red]{conversation_id}[/red]: {error}")
+        raise click.exceptions.Exit(1)
+
+
 @cli.command()
 @click.option(
     "--dry-run",
     is_flag=True,
     help="Show what would be pruned without doing it",
 )
+@click.option(
+    "--concurrency",
+    default=8,
+    type=click.IntRange(min=1),
+    help="Parallel archive requests",
+)
 @click.pass_context
-def prune(ctx: click.Context, dry_run: bool):
+def prune(ctx: click.Context, dry_run: bool, concurrency: int):
     """Prune low-importance conversations.
 
     Example:
         sekha prune --dry-run
     """
-    client: SekhaClient = ctx.obj["client"]
+    client = _get_client(ctx)
 
     try:
         suggestions = client.get_pruning_suggestions()
@@ -239,15 +1026,87 @@ def prune(ctx: click.Context, dry_run: bool):
             console.print(msg)
             for s in suggestions:
                 console.print(f"  - {s.get('id')}: {s.get('reason')}")
-        else:
-            if click.confirm(f"Prune {len(suggestions)} conversations?"):
-                for s in suggestions:
-                    client.archive(s.get("id"))
-                console.print("[green]Pruning complete.[/green]")
+            return
+
+        if not click.confirm(f"Prune {len(suggestions)} conversations?"):
+            return
+
+        ids = list(dict.fromkeys(s.get("id") for s in suggestions if s.get("id")))
+        skipped = len(suggestions) - len(ids)
+        failed = {}
+
+        import asyncio
+
+        from rich.progress import (
+            BarColumn,
+            MofNCompleteColumn,
+            Progress,
+            TextColumn,
+            TimeElapsedColumn,
+        )
+
+        from .async_client import AsyncSekhaClient
+
+        async def run_archive(progress: Any, task: Any) -> None:
+            async with AsyncSekhaClient(
+                client=_get_bulk_client(ctx), concurrency=concurrency
+            ) as aclient:
+                async for conversation_id, error in aclient.archive_many(ids):
+                    if error is not None:
+                        failed[conversation_id] = error
+                    progress.advance(task)
+
+        with Progress(
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            MofNCompleteColumn(),
+            TimeElapsedColumn(),
+            console=console.get(),
+        ) as progress:
+            task = progress.add_task("Archiving", total=len(ids))
+            asyncio.run(run_archive(progress, task))
 
     except Exception as e:
         raise click.ClickException(f"Prune failed: {str(e)}") from e
 
+    console.print(
+        f"[green]Pruning complete.[/green] Archived {len(ids) - len(failed)}, "
+        f"failed {len(failed)}, skipped {skipped}"
+    )
+    if failed:
+        for conversation_id, error in failed.items():
+            console.print(f"  - [red]{conversation_id}[/red]: {error}")
+        raise click.exceptions.Exit(1)
+
+
+def _load_template(path: Optional[Path]) -> Optional["MarkdownTemplate"]:
+    """Load a Markdown template file, if one was given."""
+    if path is None:
+        return None
+    from .markdown import MarkdownTemplate
+
+    try:
+        return MarkdownTemplate.load(path)
+    except Exception as e:
+        raise click.BadParameter(str(e), param_hint="--template") from e
+
+
+def _parse_size_option(
+    ctx: click.Context, param: click.Parameter, value: Optional[str]
+) -> Optional[int]:
+    """Click callback turning ``500M``-style sizes into bytes."""
+    if value is None:
+        return None
+    from .output import parse_size
+
+    try:
+        size = parse_size(value)
+    except ValueError as e:
+        raise click.BadParameter(str(e)) from e
+    if size <= 0:
+        raise click.BadParameter("Size must be positive")
+    return size
+
 
 @cli.command()
 @click.option(
@@ -263,33 +1122,896 @@ def prune(ctx: click.Context, dry_run: bool):
 )
 @click.option(
     "--format",
-    type=click.Choice(["markdown", "json"]),
+    type=click.Choice(["markdown", "json", "jsonl", "parquet", "arrow"]),
     default="markdown",
     help="Export format",
 )
-@click.pass_context
-def export(
-    ctx: click.Context,
-    label: str,
-    output: Path,
-    format: str,
-):
+@click.option(
+    "--page-size",
+    default=100,
+    type=click.IntRange(min=1),
+    help="Conversations fetched per request",
+)
+@click.option(
+    "--concurrency",
+    default=4,
+    type=click.IntRange(min=1),
+    help="Page requests kept in flight",
+)
+@click.option(
+    "--since",
+    help="Only export conversations created or updated at or after this "
+    "ISO-8601 timestamp",
+)
+@click.option(
+    "--incremental",
+    is_flag=True,
+    help="Treat --output as a backup directory and write only what changed "
+    "since the last run",
+)
+@click.option(
+    "--compress",
+    type=click.Choice(["gzip", "zstd", "none"]),
+    help="Compress output (default: from the .gz/.zst extension)",
+)
+@click.option(
+    "--split-size",
+    callback=_parse_size_option,
+    help="Rotate output into numbered files of about this size (e.g. 500M)",
+)
+@click.option(
+    "--template",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    envvar="SEKHA_MARKDOWN_TEMPLATE",
+    help="YAML/JSON Markdown template (title, header, role_format, truncate, "
+    "separator)",
+)
+@click.option(
+    "--local",
+    is_flag=True,
+    help="Read from the local mirror kept by `sekha sync`",
+)
+@click.pass_context
+def export(
+    ctx: click.Context,
+    label: str,
+    output: Path,
+    format: str,
+    page_size: int,
+    concurrency: int,
+    since: Optional[str],
+    incremental: bool,
+    compress: Optional[str],
+    split_size: Optional[int],
+    template: Optional[Path],
+    local: bool,
+):
     """Export conversations by label.
 
+    Conversations are fetched page by page and streamed to the output file,
+    so memory use stays flat regardless of how many match the label.
+
+    With --incremental, each run writes a numbered delta file into the
+    --output directory holding only conversations that changed since the
+    watermark stored in its manifest.json. Use `sekha snapshot` to rebuild a
+    full export from the deltas.
+
+    Compression is picked from the output extension (.gz, .zst) or
+    --compress; zstd needs the optional zstandard package. --split-size
+    counts uncompressed bytes and only splits between conversations, so each
+    file is a complete document.
+
+    parquet and arrow write one row per message (conversation_id, label,
+    created_at, message_index, role, content) for analytics tools, one row
+    group per fetched page. They need the optional pyarrow package and use
+    the format's own compression.
+
+    \b
     Example:
         sekha export --label "Project:AI" --output backup.md
+        sekha export --label "Project:AI" --output backup.jsonl --format jsonl
+        sekha export --label "Project:AI" --output backups/ai --incremental
+        sekha export --label "Project:AI" --output backup.jsonl.zst --split-size 1G
+        sekha export --label "Project:AI" --output messages.parquet --format parquet
+        sekha export --label "Project:AI" --output backup.jsonl --local
     """
-    client: SekhaClient = ctx.obj["client"]
+    ctx.obj["local"] = local
+    from .incremental import parse_timestamp
+
+    since_at = parse_timestamp(since) if since else None
+    if since and since_at is None:
+        raise click.BadParameter(
+            f"Not an ISO-8601 timestamp: {since}", param_hint="--since"
+        )
+
+    markdown_template = _load_template(template)
+
+    if format in ("parquet", "arrow"):
+        if incremental or compress or split_size:
+            raise click.UsageError(
+                f"--incremental, --compress and --split-size do not apply to {format}"
+            )
+        _export_columnar(ctx, label, output, format, page_size, concurrency, since_at)
+        return
+
+    if incremental:
+        if compress or split_size:
+            raise click.UsageError(
+                "--compress and --split-size cannot be used with --incremental"
+            )
+        _export_incremental(
+            ctx,
+            label,
+            output,
+            format,
+            page_size,
+            concurrency,
+            since_at,
+            markdown_template,
+        )
+        return
+
+    from .output import COMPRESSION_SUFFIXES, OutputFile, detect_compression
+
+    if compress is None:
+        compress = detect_compression(output)
+    elif compress == "none":
+        compress = None
+    elif detect_compression(output) != compress:
+        suffix = next(s for s, c in COMPRESSION_SUFFIXES.items() if c == compress)
+        output = output.with_name(output.name + suffix)
+
+    client = _get_client(ctx)
+
+    try:
+        with OutputFile(output, compress=compress, split_size=split_size) as f:
+            count = client.export_to(
+                label,
+                f,
+                format=format,
+                page_size=page_size,
+                concurrency=concurrency,
+                since=since_at,
+                template=markdown_template,
+            )
+        if len(f.paths) > 1:
+            destination = f"{len(f.paths)} files ({f.paths[0]} ... {f.paths[-1]})"
+        else:
+            destination = str(f.paths[0])
+        console.print(f"[green]Exported {count} conversations to {destination}[/green]")
+
+    except Exception as e:
+        raise click.ClickException(f"Export failed: {str(e)}") from e
+
+
+def _export_columnar(
+    ctx: click.Context,
+    label: str,
+    output: Path,
+    format: str,
+    page_size: int,
+    concurrency: int,
+    since: Optional["datetime"],
+) -> None:
+    """Export a label as a Parquet or Arrow table of messages."""
+    client = _get_client(ctx)
 
     try:
-        content = client.export(label, format=format)
-        output.write_text(content)
-        console.print(f"[green]Exported to {output}[/green]")
+        conversations, rows = client.export_columnar(
+            label,
+            output,
+            format=format,
+            page_size=page_size,
+            concurrency=concurrency,
+            since=since,
+        )
+        console.print(
+            f"[green]Exported {conversations} conversations ({rows} messages) "
+            f"to {output}[/green]"
+        )
 
     except Exception as e:
         raise click.ClickException(f"Export failed: {str(e)}") from e
 
 
+def _export_incremental(
+    ctx: click.Context,
+    label: str,
+    directory: Path,
+    format: str,
+    page_size: int,
+    concurrency: int,
+    since: Optional["datetime"],
+    template: Optional["MarkdownTemplate"],
+) -> None:
+    """Append one delta of new or changed conversations to a backup directory."""
+    from .incremental import ExportManifest
+
+    if directory.exists() and not directory.is_dir():
+        raise click.UsageError(f"--incremental needs a directory, got file {directory}")
+
+    try:
+        manifest = ExportManifest.load(directory)
+    except (OSError, ValueError, KeyError) as e:
+        raise click.ClickException(f"Export failed: unreadable manifest ({e})") from e
+    if manifest is None:
+        manifest = ExportManifest(directory, label, format)
+    elif (manifest.label, manifest.format) != (label, format):
+        raise click.UsageError(
+            f"{directory} holds {manifest.format} exports of label "
+            f"'{manifest.label}'"
+        )
+
+    # An explicit --since re-exports everything from then on; the stored
+    # watermark skips what the previous run already wrote at it.
+    seen_ids = [] if since else manifest.watermark_ids
+    since = since or manifest.since
+    client = _get_client(ctx)
+    delta = manifest.next_delta_path()
+
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        with delta.open("w", encoding="utf-8") as f:
+            count = client.export_to(
+                label,
+                f,
+                format=format,
+                page_size=page_size,
+                concurrency=concurrency,
+                since=since,
+                template=template,
+                seen_ids=seen_ids,
+            )
+        watermark = client.last_export_watermark
+        watermark_ids = client.last_export_watermark_ids
+        if count:
+            manifest.record_delta(delta, since, watermark, count, watermark_ids)
+        else:
+            delta.unlink()
+            manifest.advance(watermark, watermark_ids)
+        manifest.save()
+
+    except Exception as e:
+        raise click.ClickException(f"Export failed: {str(e)}") from e
+
+    if count:
+        console.print(
+            f"[green]Exported {count} new or changed conversations to {delta}[/green]"
+        )
+    else:
+        console.print("[yellow]No changes since the last export.[/yellow]")
+
+
+@cli.command()
+@click.argument(
+    "directory", type=click.Path(exists=True, file_okay=False, path_type=Path)
+)
+@click.option(
+    "--output",
+    type=click.Path(dir_okay=False, path_type=Path),
+    required=True,
+    help="Output file path",
+)
+def snapshot(directory: Path, output: Path):
+    """Rebuild a full export from an incremental export directory.
+
+    Deltas are replayed in order and only the latest copy of each
+    conversation is kept. Only json and jsonl exports can be rebuilt.
+
+    Example:
+        sekha snapshot backups/ai --output ai-full.jsonl
+    """
+    from .incremental import ExportManifest, rebuild_snapshot
+    from .output import record_writer
+
+    try:
+        manifest = ExportManifest.load(directory)
+        if manifest is None:
+            raise click.ClickException(f"No manifest.json in {directory}")
+        with output.open("w", encoding="utf-8") as f:
+            count = rebuild_snapshot(manifest, record_writer(manifest.format, f))
+        console.print(f"[green]Rebuilt {count} conversations into {output}[/green]")
+
+    except click.ClickException:
+        raise
+    except Exception as e:
+        raise click.ClickException(f"Snapshot failed: {str(e)}") from e
+
+
+@cli.command()
+@click.option(
+    "--full",
+    is_flag=True,
+    help="Pull everything again and drop conversations gone from the controller",
+)
+@click.option(
+    "--page-size",
+    default=100,
+    type=click.IntRange(min=1),
+    help="Conversations fetched per request",
+)
+@click.option(
+    "--concurrency",
+    default=4,
+    type=click.IntRange(min=1),
+    help="Page requests kept in flight",
+)
+@click.option(
+    "--from-file",
+    "files",
+    multiple=True,
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="Load a json/jsonl export (optionally .gz/.zst) instead of the controller",
+)
+@click.pass_context
+def sync(
+    ctx: click.Context,
+    full: bool,
+    page_size: int,
+    concurrency: int,
+    files: Tuple[Path, ...],
+):
+    """Mirror conversations into a local SQLite database.
+
+    Only conversations created or updated since the previous sync are
+    pulled. Read commands answer from the mirror with --local, and message
+    text is indexed for `sekha fts`.
+
+    \b
+    Example:
+        sekha sync
+        sekha sync --full
+        sekha sync --from-file backup.jsonl.gz
+        sekha query "token limits" --local
+    """
+    if files:
+        _sync_from_files(ctx, files, page_size)
+        return
+
+    client = _get_client(ctx)
+    api_url, _ = _resolve_connection(ctx)
+
+    try:
+        with _open_mirror(api_url) as mirror:
+            started = time.perf_counter()
+            synced, removed = client.sync_to(
+                mirror, page_size=page_size, concurrency=concurrency, full=full
+            )
+            elapsed = time.perf_counter() - started
+            stats = mirror.stats()
+            _remember_mirror(mirror)
+        message = f"Synced {synced} conversations in {elapsed:.1f}s"
+        if removed:
+            message += f", removed {removed}"
+        console.print(f"[green]{message}.[/green]")
+        console.print(
+            f"Mirror holds {stats['conversations']} conversations, "
+            f"{stats['messages']} messages ({stats['path']})"
+        )
+
+    except Exception as e:
+        raise click.ClickException(f"Sync failed: {str(e)}") from e
+
+
+def _sync_from_files(ctx: click.Context, files: Tuple[Path, ...], batch: int) -> None:
+    """Load exported conversations into the mirror, ``batch`` at a time.
+
+    The sync watermark is left alone so the next controller sync still
+    pulls everything changed since the last one.
+    """
+    from .output import iter_records
+
+    count = 0
+    try:
+        with _open_mirror(_mirror_base_url(ctx)) as mirror:
+            for path in files:
+                page = []
+                for record in iter_records(path):
+                    page.append(record)
+                    if len(page) >= batch:
+                        count += mirror.apply(page)
+                        page = []
+                count += mirror.apply(page)
+            mirror.finish(None)
+            _remember_mirror(mirror)
+        console.print(f"[green]Loaded {count} conversations into the mirror.[/green]")
+
+    except Exception as e:
+        raise click.ClickException(f"Sync failed: {str(e)}") from e
+
+
+@cli.command()
+@click.argument("keywords", nargs=-1, required=True)
+@click.option(
+    "--label", help="Filter by label", shell_complete=completion.complete_labels
+)
+@click.option("--limit", default=10, type=click.IntRange(min=1), help="Max results")
+@click.option(
+    "--raw",
+    is_flag=True,
+    help="Treat KEYWORDS as an FTS5 query (phrases, OR, NEAR, prefix*)",
+)
+@click.option(
+    "--format",
+    type=click.Choice(["table", "json", "jsonl"]),
+    default="table",
+    help="Output format",
+)
+@click.pass_context
+def fts(
+    ctx: click.Context,
+    keywords: Tuple[str, ...],
+    label: Optional[str],
+    limit: int,
+    raw: bool,
+    format: str,
+):
+    """Full-text search of the local mirror, ranked by BM25.
+
+    Every keyword must appear in a message; a trailing * matches a prefix.
+    Results are single messages with the matching words highlighted. Run
+    `sekha sync` first; no request is sent to the controller.
+
+    \b
+    Example:
+        sekha fts token limit
+        sekha fts "embed*" --label Work --format jsonl
+        sekha fts --raw '"context window" OR chunking'
+    """
+    import sqlite3
+
+    from .fts import highlight
+
+    api_url = _mirror_base_url(ctx)
+    with _open_mirror(api_url) as mirror:
+        if mirror.last_sync is None:
+            raise click.ClickException(
+                f"No local mirror of {api_url} yet; run `sekha sync` first"
+            )
+        try:
+            with tracer.span("fts.search"):
+                hits = mirror.full_text_search(
+                    " ".join(keywords), label=label, limit=limit, raw=raw
+                )
+        except (ValueError, sqlite3.OperationalError) as e:
+            raise click.ClickException(f"Invalid search: {str(e)}") from e
+        except RuntimeError as e:
+            raise click.ClickException(f"Full-text search failed: {str(e)}") from e
+
+    if format in ("json", "jsonl"):
+        for hit in hits:
+            hit["snippet"] = highlight(hit["snippet"], "**", "**")
+        _echo_records(format, hits)
+        return
+
+    if not hits:
+        console.print("[yellow]No results found.[/yellow]")
+        return
+
+    from rich.markup import escape
+    from rich.table import Table
+
+    table = Table(title=f"Full-text: '{' '.join(keywords)}'")
+    table.add_column("ID", style="cyan", no_wrap=True)
+    table.add_column("Label", style="magenta")
+    table.add_column("Role", style="dim")
+    table.add_column("Match", style="white")
+    for hit in hits:
+        snippet = highlight(escape(hit["snippet"]), "[bold yellow]", "[/bold yellow]")
+        table.add_row(hit["id"][:12], hit["label"] or "", hit["role"] or "", snippet)
+    console.print(table)
+
+
+@cli.command()
+@click.option(
+    "--label", help="Filter by label", shell_complete=completion.complete_labels
+)
+@click.option(
+    "--limit", default=50, type=click.IntRange(min=1), help="Max results shown"
+)
+@click.option(
+    "--remote/--no-remote",
+    default=True,
+    help="Also run a semantic search on the controller when typing pauses",
+)
+@click.option(
+    "--debounce",
+    default=250,
+    type=click.IntRange(min=0),
+    help="Milliseconds to wait after the last keystroke before searching remotely",
+)
+@click.option(
+    "--format",
+    type=click.Choice(["json", "jsonl", "markdown", "text"]),
+    default="text",
+    help="Format used to show the chosen conversation",
+)
+@click.pass_context
+def find(
+    ctx: click.Context,
+    label: Optional[str],
+    limit: int,
+    remote: bool,
+    debounce: int,
+    format: str,
+):
+    """Pick a conversation interactively with fuzzy search.
+
+    Results re-rank on every keystroke from the local mirror (ids, labels
+    and previews); semantic matches from the controller are appended, marked
+    with ~, once typing pauses. Enter shows the highlighted conversation,
+    Esc quits. Run `sekha sync` first to search offline.
+
+    \b
+    Example:
+        sekha find
+        sekha find --label Work --no-remote
+        sekha find --format markdown
+    """
+    if not (sys.stdin.isatty() and sys.stdout.isatty()):
+        raise click.ClickException("sekha find needs an interactive terminal")
+    try:
+        import curses  # noqa: F401
+    except ImportError as e:
+        raise click.ClickException(
+            "sekha find needs the curses module, which this Python lacks"
+        ) from e
+
+    from .finder import Finder, FinderIndex, RemoteSearch, run_curses
+
+    with _open_mirror(_mirror_base_url(ctx)) as mirror:
+        entries = mirror.entries(label) if mirror.last_sync is not None else []
+    if not entries and not remote:
+        raise click.ClickException(
+            "Nothing to search: run `sekha sync` first or drop --no-remote"
+        )
+
+    searcher = None
+    if remote:
+        # The client (and the SDK import) is built on the worker thread, so
+        # the first keystrokes never wait for it.
+        def search(query: str) -> List[Dict[str, Any]]:
+            return _get_client(ctx).query(query, label=label, limit=limit)
+
+        searcher = RemoteSearch(search, debounce=debounce / 1000)
+
+    try:
+        with tracer.span("find.session", entries=len(entries)):
+            choice = run_curses(Finder(FinderIndex(entries), searcher, limit=limit))
+    finally:
+        if searcher is not None:
+            searcher.close()
+
+    if choice is not None:
+        ctx.invoke(
+            show_conversation,
+            conversation_id=choice["id"],
+            format=format,
+            use_cache=True,
+            offline=False,
+            template=None,
+            local=not remote,
+        )
+
+
+@cli.command("completion")
+@click.argument("shell", type=click.Choice(completion.SHELLS))
+def completion_script(shell: str):
+    """Print the shell completion script for SHELL.
+
+    Labels and conversation ids complete from a local cache that query,
+    store, sync, `labels list` and `conversation show` keep current and
+    that refreshes itself in the background, so TAB never waits on the
+    controller.
+
+    \b
+    Example:
+        eval "$(sekha completion bash)"    # in ~/.bashrc
+        eval "$(sekha completion zsh)"     # in ~/.zshrc
+        sekha completion fish > ~/.config/fish/completions/sekha.fish
+    """
+    from click.shell_completion import get_completion_class
+
+    comp_cls = get_completion_class(shell)
+    click.echo(comp_cls(cli, {}, "sekha", completion.COMPLETE_VAR).source())
+
+
+@cli.command("completion-refresh", hidden=True)
+@click.pass_context
+def completion_refresh(ctx: click.Context):
+    """Rebuild the completion cache from the mirror and the controller."""
+    with _open_mirror(_mirror_base_url(ctx)) as mirror:
+        if mirror.last_sync is not None:
+            _remember_mirror(mirror)
+    try:
+        labels = _get_client(ctx).list_labels()
+    except Exception as e:
+        raise click.ClickException(f"Completion refresh failed: {str(e)}") from e
+    completion.remember(labels=[label["name"] for label in labels], refreshed=True)
+
+
+@cli.group()
+def daemon():
+    """Run a background daemon that keeps a warm controller connection."""
+
+
+@daemon.command("start")
+@click.option(
+    "--metrics-interval",
+    default=60.0,
+    type=float,
+    help="Seconds between metrics flushes when --metrics-file is set",
+)
+@click.pass_context
+def daemon_start(ctx: click.Context, metrics_interval: float):
+    """Serve CLI requests on a Unix socket until stopped.
+
+    Run it in the background (or under a service manager); other sekha
+    commands forward to it automatically.
+
+    \b
+    Example:
+        sekha daemon start &
+        sekha --metrics-file /var/lib/node_exporter/sekha.prom daemon start &
+    """
+    from . import daemon as daemon_module
+
+    if not daemon_module.is_supported():
+        raise click.ClickException("Daemon mode needs Unix domain sockets")
+
+    api_url, api_key = _resolve_connection(ctx)
+    running = daemon_module.DaemonClient.connect(api_url, api_key)
+    if running is not None:
+        running.close()
+        raise click.ClickException("A daemon is already running for this controller")
+
+    from .client import SekhaClient
+
+    path = daemon_module.socket_path(api_url, api_key)
+    try:
+        server = daemon_module.DaemonServer(
+            path,
+            SekhaClient(base_url=api_url, api_key=api_key),
+            cache_factory=_open_conversation_cache,
+        )
+    except (OSError, daemon_module.DaemonError) as e:
+        raise click.ClickException(f"Daemon failed to start: {str(e)}") from e
+    stop_metrics = None
+    if "metrics" in ctx.obj:
+        from .metrics import start_periodic_flush
+
+        stop_metrics = start_periodic_flush(*ctx.obj["metrics"], metrics_interval)
+    console.print(f"[green]Sekha daemon listening on {path}[/green]")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if stop_metrics is not None:
+            stop_metrics()
+
+
+@daemon.command("stop")
+@click.pass_context
+def daemon_stop(ctx: click.Context):
+    """Stop the daemon for the current controller.
+
+    Example:
+        sekha daemon stop
+    """
+    running = _connect_daemon(ctx)
+    running.call("shutdown")
+    running.close()
+    console.print("[green]Daemon stopped.[/green]")
+
+
+@daemon.command("status")
+@click.pass_context
+def daemon_status(ctx: click.Context):
+    """Show whether a daemon is serving the current controller.
+
+    Example:
+        sekha daemon status
+    """
+    running = _connect_daemon(ctx)
+    info = running.call("ping")
+    running.close()
+    console.print(
+        f"Daemon pid {info['pid']} for {info['base_url']}: "
+        f"up {info['uptime']:.0f}s, {info['requests']} requests served"
+    )
+
+
+def _connect_daemon(ctx: click.Context) -> "DaemonClient":
+    """Connect to the running daemon or fail with a friendly message."""
+    from .daemon import DaemonClient
+
+    api_url, api_key = _resolve_connection(ctx)
+    running = DaemonClient.connect(api_url, api_key)
+    if running is None:
+        raise click.ClickException("No daemon is running for this controller")
+    return running
+
+
+@cli.group()
+def cache():
+    """Inspect or clear the local query and conversation caches."""
+
+
+@cache.command("stats")
+def cache_stats():
+    """Show query cache size and hit rate.
+
+    Example:
+        sekha cache stats
+    """
+    query_cache = _open_query_cache()
+    conv_cache = _open_conversation_cache()
+    try:
+        stats = query_cache.stats()
+        objects = conv_cache.stats()
+    finally:
+        query_cache.close()
+        conv_cache.close()
+    console.print(f"Path: {stats['path']}")
+    console.print(f"Entries: {stats['entries']}")
+    console.print(f"Size: {stats['bytes']} / {stats['max_bytes']} bytes")
+    console.print(
+        f"Hits: {stats['hits']}  Misses: {stats['misses']}  "
+        f"Hit rate: {stats['hit_rate']:.1%}"
+    )
+    console.print(
+        f"Conversations: {objects['conversations']} ({objects['bytes']} bytes)"
+    )
+
+
+@cache.command("clear")
+def cache_clear():
+    """Remove all cached query results and conversations.
+
+    Example:
+        sekha cache clear
+    """
+    query_cache = _open_query_cache()
+    conv_cache = _open_conversation_cache()
+    try:
+        queries = query_cache.clear()
+        conversations = conv_cache.clear()
+    finally:
+        query_cache.close()
+        conv_cache.close()
+    console.print(
+        f"[green]Query and conversation caches cleared ({queries} query results, "
+        f"{conversations} conversations).[/green]"
+    )
+
+
+def _parse_counts_option(
+    ctx: click.Context, param: click.Parameter, value: str
+) -> Tuple[int, ...]:
+    """Click callback turning ``1k,10k,100k`` into conversation counts."""
+    counts = []
+    for part in value.split(","):
+        part = part.strip().lower()
+        scale = {"k": 1_000, "m": 1_000_000}.get(part[-1:], 1)
+        digits = part[:-1] if scale > 1 else part
+        if not digits.isdigit() or int(digits) <= 0:
+            raise click.BadParameter(f"Not a count: {part}")
+        counts.append(int(digits) * scale)
+    return tuple(counts)
+
+
+@cli.command()
+@click.option(
+    "--sizes",
+    default="1k,10k",
+    show_default=True,
+    callback=_parse_counts_option,
+    help="Comma-separated dataset sizes (conversations)",
+)
+@click.option(
+    "--scenario",
+    "scenarios",
+    multiple=True,
+    type=click.Choice(["query", "labels", "export", "store", "prune"]),
+    help="Scenario to run (repeatable; default all)",
+)
+@click.option(
+    "--latency-ms",
+    default=1.0,
+    show_default=True,
+    type=click.FloatRange(min=0),
+    help="Simulated controller latency per request",
+)
+@click.option(
+    "--output",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Write results as JSON",
+)
+@click.option(
+    "--compare",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="Earlier results file to compare against",
+)
+def bench(
+    sizes: Tuple[int, ...],
+    scenarios: Tuple[str, ...],
+    latency_ms: float,
+    output: Optional[Path],
+    compare: Optional[Path],
+):
+    """Benchmark CLI commands against a local stand-in controller.
+
+    Each scenario runs `sekha` in a fresh process against an in-process HTTP
+    server holding a synthetic dataset, and records wall time, requests,
+    bytes transferred and peak RSS.
+
+    \b
+    Example:
+        sekha bench --sizes 1k,10k,100k --output results.json
+        sekha bench --scenario export --compare results.json
+    """
+    from rich.table import Table
+
+    from .bench import SCENARIOS, compare_results, run_benchmarks
+
+    def report(result: Any) -> None:
+        status = "" if result["exit_code"] == 0 else " [red]failed[/red]"
+        console.print(
+            f"{result['scenario']:>7} @ {result['size']:>7}: "
+            f"{result['wall_seconds']:.2f}s{status}"
+        )
+
+    try:
+        results = run_benchmarks(
+            sizes=sizes,
+            scenarios=scenarios or SCENARIOS,
+            latency=latency_ms / 1000,
+            on_result=report,
+        )
+    except Exception as e:
+        raise click.ClickException(f"Benchmark failed: {str(e)}") from e
+
+    table = Table(title="Benchmark results")
+    columns = ("Scenario", "Size", "Wall (s)", "Requests", "MB sent", "Peak RSS (MB)")
+    for column in columns:
+        table.add_column(column, justify="right")
+    for r in results["results"]:
+        rss = r["peak_rss_kb"]
+        table.add_row(
+            r["scenario"],
+            str(r["size"]),
+            f"{r['wall_seconds']:.3f}",
+            str(r["requests"]),
+            f"{r['bytes_sent'] / 1_000_000:.2f}",
+            "-" if rss is None else f"{rss / 1024:.1f}",
+        )
+    console.print(table)
+
+    if output:
+        output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        console.print(f"[green]Results written to {output}[/green]")
+
+    if compare:
+        baseline = json.loads(compare.read_text(encoding="utf-8"))
+        for row in compare_results(baseline, results):
+            ratios = [
+                f"{name} x{row[key]:.2f}" if row[key] is not None else f"{name} n/a"
+                for name, key in (("wall", "wall_ratio"), ("rss", "rss_ratio"))
+            ]
+            console.print(
+                f"{row['scenario']} @ {row['size']}: {', '.join(ratios)}, "
+                f"requests {row['requests_delta']:+d}"
+            )
+
+    failed = [r for r in results["results"] if r["exit_code"] != 0]
+    for r in failed:
+        console.print(f"[red]{r['scenario']} @ {r['size']} failed:[/red] {r['error']}")
+    if failed:
+        raise click.exceptions.Exit(1)
+
+
 @cli.command()
 @click.option(
     "--api-url",
@@ -0,0 +1,124 @@
+"""Streaming Markdown rendering of conversations with a configurable template."""
+import json
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+# Rendered pieces are handed to the writer in batches of this many strings,
+# so a conversation with a huge number of messages never becomes one string.
+WRITE_BATCH = 256
+
+DEFAULT_HEADER = {"Created": "created_at", "ID": "id"}
+TEMPLATE_KEYS = ("title", "header", "role_format", "truncate", "separator")
+
+
+class MarkdownTemplate:
+    """How a conversation is laid out as Markdown.
+
+    ``title`` names the field used for the ``#`` heading, ``header`` maps
+    bold labels to conversation fields, ``role_format`` is formatted with
+    ``role`` (capitalized) and ``raw_role``, and ``truncate`` cuts message
+    content to that many characters.
+    """
+
+    def __init__(
+        self,
+        title: str = "label",
+        header: Optional[Dict[str, str]] = None,
+        role_format: str = "**{role}:** ",
+        truncate: Optional[int] = None,
+        separator: str = "---\n\n",
+    ):
+        self.title = title
+        self.header = DEFAULT_HEADER if header is None else header
+        self.role_format = role_format
+        self.truncate = truncate
+        self.separator = separator
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "MarkdownTemplate":
+        """Build a template from a parsed template file.
+
+        ``role_format`` is tried on a sample role here, so a bad placeholder
+        is reported when the file is loaded rather than halfway through an
+        export.
+        """
+        unknown = set(data) - set(TEMPLATE_KEYS)
+        if unknown:
+            raise ValueError(f"Unknown template keys: {', '.join(sorted(unknown))}")
+        template = cls(**data)
+        try:
+            template.role_format.format(role="User", raw_role="user")
+        except KeyError as e:
+            raise ValueError(
+                f"Unknown field {{{e.args[0]}}} in role_format "
+                "(use {role} or {raw_role})"
+            ) from e
+        except (AttributeError, IndexError, ValueError) as e:
+            raise ValueError(f"Invalid role_format: {e}") from e
+        return template
+
+    @classmethod
+    def load(cls, path: Path) -> "MarkdownTemplate":
+        """Load a template from a YAML or JSON file."""
+        text = path.read_text(encoding="utf-8")
+        if path.suffix == ".json":
+            data = json.loads(text)
+        else:
+            import yaml
+
+            data = yaml.safe_load(text) or {}
+        if not isinstance(data, dict):
+            raise ValueError(f"Template {path} must be a mapping")
+        try:
+            return cls.from_dict(data)
+        except ValueError as e:
+            raise ValueError(f"Template {path}: {e}") from e
+
+
+class MarkdownRenderer:
+    """Render conversations straight into a ``write`` callable.
+
+    Role prefixes are formatted once per distinct role and output is written
+    in batches, so rendering cost is dominated by the message text itself.
+    """
+
+    def __init__(self, template: Optional[MarkdownTemplate] = None):
+        self.template = template or MarkdownTemplate()
+        self._prefixes: Dict[str, str] = {}
+
+    def write(self, conv: Dict[str, Any], write: Callable[[str], Any]) -> None:
+        """Render one conversation through ``write``."""
+        template = self.template
+        parts: List[str] = [f"# {conv.get(template.title) or 'Unlabeled'}\n"]
+        for name, field in template.header.items():
+            value = conv.get(field)
+            parts.append(f"**{name}:** {'Unknown' if value is None else value}\n")
+        parts.append("\n")
+
+        prefixes = self._prefixes
+        truncate = template.truncate
+        for msg in conv.get("messages", []):
+            role = msg.get("role", "unknown")
+            prefix = prefixes.get(role)
+            if prefix is None:
+                prefix = prefixes[role] = template.role_format.format(
+                    role=role.capitalize(), raw_role=role
+                )
+            content = msg.get("content", "")
+            if truncate is not None and len(content) > truncate:
+                content = content[:truncate] + "..."
+            parts.append(prefix)
+            parts.append(content)
+            parts.append("\n\n")
+            if len(parts) >= WRITE_BATCH:
+                write("".join(parts))
+                parts = []
+
+        parts.append(template.separator)
+        write("".join(parts))
+
+    def render(self, conv: Dict[str, Any]) -> str:
+        """Render one conversation to a string."""
+        parts: List[str] = []
+        self.write(conv, parts.append)
+        return "".join(parts)
@@ -0,0 +1,386 @@
+"""Controller request metrics written to Prometheus textfiles or OTLP JSON files.
+
+Metrics are off unless ``--metrics-file`` (``SEKHA_METRICS_FILE``) is set.
+Each flush exports what was recorded since the previous one, so short-lived
+``sekha`` runs and the long-running daemon can share one file:
+
+* ``prometheus`` merges into a textfile-collector file, adding to its
+  counters and histogram buckets and replacing it atomically;
+* ``otlp`` appends one OTLP/JSON ``MetricsData`` line with delta
+  temporality, as read by the collector's ``otlpjsonfile`` receiver.
+
+No network access is involved either way.
+"""
+import functools
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from . import __version__
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+METRICS_FORMATS = ("prometheus", "otlp")
+FORMAT_SUFFIXES = {".prom": "prometheus", ".json": "otlp", ".jsonl": "otlp"}
+
+# Upper bounds in seconds, matching the Prometheus client defaults.
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+REQUESTS = "sekha_client_requests_total"
+DURATION = "sekha_client_request_duration_seconds"
+LAST_FLUSH = "sekha_client_metrics_last_flush_timestamp_seconds"
+
+FAMILIES = {
+    REQUESTS: ("counter", "Controller requests by operation and outcome."),
+    DURATION: ("histogram", "Controller request latency in seconds, by operation."),
+    LAST_FLUSH: ("gauge", "Unix time sekha last flushed metrics to this file."),
+}
+
+# SDK methods and the operation they are reported as.
+OPERATIONS = {
+    "search": "query",
+    "search_batch": "query_batch",
+    "create": "create",
+    "get": "get",
+    "archive": "archive",
+    "archive_many": "archive_many",
+    "label_counts": "label_counts",
+    "get_pruning_suggestions": "prune_suggestions",
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+Samples = Dict[Tuple[str, Labels], float]
+
+_SAMPLE = re.compile(r"^([A-Za-z_:][\w:]*)(?:\{(.*)\})?\s+(\S+)\s*$")
+_LABEL = re.compile(r'(\w+)="((?:[^"\\]|\\.)*)"')
+
+
+class Histogram:
+    """Bucketed latency observations for one operation."""
+
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(DURATION_BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """Add one observation."""
+        index = len(DURATION_BUCKETS)
+        for i, bound in enumerate(DURATION_BUCKETS):
+            if value <= bound:
+                index = i
+                break
+        self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """Per-operation request counters and latency histograms."""
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.requests: Dict[Tuple[str, str], int] = {}
+        self.durations: Dict[str, Histogram] = {}
+        self.start_time = time.time()
+        self._lock = threading.Lock()
+
+    def enable(self) -> None:
+        """Start recording."""
+        self.enabled = True
+
+    def disable(self) -> None:
+        """Stop recording and drop anything not yet flushed."""
+        self.enabled = False
+        self.take()
+
+    def observe(self, operation: str, seconds: float, ok: bool = True) -> None:
+        """Record one controller request."""
+        outcome = "ok" if ok else "error"
+        with self._lock:
+            key = (operation, outcome)
+            self.requests[key] = self.requests.get(key, 0) + 1
+            histogram = self.durations.get(operation)
+            if histogram is None:
+                histogram = self.durations[operation] = Histogram()
+            histogram.observe(seconds)
+
+    def take(self) -> Tuple[float, Dict[Tuple[str, str], int], Dict[str, Histogram]]:
+        """Return and reset everything recorded since the last call."""
+        with self._lock:
+            taken = (self.start_time, self.requests, self.durations)
+            self.requests = {}
+            self.durations = {}
+            self.start_time = time.time()
+        return taken
+
+    def flush(self, path: Path, format: Optional[str] = None) -> bool:
+        """Export recorded metrics to ``path``; returns False if there were none."""
+        format = format or detect_format(path)
+        start, requests, durations = self.take()
+        if not requests:
+            return False
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with _locked(path):
+            if format == "prometheus":
+                _merge_prometheus(path, _prometheus_samples(requests, durations))
+            else:
+                line = json.dumps(_otlp_document(start, requests, durations))
+                with path.open("a", encoding="utf-8") as f:
+                    f.write(line + "\n")
+        return True
+
+
+registry = MetricsRegistry()
+
+
+def detect_format(path: Path) -> str:
+    """Pick the export format from the file extension (Prometheus by default)."""
+    return FORMAT_SUFFIXES.get(path.suffix.lower(), "prometheus")
+
+
+class MeteredController:
+    """Proxy recording every SDK call in ``registry``.
+
+    ``search`` calls with an empty query are export and prune page fetches
+    and are reported as ``search_page``.
+    """
+
+    def __init__(self, controller: Any):
+        self.wrapped = controller
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self.wrapped, name)
+        operation = OPERATIONS.get(name)
+        if operation is None or not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        def call(*args: Any, **kwargs: Any) -> Any:
+            op = operation
+            if name == "search" and args and not args[0]:
+                op = "search_page"
+            start = time.perf_counter()
+            try:
+                result = attr(*args, **kwargs)
+            except Exception:
+                registry.observe(op, time.perf_counter() - start, ok=False)
+                raise
+            registry.observe(op, time.perf_counter() - start)
+            return result
+
+        return call
+
+
+def start_periodic_flush(
+    path: Path, format: Optional[str] = None, interval: float = 60.0
+) -> Callable[[], None]:
+    """Flush from a background thread; returns a function that stops and flushes."""
+    stopped = threading.Event()
+
+    def run() -> None:
+        while not stopped.wait(interval):
+            registry.flush(path, format)
+
+    thread = threading.Thread(target=run, name="sekha-metrics", daemon=True)
+    thread.start()
+
+    def stop() -> None:
+        stopped.set()
+        thread.join()
+        registry.flush(path, format)
+
+    return stop
+
+
+@contextmanager
+def _locked(path: Path) -> Iterator[None]:
+    """Serialize writers of ``path`` across processes where flock exists."""
+    if fcntl is None:
+        yield
+        return
+    with path.with_name(path.name + ".lock").open("w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _format_bound(bound: float) -> str:
+    return "+Inf" if bound == float("inf") else repr(float(bound))
+
+
+def _prometheus_samples(
+    requests: Dict[Tuple[str, str], int], durations: Dict[str, Histogram]
+) -> Samples:
+    """Flatten recorded metrics into Prometheus samples."""
+    samples: Samples = {}
+    for (operation, outcome), count in requests.items():
+        labels = (("operation", operation), ("outcome", outcome))
+        samples[(REQUESTS, labels)] = count
+    for operation, histogram in durations.items():
+        cumulative = 0
+        for bound, count in zip(
+            DURATION_BUCKETS + (float("inf"),), histogram.counts, strict=True
+        ):
+            cumulative += count
+            labels = (("operation", operation), ("le", _format_bound(bound)))
+            samples[(f"{DURATION}_bucket", labels)] = cumulative
+        labels = (("operation", operation),)
+        samples[(f"{DURATION}_sum", labels)] = histogram.sum
+        samples[(f"{DURATION}_count", labels)] = histogram.count
+    samples[(LAST_FLUSH, ())] = time.time()
+    return samples
+
+
+def parse_prometheus(text: str) -> Samples:
+    """Read samples back from a textfile written by ``flush``."""
+    samples: Samples = {}
+    for line in text.splitlines():
+        if not line or line.startswith("#"):
+            continue
+        match = _SAMPLE.match(line)
+        if not match:
+            continue
+        name, labels, value = match.groups()
+        key = (name, tuple(_LABEL.findall(labels or "")))
+        samples[key] = float(value)
+    return samples
+
+
+def _family(name: str) -> str:
+    for suffix in ("_bucket", "_sum", "_count"):
+        if name.endswith(suffix) and name[: -len(suffix)] in FAMILIES:
+            return name[: -len(suffix)]
+    return name
+
+
+def _merge_prometheus(path: Path, new: Samples) -> None:
+    """Add ``new`` to the samples already in ``path`` and rewrite it atomically."""
+    merged = parse_prometheus(path.read_text(encoding="utf-8")) if path.exists() else {}
+    for key, value in new.items():
+        if FAMILIES.get(_family(key[0]), ("gauge",))[0] == "gauge":
+            merged[key] = value
+        else:
+            merged[key] = merged.get(key, 0) + value
+
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(render_prometheus(merged), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+_SUFFIX_ORDER = {"_bucket": 0, "_sum": 1, "_count": 2}
+
+
+def _sample_order(item: Tuple[Tuple[str, Labels], float]) -> Tuple[Any, ...]:
+    """Sort histogram series together, buckets by bound, then sum and count."""
+    (name, labels), _ = item
+    plain = tuple(pair for pair in labels if pair[0] != "le")
+    suffix = _SUFFIX_ORDER.get(name[len(_family(name)) :], 0)
+    le = dict(labels).get("le")
+    return (plain, suffix, float(le) if le else 0.0)
+
+
+def render_prometheus(samples: Samples) -> str:
+    """Render samples in the Prometheus text exposition format."""
+    lines: List[str] = []
+    by_family: Dict[str, List[Tuple[Tuple[str, Labels], float]]] = {}
+    for item in samples.items():
+        by_family.setdefault(_family(item[0][0]), []).append(item)
+    for family in sorted(by_family):
+        kind, help_text = FAMILIES.get(family, ("untyped", ""))
+        lines.append(f"# HELP {family} {help_text}")
+        lines.append(f"# TYPE {family} {kind}")
+        for (name, labels), value in sorted(by_family[family], key=_sample_order):
+            rendered = ",".join(f'{k}="{v}"' for k, v in labels)
+            text = str(int(value)) if float(value).is_integer() else repr(value)
+            series = f"{name}{{{rendered}}}" if rendered else name
+            lines.append(f"{series} {text}")
+    return "\n".join(lines) + "\n"
+
+
+def _otlp_attributes(**attrs: str) -> List[Dict[str, Any]]:
+    return [{"key": k, "value": {"stringValue": v}} for k, v in attrs.items()]
+
+
+def _otlp_document(
+    start: float,
+    requests: Dict[Tuple[str, str], int],
+    durations: Dict[str, Histogram],
+) -> Dict[str, Any]:
+    """Build one OTLP/JSON ``MetricsData`` document with delta temporality."""
+    start_ns = str(int(start * 1e9))
+    end_ns = str(time.time_ns())
+    delta = 1  # AGGREGATION_TEMPORALITY_DELTA
+    metrics = [
+        {
+            "name": "sekha.client.requests",
+            "description": FAMILIES[REQUESTS][1],
+            "unit": "{request}",
+            "sum": {
+                "aggregationTemporality": delta,
+                "isMonotonic": True,
+                "dataPoints": [
+                    {
+                        "attributes": _otlp_attributes(
+                            operation=operation, outcome=outcome
+                        ),
+                        "startTimeUnixNano": start_ns,
+                        "timeUnixNano": end_ns,
+                        "asInt": str(count),
+                    }
+                    for (operation, outcome), count in sorted(requests.items())
+                ],
+            },
+        },
+        {
+            "name": "sekha.client.request.duration",
+            "description": FAMILIES[DURATION][1],
+            "unit": "s",
+            "histogram": {
+                "aggregationTemporality": delta,
+                "dataPoints": [
+                    {
+                        "attributes": _otlp_attributes(operation=operation),
+                        "startTimeUnixNano": start_ns,
+                        "timeUnixNano": end_ns,
+                        "count": str(histogram.count),
+                        "sum": histogram.sum,
+                        "bucketCounts": [str(c) for c in histogram.counts],
+                        "explicitBounds": list(DURATION_BUCKETS),
+                    }
+                    for operation, histogram in sorted(durations.items())
+                ],
+            },
+        },
+    ]
+    resource = {
+        "attributes": [
+            {"key": "service.name", "value": {"stringValue": "sekha-cli"}},
+            {"key": "process.pid", "value": {"intValue": str(os.getpid())}},
+        ]
+    }
+    return {
+        "resourceMetrics": [
+            {
+                "resource": resource,
+                "scopeMetrics": [
+                    {
+                        "scope": {"name": "sekha_cli", "version": __version__},
+                        "metrics": metrics,
+                    }
+                ],
+            }
+        ]
+    }
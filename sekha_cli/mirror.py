@@ -0,0 +1,395 @@
+"""Local SQLite mirror of the controller's conversations.
+
+``sekha sync`` pulls conversations created or updated since the last sync
+into the mirror; read commands run with ``--local`` answer from it through
+``MirrorController``, which stands in for the SDK controller so the usual
+``SekhaClient`` code paths (paging, export writers, label counts) apply
+unchanged. Message text is also indexed for ``sekha fts`` (see ``fts``).
+"""
+import hashlib
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from . import fts
+from .cache import open_database
+from .incremental import parse_timestamp
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS conversations (
+    id TEXT PRIMARY KEY,
+    label TEXT,
+    created_at TEXT,
+    updated_at TEXT,
+    status TEXT,
+    preview TEXT,
+    data TEXT NOT NULL,
+    synced_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS conversations_label ON conversations (label);
+CREATE INDEX IF NOT EXISTS conversations_created ON conversations (created_at, id);
+CREATE TABLE IF NOT EXISTS messages (
+    rowid INTEGER PRIMARY KEY,
+    conversation_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    role TEXT,
+    content TEXT,
+    data TEXT
+);
+CREATE UNIQUE INDEX IF NOT EXISTS messages_conversation
+    ON messages (conversation_id, position);
+CREATE TABLE IF NOT EXISTS sync_state (
+    name TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+PREVIEW_LENGTH = 200
+
+
+def mirror_path(cache_dir: Path, base_url: str) -> Path:
+    """Mirror database for one controller."""
+    digest = hashlib.sha256(base_url.rstrip("/").encode("utf-8")).hexdigest()
+    return cache_dir / f"mirror-{digest[:16]}.sqlite3"
+
+
+def _preview(conv: Dict[str, Any]) -> str:
+    if conv.get("preview"):
+        return str(conv["preview"])
+    for msg in conv.get("messages", []):
+        if msg.get("content"):
+            return str(msg["content"])[:PREVIEW_LENGTH]
+    return ""
+
+
+def _where(
+    label: Optional[str], conditions: Sequence[str] = ()
+) -> Tuple[str, List[Any]]:
+    """WHERE clause for an optional label filter plus extra conditions."""
+    clauses = list(conditions)
+    params: List[Any] = []
+    if label is not None:
+        clauses.insert(0, "label = ?")
+        params.append(label)
+    return (f" WHERE {' AND '.join(clauses)}" if clauses else ""), params
+
+
+def _like(term: str) -> str:
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+class Mirror:
+    """Conversations and messages mirrored into an indexed SQLite database.
+
+    The connection is shared between the threads of a prefetching page
+    iterator, so every statement runs under one lock.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.conn = open_database(path, check_same_thread=False)
+        self.conn.executescript(_SCHEMA)
+        self.has_fts = fts.enable_fts(self.conn)
+        self._lock = threading.Lock()
+        self._seen: Optional[set] = None
+
+    def __enter__(self) -> "Mirror":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    @property
+    def watermark(self) -> Optional[str]:
+        """Newest ``updated_at``/``created_at`` pulled by a completed sync."""
+        return self._state("watermark")
+
+    @property
+    def last_sync(self) -> Optional[float]:
+        """Unix time the last sync completed."""
+        value = self._state("last_sync")
+        return float(value) if value is not None else None
+
+    def begin(self, full: bool = False) -> None:
+        """Start a sync; a full sync drops conversations it does not see."""
+        self._seen = set() if full else None
+
+    def apply(self, page: List[Dict[str, Any]]) -> int:
+        """Insert or replace one page of conversations with their messages."""
+        now = time.time()
+        rows = []
+        messages: List[Tuple[Any, ...]] = []
+        for conv in page:
+            conversation_id = conv.get("id")
+            if not conversation_id:
+                continue
+            meta = {k: v for k, v in conv.items() if k != "messages"}
+            rows.append(
+                (
+                    conversation_id,
+                    conv.get("label"),
+                    conv.get("created_at"),
+                    conv.get("updated_at"),
+                    conv.get("status"),
+                    _preview(conv),
+                    json.dumps(meta, separators=(",", ":")),
+                    now,
+                )
+            )
+            for position, msg in enumerate(conv.get("messages", [])):
+                extra = {k: v for k, v in msg.items() if k not in ("role", "content")}
+                messages.append(
+                    (
+                        conversation_id,
+                        position,
+                        msg.get("role"),
+                        msg.get("content"),
+                        json.dumps(extra, separators=(",", ":")) if extra else None,
+                    )
+                )
+            if self._seen is not None:
+                self._seen.add(conversation_id)
+
+        with self._lock, self.conn:
+            self.conn.executemany(
+                "DELETE FROM messages WHERE conversation_id = ?",
+                [(row[0],) for row in rows],
+            )
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO conversations "
+                "(id, label, created_at, updated_at, status, preview, data, synced_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self.conn.executemany(
+                "INSERT INTO messages (conversation_id, position, role, content, data) "
+                "VALUES (?, ?, ?, ?, ?)",
+                messages,
+            )
+        return len(rows)
+
+    def finish(self, watermark: Optional[str]) -> int:
+        """Record a completed sync; returns how many conversations were dropped."""
+        removed = 0
+        with self._lock, self.conn:
+            if self._seen is not None:
+                self.conn.execute("CREATE TEMP TABLE IF NOT EXISTS seen (id TEXT)")
+                self.conn.execute("DELETE FROM seen")
+                self.conn.executemany(
+                    "INSERT INTO seen (id) VALUES (?)", [(i,) for i in self._seen]
+                )
+                removed = self.conn.execute(
+                    "DELETE FROM conversations WHERE id NOT IN (SELECT id FROM seen)"
+                ).rowcount
+                self.conn.execute(
+                    "DELETE FROM messages WHERE conversation_id NOT IN "
+                    "(SELECT id FROM conversations)"
+                )
+            current = parse_timestamp(self._state("watermark"))
+            new = parse_timestamp(watermark)
+            if new is not None and (current is None or new > current):
+                self._set_state("watermark", watermark)
+            self._set_state("last_sync", str(time.time()))
+        self._seen = None
+        return removed
+
+    def get(self, conversation_id: str) -> Optional[Dict[str, Any]]:
+        """Full conversation, messages included."""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT data FROM conversations WHERE id = ?", (conversation_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            conv = json.loads(row[0])
+            conv["messages"] = self._messages([conversation_id])[conversation_id]
+        return conv
+
+    def page(
+        self,
+        label: Optional[str],
+        offset: int,
+        limit: int,
+        fields: Optional[Sequence[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Conversations in creation order, as the controller pages them."""
+        where, params = _where(label)
+        sql = (
+            f"SELECT id, data FROM conversations{where} "
+            "ORDER BY created_at, id LIMIT ? OFFSET ?"
+        )
+        with self._lock:
+            rows = self.conn.execute(sql, (*params, limit, offset)).fetchall()
+            wanted = set(fields) if fields else None
+            messages = {}
+            if wanted is None or "messages" in wanted:
+                messages = self._messages([row[0] for row in rows])
+        page = []
+        for conversation_id, data in rows:
+            conv = json.loads(data)
+            conv["messages"] = messages.get(conversation_id, [])
+            if wanted is not None:
+                conv = {k: v for k, v in conv.items() if k in wanted}
+            page.append(conv)
+        return page
+
+    def search(
+        self, query: str, label: Optional[str] = None, limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """Newest conversations containing every word of ``query``.
+
+        Matching is a case-insensitive substring test against the label,
+        preview and message text.
+        """
+        conditions = [
+            "(c.label LIKE ? ESCAPE '\\' OR c.preview LIKE ? ESCAPE '\\' OR "
+            "EXISTS (SELECT 1 FROM messages m WHERE m.conversation_id = c.id "
+            "AND m.content LIKE ? ESCAPE '\\'))"
+        ] * len(query.split())
+        params = [_like(term) for term in query.split() for _ in range(3)]
+        where, label_params = _where(label, conditions)
+        params = label_params + params
+        sql = (
+            "SELECT c.id, c.label, c.created_at, c.updated_at, c.preview "
+            f"FROM conversations c{where} ORDER BY c.created_at DESC, c.id LIMIT ?"
+        )
+        with self._lock:
+            rows = self.conn.execute(sql, (*params, limit)).fetchall()
+        return [
+            {
+                "id": row[0],
+                "label": row[1],
+                "created_at": row[2],
+                "updated_at": row[3],
+                "preview": row[4] or "",
+            }
+            for row in rows
+        ]
+
+    def entries(
+        self, label: Optional[str] = None, limit: int = -1
+    ) -> List[Dict[str, Any]]:
+        """Id, label and preview of each conversation, newest first."""
+        where, params = _where(label)
+        sql = (
+            "SELECT id, label, created_at, preview FROM conversations"
+            f"{where} ORDER BY created_at DESC, id LIMIT ?"
+        )
+        with self._lock:
+            rows = self.conn.execute(sql, (*params, limit)).fetchall()
+        return [
+            {"id": row[0], "label": row[1], "created_at": row[2], "preview": row[3]}
+            for row in rows
+        ]
+
+    def ids(self) -> List[str]:
+        """Every mirrored conversation id."""
+        with self._lock:
+            return [row[0] for row in self.conn.execute("SELECT id FROM conversations")]
+
+    def label_counts(self) -> Dict[str, int]:
+        """Conversation count per label."""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT COALESCE(label, 'Unknown'), COUNT(*) FROM conversations "
+                "GROUP BY label"
+            ).fetchall()
+        return {name: count for name, count in rows}
+
+    def full_text_search(
+        self,
+        keywords: str,
+        label: Optional[str] = None,
+        limit: int = 10,
+        raw: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """BM25-ranked message hits from the FTS5 index."""
+        if not self.has_fts:
+            raise RuntimeError("This SQLite build has no FTS5 support")
+        with self._lock:
+            return fts.search(self.conn, keywords, label=label, limit=limit, raw=raw)
+
+    def stats(self) -> Dict[str, Any]:
+        """Report mirrored conversation and message counts."""
+        with self._lock:
+            (conversations,) = self.conn.execute(
+                "SELECT COUNT(*) FROM conversations"
+            ).fetchone()
+            (messages,) = self.conn.execute("SELECT COUNT(*) FROM messages").fetchone()
+        return {
+            "path": str(self.path),
+            "conversations": conversations,
+            "messages": messages,
+            "watermark": self.watermark,
+            "last_sync": self.last_sync,
+        }
+
+    def close(self) -> None:
+        """Close the database."""
+        self.conn.close()
+
+    def _messages(self, ids: Iterable[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """Messages of several conversations, in order; caller holds the lock."""
+        result: Dict[str, List[Dict[str, Any]]] = {i: [] for i in ids}
+        if not result:
+            return result
+        marks = ",".join("?" * len(result))
+        rows = self.conn.execute(
+            "SELECT conversation_id, role, content, data FROM messages "
+            f"WHERE conversation_id IN ({marks}) ORDER BY conversation_id, position",
+            list(result),
+        )
+        for conversation_id, role, content, data in rows:
+            msg = {"role": role, "content": content}
+            if data:
+                msg.update(json.loads(data))
+            result[conversation_id].append(msg)
+        return result
+
+    def _state(self, name: str) -> Optional[str]:
+        row = self.conn.execute(
+            "SELECT value FROM sync_state WHERE name = ?", (name,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def _set_state(self, name: str, value: str) -> None:
+        self.conn.execute(
+            "INSERT OR REPLACE INTO sync_state (name, value) VALUES (?, ?)",
+            (name, value),
+        )
+
+
+class MirrorController:
+    """Read-only stand-in for the SDK controller backed by a ``Mirror``."""
+
+    def __init__(self, mirror: Mirror):
+        self.mirror = mirror
+
+    def search(
+        self,
+        query: str,
+        label: Optional[str] = None,
+        limit: int = 10,
+        offset: int = 0,
+        fields: Optional[Sequence[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Keyword search, or a page listing when ``query`` is empty."""
+        if not query:
+            return self.mirror.page(label, offset, limit, fields)
+        return self.mirror.search(query, label=label, limit=limit)
+
+    def get(self, conversation_id: str) -> Dict[str, Any]:
+        """Full conversation from the mirror."""
+        conv = self.mirror.get(conversation_id)
+        if conv is None:
+            raise LookupError(
+                f"Conversation {conversation_id} is not in the local mirror"
+            )
+        return conv
+
+    def label_counts(self) -> Dict[str, int]:
+        """Conversation count per label."""
+        return self.mirror.label_counts()
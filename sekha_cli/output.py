@@ -0,0 +1,309 @@
+"""Streaming output: record writers and buffered, compressed, chunked files.
+
+``iter_records`` reads json and jsonl exports back, compressed or not.
+"""
+import gzip
+import io
+import itertools
+import json
+import re
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator, List, Optional, TextIO, Type, Union
+
+from .markdown import MarkdownRenderer
+
+RECORD_FORMATS = ("json", "jsonl")
+COMPRESSIONS = ("gzip", "zstd")
+COMPRESSION_SUFFIXES = {".gz": "gzip", ".zst": "zstd", ".zstd": "zstd"}
+DEFAULT_BUFFER_SIZE = 1024 * 1024
+
+_SIZE_UNITS = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3, "T": 1024**4}
+
+
+def dumps_compact(record: Any) -> str:
+    """Serialize one record without indentation or padding."""
+    return json.dumps(record, separators=(",", ":"), ensure_ascii=False)
+
+
+def parse_size(value: str) -> int:
+    """Parse a byte size such as ``500M``, ``2GB`` or ``1048576``."""
+    match = re.fullmatch(r"\s*(\d+)\s*([KMGT]?)(?:i?B)?\s*", value, re.IGNORECASE)
+    if not match:
+        raise ValueError(f"Not a size: {value}")
+    return int(match.group(1)) * _SIZE_UNITS[match.group(2).upper()]
+
+
+def detect_compression(path: Path) -> Optional[str]:
+    """Pick a compression from the file extension."""
+    return COMPRESSION_SUFFIXES.get(path.suffix.lower())
+
+
+class OutputFile:
+    """Buffered, optionally compressed output file that can rotate into chunks.
+
+    Text is encoded once into an in-memory buffer of ``buffer_size`` bytes
+    and handed to the file (or compressor) when the buffer fills, so
+    ``flush`` never forces a compressor sync point. With ``split_size``,
+    ``full`` reports when the current chunk has reached that many
+    uncompressed bytes and ``rotate`` continues in the next numbered file
+    (``backup-00001.jsonl.gz``, ``backup-00002.jsonl.gz``, ...).
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        compress: Optional[str] = None,
+        split_size: Optional[int] = None,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+    ):
+        if compress is not None and compress not in COMPRESSIONS:
+            raise ValueError(f"Unsupported compression: {compress}")
+        self.path = path
+        self.compress = compress
+        self.split_size = split_size
+        self.buffer_size = buffer_size
+        self.paths: List[Path] = []
+        self.bytes_written = 0
+        self._chunk_bytes = 0
+        self._buffer: List[bytes] = []
+        self._buffered = 0
+        self._file: Optional[IO[bytes]] = None
+        self._raw: Optional[IO[bytes]] = None
+        self._open_next()
+
+    def __enter__(self) -> "OutputFile":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def write(self, text: str) -> int:
+        """Encode and buffer ``text``."""
+        data = text.encode("utf-8")
+        self._buffer.append(data)
+        self._buffered += len(data)
+        self._chunk_bytes += len(data)
+        self.bytes_written += len(data)
+        if self._buffered >= self.buffer_size:
+            self._drain()
+        return len(text)
+
+    def flush(self) -> None:
+        """Hand buffered bytes to the file or compressor."""
+        self._drain()
+        if self.compress is None and self._file is not None:
+            self._file.flush()
+
+    def full(self) -> bool:
+        """Whether the current chunk has reached ``split_size``."""
+        return bool(self.split_size) and self._chunk_bytes >= self.split_size
+
+    def rotate(self) -> None:
+        """Finish the current chunk and start the next one."""
+        self._close_current()
+        self._open_next()
+
+    def close(self) -> None:
+        """Flush everything and close the last chunk."""
+        self._close_current()
+
+    def _chunk_path(self, number: int) -> Path:
+        if not self.split_size:
+            return self.path
+        stem, dot, suffixes = self.path.name.partition(".")
+        return self.path.with_name(f"{stem}-{number:05d}{dot}{suffixes}")
+
+    def _open_next(self) -> None:
+        path = self._chunk_path(len(self.paths) + 1)
+        self._raw = path.open("wb")
+        if self.compress == "gzip":
+            self._file = gzip.GzipFile(fileobj=self._raw, mode="wb", compresslevel=6)
+        elif self.compress == "zstd":
+            self._file = _zstd_writer(self._raw)
+        else:
+            self._file = self._raw
+        self.paths.append(path)
+        self._chunk_bytes = 0
+
+    def _drain(self) -> None:
+        if self._buffer and self._file is not None:
+            self._file.write(b"".join(self._buffer))
+        self._buffer = []
+        self._buffered = 0
+
+    def _close_current(self) -> None:
+        if self._file is None:
+            return
+        self._drain()
+        self._file.close()
+        if self._raw is not None and not self._raw.closed:
+            self._raw.close()
+        self._file = self._raw = None
+
+
+def _zstandard() -> Any:
+    try:
+        import zstandard
+    except ImportError as e:
+        raise RuntimeError(
+            "zstd compression needs the zstandard package "
+            "(pip install 'sekha-cli[zstd]')"
+        ) from e
+    return zstandard
+
+
+def _zstd_writer(raw: IO[bytes]) -> IO[bytes]:
+    """Wrap ``raw`` in a zstd compressor from the optional ``zstandard`` package."""
+    return _zstandard().ZstdCompressor(level=3).stream_writer(raw)
+
+
+class RecordWriter:
+    """Write records to a text stream one at a time.
+
+    Call ``begin`` once, ``write`` per record and ``end`` once. Nothing is
+    buffered beyond the current record, so output can be consumed while it
+    is still being produced. When the stream is a chunked ``OutputFile``,
+    each chunk is closed off and reopened at a record boundary so every
+    chunk is a complete document.
+    """
+
+    def __init__(self, stream: Union[TextIO, OutputFile], flush_each: bool = False):
+        self.stream = stream
+        self.flush_each = flush_each
+        self.count = 0
+        self.chunk_count = 0
+
+    def begin(self) -> None:
+        """Write anything that precedes the first record."""
+        self.chunk_count = 0
+        self._write_header()
+
+    def write(self, record: Any) -> None:
+        """Write a single record."""
+        self._write_record(record)
+        self.count += 1
+        self.chunk_count += 1
+        if self.flush_each:
+            self.stream.flush()
+        if isinstance(self.stream, OutputFile) and self.stream.full():
+            self.end()
+            self.stream.rotate()
+            self.begin()
+
+    def end(self) -> None:
+        """Write anything that follows the last record and flush."""
+        self._write_footer()
+        self.stream.flush()
+
+    def _write_header(self) -> None:
+        pass
+
+    def _write_footer(self) -> None:
+        pass
+
+    def _write_record(self, record: Any) -> None:
+        raise NotImplementedError
+
+
+class JsonArrayWriter(RecordWriter):
+    """A compact JSON array with one record per line."""
+
+    def _write_header(self) -> None:
+        self.stream.write("[")
+
+    def _write_record(self, record: Any) -> None:
+        self.stream.write(",\n" if self.chunk_count else "\n")
+        self.stream.write(dumps_compact(record))
+
+    def _write_footer(self) -> None:
+        self.stream.write("\n]\n" if self.chunk_count else "]\n")
+
+
+class JsonLinesWriter(RecordWriter):
+    """Newline-delimited JSON, one record per line."""
+
+    def _write_record(self, record: Any) -> None:
+        self.stream.write(dumps_compact(record))
+        self.stream.write("\n")
+
+
+class MarkdownWriter(RecordWriter):
+    """Conversations rendered to Markdown by a ``MarkdownRenderer``."""
+
+    def __init__(
+        self,
+        stream: Union[TextIO, OutputFile],
+        renderer: Optional[MarkdownRenderer] = None,
+        flush_each: bool = False,
+    ):
+        super().__init__(stream, flush_each=flush_each)
+        self.renderer = renderer or MarkdownRenderer()
+
+    def _write_record(self, record: Any) -> None:
+        self.renderer.write(record, self.stream.write)
+
+
+WRITERS: Dict[str, Type[RecordWriter]] = {
+    "json": JsonArrayWriter,
+    "jsonl": JsonLinesWriter,
+}
+
+
+def record_writer(
+    format: str, stream: Union[TextIO, OutputFile], flush_each: bool = False
+) -> RecordWriter:
+    """Build the writer for ``format``."""
+    if format not in WRITERS:
+        raise ValueError(f"Unsupported format: {format}")
+    return WRITERS[format](stream, flush_each=flush_each)
+
+
+def _open_text(path: Path) -> IO[str]:
+    """Open a possibly compressed file for reading text."""
+    compress = detect_compression(path)
+    if compress == "gzip":
+        return gzip.open(path, "rt", encoding="utf-8")
+    if compress == "zstd":
+        reader = _zstandard().ZstdDecompressor().stream_reader(path.open("rb"))
+        return io.TextIOWrapper(reader, encoding="utf-8")
+    return path.open(encoding="utf-8")
+
+
+def iter_records(path: Path) -> Iterator[Any]:
+    """Yield the records of a json or jsonl export one at a time.
+
+    The format comes from the extension under any compression suffix. JSON
+    arrays in the one-record-per-line layout written by ``JsonArrayWriter``
+    are streamed; other JSON documents are loaded whole.
+    """
+    inner = path.with_suffix("") if detect_compression(path) else path
+    if inner.suffix.lower() not in (".json", ".jsonl", ".ndjson"):
+        raise ValueError(f"Not a json or jsonl export: {path}")
+
+    with _open_text(path) as f:
+        if inner.suffix.lower() != ".json":
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+            return
+
+        head = [f.readline(), f.readline()]
+        if head[0].strip() != "[" or not _is_record_line(head[1]):
+            yield from json.loads("".join(head) + f.read())
+            return
+        for line in itertools.chain(head[1:], f):
+            line = line.strip().rstrip(",")
+            if line and line != "]":
+                yield json.loads(line)
+
+
+def _is_record_line(line: str) -> bool:
+    """Whether ``line`` holds one whole record, as ``JsonArrayWriter`` writes."""
+    line = line.strip().rstrip(",")
+    if line == "]":
+        return True
+    try:
+        json.loads(line)
+    except ValueError:
+        return False
+    return True
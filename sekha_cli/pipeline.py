@@ -0,0 +1,155 @@
+"""Concurrency helpers for paged and bulk controller operations."""
+import random
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+from .trace import tracer
+
+T = TypeVar("T")
+Page = List[Dict[str, Any]]
+Outcome = Tuple[T, Any, Optional[BaseException]]
+
+
+def prefetch_pages(
+    fetch_page: Callable[[int, int], Page],
+    page_size: int,
+    concurrency: int = 1,
+) -> Iterator[Page]:
+    """Yield offset-paginated pages in order, keeping requests in flight.
+
+    Up to ``concurrency`` page requests run ahead of the consumer. A new
+    request is only issued once the consumer takes the oldest page, so a
+    slow consumer caps buffered pages at ``concurrency``. A short page is
+    either the last one or the server capping pages below ``page_size``:
+    requests in flight are dropped and a single probe right after it tells
+    the two apart. Only a full probe restarts the fan-out, at offsets spaced
+    by the cap. Iteration stops at an empty page, at a page shorter than the
+    cap, or at a page repeating the previous one (an SDK that ignores
+    offsets).
+    """
+    cap = page_size
+    previous: Page = []
+    if concurrency <= 1:
+        offset = 0
+        while True:
+            page = fetch_page(offset, page_size)
+            if _repeats(page, previous):
+                return
+            if page:
+                yield page
+            if not page or len(page) < cap < page_size:
+                return
+            cap = len(page)
+            offset += len(page)
+            previous = page
+
+    pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="sekha-page")
+    pending: Deque[Tuple[int, Future]] = deque()
+    next_offset = 0
+
+    def submit() -> None:
+        nonlocal next_offset
+        pending.append((next_offset, pool.submit(fetch_page, next_offset, page_size)))
+        next_offset += cap
+
+    try:
+        for _ in range(concurrency):
+            submit()
+
+        while pending:
+            offset, future = pending.popleft()
+            page = future.result()
+            if _repeats(page, previous):
+                return
+            if page:
+                yield page
+            if not page or len(page) < cap < page_size:
+                return
+            previous = page
+            if len(page) == cap:
+                while len(pending) < concurrency:
+                    submit()
+                continue
+            # The pages in flight were requested at offsets spaced by the
+            # old size. Probe right after this page before fanning out again.
+            cap = len(page)
+            for _, stale in pending:
+                stale.cancel()
+            pending.clear()
+            next_offset = offset + cap
+            submit()
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _repeats(page: Page, previous: Page) -> bool:
+    """Whether ``page`` starts with the same record as the previous page."""
+    return bool(page and previous) and page[0] == previous[0]
+
+
+def run_bounded(
+    func: Callable[[T], Any],
+    items: Iterable[T],
+    concurrency: int = 1,
+) -> Iterator[Outcome]:
+    """Apply ``func`` to each item on a bounded worker pool.
+
+    Yields ``(item, result, error)`` as calls complete. Items are pulled from
+    the iterable lazily, so at most ``2 * concurrency`` are held at once no
+    matter how long the input stream is. A failing call is reported as its
+    error rather than stopping the run.
+    """
+    source = iter(items)
+    window = max(concurrency, 1) * 2
+    pending: Dict[Future, T] = {}
+
+    with ThreadPoolExecutor(
+        max_workers=max(concurrency, 1), thread_name_prefix="sekha-worker"
+    ) as pool:
+
+        def fill() -> None:
+            while len(pending) < window:
+                try:
+                    item = next(source)
+                except StopIteration:
+                    return
+                pending[pool.submit(func, item)] = item
+
+        fill()
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                item = pending.pop(future)
+                error = future.exception()
+                yield item, None if error else future.result(), error
+            fill()
+
+
+def retry_call(
+    func: Callable[..., Any],
+    *args: Any,
+    attempts: int = 3,
+    backoff: float = 0.5,
+) -> Any:
+    """Call ``func``, retrying failures with jittered exponential backoff."""
+    for attempt in range(attempts):
+        try:
+            return func(*args)
+        except Exception:
+            if attempt == attempts - 1:
+                raise
+            with tracer.span("retry.wait", attempt=attempt + 1, retries=1):
+                time.sleep(backoff * (2**attempt) * random.uniform(0.5, 1.5))
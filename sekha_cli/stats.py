@@ -0,0 +1,26 @@
+"""Small statistics helpers for latency reporting."""
+import math
+from typing import Dict, Sequence
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of ``values`` (0 for an empty sequence)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def latency_summary(latencies: Sequence[float], elapsed: float) -> Dict[str, float]:
+    """Summarize per-operation latencies (seconds) and overall throughput."""
+    ordered = sorted(latencies)
+    return {
+        "count": len(ordered),
+        "p50": percentile(ordered, 50),
+        "p95": percentile(ordered, 95),
+        "p99": percentile(ordered, 99),
+        "max": ordered[-1] if ordered else 0.0,
+        "elapsed": elapsed,
+        "throughput": len(ordered) / elapsed if elapsed > 0 else 0.0,
+    }
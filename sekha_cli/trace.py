@@ -0,0 +1,261 @@
+"""Lightweight span tracing for CLI commands and client calls.
+
+Tracing is off unless ``--trace`` (``SEKHA_TRACE``) or ``--trace-file``
+(``SEKHA_TRACE_FILE``) turns it on; while off,
+``span`` returns a shared no-op context and ``traced`` adds one attribute
+check per call. Finished spans can be summarized per name or written as a
+Chrome trace (``chrome://tracing``, Perfetto, speedscope).
+"""
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class Span:
+    """One timed operation with free-form attributes."""
+
+    __slots__ = ("name", "start", "duration", "attrs", "thread_id")
+
+    def __init__(self, name: str, attrs: Dict[str, Any]):
+        self.name = name
+        self.attrs = attrs
+        self.start = time.perf_counter()
+        self.duration = 0.0
+        self.thread_id = threading.get_ident()
+
+    def set(self, **attrs: Any) -> None:
+        """Attach attributes such as ``bytes``, ``status`` or ``retries``."""
+        self.attrs.update(attrs)
+
+
+class _NoopSpan:
+    """Context returned while tracing is disabled."""
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        pass
+
+    def set(self, **attrs: Any) -> None:
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+class _ActiveSpan:
+    """Context manager that times a span and hands it to the tracer."""
+
+    def __init__(self, tracer: "Tracer", name: str, attrs: Dict[str, Any]):
+        self.tracer = tracer
+        self.span = Span(name, attrs)
+
+    def __enter__(self) -> Span:
+        self.span.start = time.perf_counter()
+        return self.span
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        span = self.span
+        span.duration = time.perf_counter() - span.start
+        if exc is not None:
+            span.attrs["error"] = type(exc).__name__
+            status = getattr(exc, "status_code", None) or getattr(exc, "status", None)
+            if isinstance(status, int):
+                span.attrs.setdefault("http_status", status)
+        self.tracer.record(span)
+
+
+class Tracer:
+    """Collects finished spans from any thread."""
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.spans: List[Span] = []
+        self.origin = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def enable(self) -> None:
+        """Start recording spans."""
+        self.enabled = True
+
+    def disable(self) -> None:
+        """Stop recording and drop collected spans."""
+        self.enabled = False
+        with self._lock:
+            self.spans = []
+
+    def add(self, name: str, start: float, **attrs: Any) -> None:
+        """Record a span that started at ``start`` and ends now."""
+        if not self.enabled:
+            return
+        span = Span(name, attrs)
+        span.start = start
+        span.duration = time.perf_counter() - start
+        self.record(span)
+
+    def span(self, name: str, **attrs: Any) -> Any:
+        """Time a block: ``with tracer.span("config.load") as s: ...``."""
+        if not self.enabled:
+            return _NOOP
+        return _ActiveSpan(self, name, attrs)
+
+    def record(self, span: Span) -> None:
+        """Store a finished span."""
+        with self._lock:
+            self.spans.append(span)
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Aggregate spans by name, slowest total first."""
+        groups: Dict[str, Dict[str, Any]] = {}
+        for span in self.spans:
+            group = groups.get(span.name)
+            if group is None:
+                group = groups[span.name] = {
+                    "name": span.name,
+                    "count": 0,
+                    "total": 0.0,
+                    "max": 0.0,
+                    "bytes": 0,
+                    "errors": 0,
+                    "retries": 0,
+                }
+            group["count"] += 1
+            group["total"] += span.duration
+            group["max"] = max(group["max"], span.duration)
+            group["bytes"] += span.attrs.get("bytes", 0)
+            group["retries"] += span.attrs.get("retries", 0)
+            if "error" in span.attrs:
+                group["errors"] += 1
+        return sorted(groups.values(), key=lambda g: g["total"], reverse=True)
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """Spans as Chrome trace-event JSON (complete ``X`` events, in us)."""
+        pid = os.getpid()
+        origin = min([self.origin] + [span.start for span in self.spans])
+        events = [
+            {
+                "name": span.name,
+                "cat": span.name.split(".", 1)[0],
+                "ph": "X",
+                "ts": (span.start - origin) * 1_000_000,
+                "dur": span.duration * 1_000_000,
+                "pid": pid,
+                "tid": span.thread_id,
+                "args": span.attrs,
+            }
+            for span in self.spans
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, path: Path) -> None:
+        """Write the Chrome trace to ``path``."""
+        path.write_text(json.dumps(self.chrome_trace(), default=str), encoding="utf-8")
+
+
+tracer = Tracer()
+
+
+def traced(name: str) -> Callable[[F], F]:
+    """Decorator recording a span around every call while tracing is enabled.
+
+    A generator function's span covers its whole iteration rather than the
+    call, which only creates the generator.
+    """
+
+    def decorator(func: F) -> F:
+        if inspect.isgeneratorfunction(func):
+
+            @functools.wraps(func)
+            def generator(*args: Any, **kwargs: Any) -> Any:
+                if not tracer.enabled:
+                    return (yield from func(*args, **kwargs))
+                with tracer.span(name):
+                    return (yield from func(*args, **kwargs))
+
+            return generator  # type: ignore[return-value]
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not tracer.enabled:
+                return func(*args, **kwargs)
+            with tracer.span(name):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+class TracedController:
+    """Proxy timing every SDK call as an ``sdk.<method>`` span.
+
+    Only installed while tracing, since measuring response size means
+    re-serializing each result.
+    """
+
+    def __init__(self, controller: Any):
+        self.wrapped = controller
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self.wrapped, name)
+        if not callable(attr) or name.startswith("_"):
+            return attr
+
+        @functools.wraps(attr)
+        def call(*args: Any, **kwargs: Any) -> Any:
+            with tracer.span(f"sdk.{name}") as span:
+                result = attr(*args, **kwargs)
+                span.set(bytes=_payload_size(result), status="ok")
+                if isinstance(result, list):
+                    span.set(items=len(result))
+                return result
+
+        return call
+
+
+def _payload_size(result: Any) -> int:
+    """Approximate response size as compact JSON bytes."""
+    if result is None:
+        return 0
+    try:
+        return len(json.dumps(result, separators=(",", ":"), default=str))
+    except (TypeError, ValueError):
+        return 0
+
+
+def format_summary(rows: List[Dict[str, Any]]) -> List[List[str]]:
+    """Turn ``Tracer.summary`` rows into display strings."""
+    return [
+        [
+            row["name"],
+            str(row["count"]),
+            f"{row['total'] * 1000:.1f}",
+            f"{row['total'] / row['count'] * 1000:.1f}",
+            f"{row['max'] * 1000:.1f}",
+            str(row["bytes"]) if row["bytes"] else "-",
+            str(row["retries"]) if row["retries"] else "-",
+            str(row["errors"]) if row["errors"] else "-",
+        ]
+        for row in rows
+    ]
+
+
+SUMMARY_COLUMNS = (
+    "Span",
+    "Calls",
+    "Total",
+    "Mean",
+    "Max",
+    "Bytes",
+    "Retries",
+    "Errors",
+)
+
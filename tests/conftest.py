@@ -7,3 +7,12 @@ def reset_environment(monkeypatch):
     """Reset environment variables for each test."""
     monkeypatch.delenv("SEKHA_BASE_URL", raising=False)
     monkeypatch.delenv("SEKHA_API_KEY", raising=False)
+    monkeypatch.delenv("SEKHA_CACHE", raising=False)
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(monkeypatch, tmp_path):
+    """Keep caches and journals out of the real home directory."""
+    cache_dir = tmp_path / "sekha-cache"
+    monkeypatch.setenv("SEKHA_CACHE_DIR", str(cache_dir))
+    return cache_dir
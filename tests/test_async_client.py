@@ -0,0 +1,139 @@
+"""Test the asyncio client."""
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from sekha_cli.async_client import AsyncSekhaClient
+
+
+def make_client(**kwargs):
+    """Wrap a mock synchronous client."""
+    sync_client = MagicMock()
+    sync_client.base_url = "http://test.com"
+    sync_client._supports.return_value = False
+    return sync_client, AsyncSekhaClient(client=sync_client, **kwargs)
+
+
+class TestAsyncSekhaClient:
+    """Test async wrappers, limits and timeouts."""
+
+    def test_methods_delegate(self):
+        """Test async methods call through to the synchronous client."""
+        sync_client, client = make_client()
+        sync_client.query.return_value = [{"id": "conv-1"}]
+        sync_client.get_conversation.return_value = {"id": "conv-1"}
+
+        async def run():
+            async with client:
+                return await asyncio.gather(
+                    client.query("hello", label="Work"),
+                    client.get_conversation("conv-1"),
+                )
+
+        results, conv = asyncio.run(run())
+
+        assert results == [{"id": "conv-1"}]
+        assert conv == {"id": "conv-1"}
+        sync_client.query.assert_called_once_with("hello", label="Work", limit=10)
+
+    def test_concurrency_is_capped(self):
+        """Test no more than ``concurrency`` calls run at once."""
+        sync_client, client = make_client(concurrency=3)
+        state = {"active": 0, "peak": 0}
+        lock = threading.Lock()
+
+        def slow_query(query, label=None, limit=10):
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            time.sleep(0.01)
+            with lock:
+                state["active"] -= 1
+            return []
+
+        sync_client.query.side_effect = slow_query
+
+        async def run():
+            async with client:
+                await asyncio.gather(*(client.query(str(i)) for i in range(20)))
+
+        asyncio.run(run())
+
+        assert 1 < state["peak"] <= 3
+
+    def test_timeout(self):
+        """Test a slow request raises a timeout."""
+        sync_client, client = make_client(timeout=0.01)
+        sync_client.archive.side_effect = lambda cid: time.sleep(0.2)
+
+        async def run():
+            async with client:
+                await client.archive("conv-1")
+
+        with pytest.raises(asyncio.TimeoutError):
+            asyncio.run(run())
+
+    def test_archive_many_reports_each_id(self):
+        """Test bulk archive yields every id and keeps going after a failure."""
+        sync_client, client = make_client(concurrency=4)
+
+        def archive(conversation_id):
+            if conversation_id == "bad":
+                raise RuntimeError("not found")
+
+        sync_client.archive.side_effect = archive
+
+        async def run():
+            async with client:
+                return [o async for o in client.archive_many(["a", "bad", "b"])]
+
+        with patch("sekha_cli.pipeline.time.sleep"):
+            outcomes = dict(asyncio.run(run()))
+
+        assert outcomes["a"] is None and outcomes["b"] is None
+        assert str(outcomes["bad"]) == "not found"
+
+    def test_archive_many_bulk_passes_concurrency(self):
+        """Test the bulk path lets failed batches fall back concurrently."""
+        sync_client, client = make_client(concurrency=4)
+        sync_client._supports.return_value = True
+        sync_client.archive_many.side_effect = lambda ids, **kw: [
+            (cid, None) for cid in ids
+        ]
+
+        async def run():
+            async with client:
+                return [o async for o in client.archive_many(["a", "b"])]
+
+        assert asyncio.run(run()) == [("a", None), ("b", None)]
+        sync_client.archive_many.assert_called_once_with(
+            ["a", "b"], concurrency=4, attempts=3
+        )
+
+    def test_map_unordered_pulls_lazily(self):
+        """Test inputs are consumed within the task window."""
+        _, client = make_client(concurrency=2)
+        pulled = []
+
+        def source():
+            for n in range(1000):
+                pulled.append(n)
+                yield n
+
+        async def double(n):
+            return n * 2
+
+        async def run():
+            async with client:
+                outcomes = client.map_unordered(double, source())
+                first = await outcomes.__anext__()
+                await outcomes.aclose()
+                return first
+
+        item, result, error = asyncio.run(run())
+
+        assert result == item * 2 and error is None
+        assert len(pulled) <= 5
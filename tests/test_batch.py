@@ -0,0 +1,123 @@
+"""Test batch query parsing and execution."""
+import asyncio
+import io
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from sekha_cli.async_client import AsyncSekhaClient
+from sekha_cli.batch import iter_batch_queries, run_query_batch
+from sekha_cli.stats import latency_summary, percentile
+
+
+def collect(client):
+    """Run a batch of three queries and return the records by query."""
+
+    async def run():
+        requests = iter_batch_queries(io.StringIO("a\nb\nc\n"), "Work", 5)
+        async with AsyncSekhaClient(client=client, concurrency=2) as aclient:
+            return [record async for record in run_query_batch(aclient, requests)]
+
+    return {record["query"]: record for record in asyncio.run(run())}
+
+
+class TestBatchParsing:
+    """Test batch file parsing."""
+
+    def test_plain_and_json_lines(self):
+        """Test plain text and JSON lines with defaults filled in."""
+        stream = io.StringIO(
+            '# comment\nfirst query\n\n{"query": "second", "limit": 2}\n'
+        )
+
+        assert list(iter_batch_queries(stream, "Work", 10)) == [
+            {"query": "first query", "label": "Work", "limit": 10},
+            {"query": "second", "label": "Work", "limit": 2},
+        ]
+
+    def test_json_line_without_query(self):
+        """Test a JSON line must name its query."""
+        with pytest.raises(ValueError, match="Line 1"):
+            list(iter_batch_queries(io.StringIO('{"label": "x"}\n'), None, 10))
+
+
+class TestRunQueryBatch:
+    """Test concurrent execution of batches."""
+
+    def test_one_search_per_query(self):
+        """Test each query runs separately without a batch endpoint."""
+        client = MagicMock()
+        client._supports.return_value = False
+        client.query.side_effect = lambda query, label=None, limit=10: [{"id": query}]
+
+        records = collect(client)
+
+        assert records["b"]["results"] == [{"id": "b"}]
+        assert records["a"]["latency"] >= 0
+        assert client.query.call_count == 3
+
+    def test_latency_excludes_queueing(self):
+        """Test a query's latency covers its own call, not waiting for a slot."""
+        client = MagicMock()
+        client._supports.return_value = False
+
+        def slow_query(query, label=None, limit=10):
+            time.sleep(0.05)
+            return []
+
+        client.query.side_effect = slow_query
+
+        async def run():
+            requests = iter_batch_queries(io.StringIO("a\nb\nc\nd\n"), None, 5)
+            async with AsyncSekhaClient(client=client, concurrency=1) as aclient:
+                return [record async for record in run_query_batch(aclient, requests)]
+
+        latencies = [record["latency"] for record in asyncio.run(run())]
+
+        assert len(latencies) == 4
+        assert max(latencies) < 0.1
+
+    def test_uses_batch_endpoint(self):
+        """Test queries go out together when the SDK has a batch endpoint."""
+        client = MagicMock()
+        client._supports.side_effect = lambda method: method == "search_batch"
+        client.query_batch.side_effect = lambda requests: [
+            [{"id": r["query"]}] for r in requests
+        ]
+
+        records = collect(client)
+
+        assert records["c"]["results"] == [{"id": "c"}]
+        assert records["c"]["latency"] is None
+        assert records["c"]["chunk"] == 0
+        assert records["c"]["chunk_latency"] >= 0
+        client.query_batch.assert_called_once()
+        client.query.assert_not_called()
+
+    def test_batch_endpoint_result_count_mismatch(self):
+        """Test a chunk answered with the wrong number of results fails whole."""
+        client = MagicMock()
+        client._supports.side_effect = lambda method: method == "search_batch"
+        client.query_batch.side_effect = lambda requests: [[{"id": "only-one"}]]
+
+        records = collect(client)
+
+        assert all("error" in record for record in records.values())
+        assert all("results" not in record for record in records.values())
+
+
+class TestStats:
+    """Test latency statistics."""
+
+    def test_percentiles(self):
+        """Test nearest-rank percentiles and throughput."""
+        latencies = [i / 1000 for i in range(1, 101)]
+
+        summary = latency_summary(latencies, elapsed=2.0)
+
+        assert summary["p50"] == 0.05
+        assert summary["p95"] == 0.095
+        assert summary["p99"] == 0.099
+        assert summary["throughput"] == 50.0
+        assert percentile([], 50) == 0.0
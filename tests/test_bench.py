@@ -0,0 +1,93 @@
+"""Test the benchmark stand-in controller and runner."""
+from sekha_cli.bench import (
+    StandInConfig,
+    StandInController,
+    StandInServer,
+    compare_results,
+    run_benchmarks,
+)
+
+
+class TestStandInController:
+    """Test the stand-in HTTP controller."""
+
+    def test_round_trip_and_counters(self):
+        """Test paging, create, get and archive over HTTP are counted."""
+        server = StandInServer(25).start()
+        try:
+            controller = StandInController(StandInConfig(server.url, "sk-test"))
+
+            page = controller.search("", label="Label-01", limit=2, offset=1)
+            created = controller.create([{"role": "user", "content": "hi"}], "New")
+            controller.archive(created["id"])
+            fetched = controller.get(created["id"])
+
+            assert [c["id"] for c in page] == ["conv-00000011", "conv-00000021"]
+            assert fetched["label"] == "New"
+            assert fetched["status"] == "archived"
+            assert server.requests == 4
+            assert server.bytes_sent > 0
+        finally:
+            server.stop()
+
+    def test_metadata_only_search(self):
+        """Test ``fields`` trims records like a real controller would."""
+        server = StandInServer(3).start()
+        try:
+            controller = StandInController(StandInConfig(server.url, "sk-test"))
+
+            page = controller.search("", limit=10, fields=["id", "label"])
+
+            assert page[0] == {"id": "conv-00000000", "label": "Label-00"}
+        finally:
+            server.stop()
+
+
+class TestRunBenchmarks:
+    """Test end-to-end benchmark runs."""
+
+    def test_scenarios_report_measurements(self):
+        """Test each scenario runs the real CLI and records its cost."""
+        results = run_benchmarks(sizes=[50], scenarios=["labels", "export"], latency=0)
+
+        by_scenario = {r["scenario"]: r for r in results["results"]}
+        assert set(by_scenario) == {"labels", "export"}
+        assert all(r["exit_code"] == 0 for r in results["results"]), results
+        assert by_scenario["labels"]["requests"] >= 1
+        assert by_scenario["export"]["bytes_sent"] > 0
+        assert results["meta"]["version"]
+
+    def test_compare_results(self):
+        """Test matching scenarios are paired and ratios computed."""
+        before = {
+            "results": [
+                {
+                    "scenario": "query",
+                    "size": 10,
+                    "wall_seconds": 2.0,
+                    "peak_rss_kb": 100,
+                    "requests": 3,
+                }
+            ]
+        }
+        after = {
+            "results": [
+                {
+                    "scenario": "query",
+                    "size": 10,
+                    "wall_seconds": 1.0,
+                    "peak_rss_kb": None,
+                    "requests": 1,
+                }
+            ]
+        }
+
+        assert compare_results(before, after) == [
+            {
+                "scenario": "query",
+                "size": 10,
+                "wall_ratio": 0.5,
+                "rss_ratio": None,
+                "requests_delta": -2,
+            }
+        ]
@@ -0,0 +1,117 @@
+"""Test local caches."""
+import time
+from unittest.mock import patch
+
+import pytest
+
+from sekha_cli.cache import ConversationCache, QueryCache
+
+
+@pytest.fixture
+def query_cache(tmp_path):
+    """Create a query cache in a temporary directory."""
+    cache = QueryCache(tmp_path / "cache.sqlite3", ttl=60, max_bytes=1000)
+    yield cache
+    cache.close()
+
+
+class TestQueryCache:
+    """Test the query result cache."""
+
+    def test_key_depends_on_all_inputs(self):
+        """Test cache keys change with url, query, label and limit."""
+        base = QueryCache.key("http://a", "q", None, 10)
+
+        assert base == QueryCache.key("http://a/", "q", None, 10)
+        assert base != QueryCache.key("http://b", "q", None, 10)
+        assert base != QueryCache.key("http://a", "q", "Work", 10)
+        assert base != QueryCache.key("http://a", "q", None, 5)
+
+    def test_hit_and_miss(self, query_cache):
+        """Test stored values are returned and counted as hits."""
+        assert query_cache.get("k") is None
+        query_cache.put("k", [{"id": "conv-1"}])
+
+        assert query_cache.get("k") == [{"id": "conv-1"}]
+        stats = query_cache.stats()
+        assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+        assert stats["hit_rate"] == 0.5
+
+    def test_ttl_expiry(self, query_cache):
+        """Test entries older than the TTL are misses and removed."""
+        query_cache.put("k", [1])
+
+        with patch("sekha_cli.cache.time.time", return_value=10**12):
+            assert query_cache.get("k") is None
+        assert query_cache.stats()["entries"] == 0
+
+    def test_lru_eviction(self, query_cache):
+        """Test least recently used entries are evicted over the byte budget."""
+        blob = "x" * 300
+        now = time.time()
+        ticks = [now + offset for offset in range(5)]
+        with patch("sekha_cli.cache.time.time", side_effect=ticks):
+            query_cache.put("a", blob)
+            query_cache.put("b", blob)
+            query_cache.get("a")
+            query_cache.put("c", blob)
+            query_cache.put("d", blob)
+
+        assert query_cache.get("a") is not None
+        assert query_cache.get("b") is None
+        assert query_cache.stats()["bytes"] <= 1000
+
+    def test_clear(self, query_cache):
+        """Test clearing removes entries and counters."""
+        query_cache.put("k", [1])
+        query_cache.get("k")
+        assert query_cache.clear() == 1
+
+        stats = query_cache.stats()
+        assert (stats["entries"], stats["hits"], stats["bytes"]) == (0, 0, 0)
+
+
+class TestConversationCache:
+    """Test the content-addressed conversation cache."""
+
+    def test_round_trip_with_validators(self, tmp_path):
+        """Test a stored conversation comes back with its validators."""
+        cache = ConversationCache(tmp_path / "cache.sqlite3")
+        cache.put({"id": "conv-1", "etag": "v1", "updated_at": "2024-01-01"})
+
+        cached = cache.get("conv-1")
+
+        assert cached.conversation["id"] == "conv-1"
+        assert (cached.etag, cached.updated_at, cached.immutable) == (
+            "v1",
+            "2024-01-01",
+            False,
+        )
+        assert cache.get("missing") is None
+
+    def test_clear_counts_conversations(self, tmp_path):
+        """Test clearing reports how many conversations were removed."""
+        cache = ConversationCache(tmp_path / "cache.sqlite3")
+        cache.put({"id": "conv-1", "messages": []})
+        cache.put({"id": "conv-2", "messages": []})
+
+        assert cache.clear() == 2
+        assert cache.get("conv-1") is None
+
+    def test_identical_bodies_share_an_object(self, tmp_path):
+        """Test unchanged content is stored once and replaced objects are dropped."""
+        cache = ConversationCache(tmp_path / "cache.sqlite3")
+
+        first = cache.put({"id": "conv-1", "messages": []})
+        assert cache.put({"messages": [], "id": "conv-1"}) == first
+
+        cache.put({"id": "conv-1", "messages": [{"content": "edited"}]})
+        (objects,) = cache.conn.execute("SELECT COUNT(*) FROM objects").fetchone()
+        assert objects == 1
+
+    def test_archived_is_immutable(self, tmp_path):
+        """Test archived conversations skip revalidation."""
+        cache = ConversationCache(tmp_path / "cache.sqlite3")
+        cache.put({"id": "conv-1", "status": "archived"})
+
+        assert cache.get("conv-1").immutable
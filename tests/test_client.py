@@ -1,9 +1,15 @@
 """Test Sekha client functionality."""
+import io
 import json
-from unittest.mock import MagicMock, patch
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, call, patch
 
 import pytest
+from click.testing import CliRunner
+from sekha_cli.cache import ConversationCache
 from sekha_cli.client import SekhaClient
+from sekha_cli.main import cli
+from sekha_cli.mirror import Mirror, MirrorController
 
 
 class TestClientInitialization:
@@ -114,6 +120,66 @@ class TestLabelOperations:
         assert len(labels) == 2  # Two unique labels
         work_label = next(label for label in labels if label["name"] == "Work")
         assert work_label["count"] == 2
+        assert client.last_labels_path == "scan"
+
+    @patch("sekha_cli.client.MemoryController")
+    def test_list_labels_scan_is_paginated_and_metadata_only(
+        self, mock_controller_class
+    ):
+        """Test the fallback scan pages past 1000 and requests only ids and labels."""
+        mock_controller = MagicMock()
+        mock_controller_class.return_value = mock_controller
+        mock_controller.search.side_effect = lambda query, **kw: [
+            {"id": str(i), "label": "Work" if i % 2 else "Personal"}
+            for i in range(kw["offset"], min(kw["offset"] + kw["limit"], 1200))
+        ]
+
+        client = SekhaClient(
+            base_url="http://test.com", api_key="sk-test-valid-key-1234567890"
+        )
+        labels = client.list_labels()
+
+        assert labels == [
+            {"name": "Personal", "count": 600},
+            {"name": "Work", "count": 600},
+        ]
+        _, kwargs = mock_controller.search.call_args
+        assert kwargs["fields"] == ["id", "label"]
+
+    @patch("sekha_cli.client.MemoryController")
+    def test_list_labels_uses_aggregate_endpoint(self, mock_controller_class):
+        """Test the aggregate endpoint is preferred when the SDK provides it."""
+
+        class AggregatingController:
+            search = MagicMock()
+
+            def label_counts(self):
+                return [{"label": "Work", "count": 4200}, {"label": "Home", "count": 7}]
+
+        mock_controller_class.return_value = AggregatingController()
+
+        client = SekhaClient(
+            base_url="http://test.com", api_key="sk-test-valid-key-1234567890"
+        )
+        labels = client.list_labels()
+
+        assert labels == [{"name": "Home", "count": 7}, {"name": "Work", "count": 4200}]
+        assert client.last_labels_path == "aggregate"
+        AggregatingController.search.assert_not_called()
+
+    @patch("sekha_cli.client.MemoryController")
+    def test_count_labels_returns_path(self, mock_controller_class):
+        """Test count_labels reports its path without touching shared state."""
+        mock_controller = MagicMock()
+        mock_controller_class.return_value = mock_controller
+        mock_controller.search.return_value = []
+
+        client = SekhaClient(
+            base_url="http://test.com", api_key="sk-test-valid-key-1234567890"
+        )
+
+        assert client.count_labels() == ([], "scan")
+        assert client.last_labels_path is None
 
 
 class TestExportOperations:
@@ -145,6 +211,120 @@ class TestExportOperations:
         assert "**User:** Hello" in content
         assert "**Assistant:** Hi there" in content
 
+    @patch("sekha_cli.client.MemoryController")
+    def test_export_paginates_with_label_filter(self, mock_controller_class):
+        """Test export pages through results with the label pushed to the server."""
+        mock_controller = MagicMock()
+        mock_controller_class.return_value = mock_controller
+        mock_controller.search.side_effect = [
+            [{"id": "conv-1", "label": "Work"}, {"id": "conv-2", "label": "Work"}],
+            [{"id": "conv-3", "label": "Work"}],
+            [],
+        ]
+
+        client = SekhaClient(
+            base_url="http://test.com", api_key="sk-test-valid-key-1234567890"
+        )
+        stream = io.StringIO()
+        count = client.export_to("Work", stream, format="json", page_size=2)
+
+        assert count == 3
+        assert [c["id"] for c in json.loads(stream.getvalue())] == [
+            "conv-1",
+            "conv-2",
+            "conv-3",
+        ]
+        assert mock_controller.search.call_args_list == [
+            call("", label="Work", limit=2, offset=0),
+            call("", label="Work", limit=2, offset=2),
+            call("", label="Work", limit=2, offset=3),
+        ]
+
+    def test_export_without_offset_support(self):
+        """Test an SDK without ``offset`` gets the first page, not a TypeError."""
+
+        class Controller:
+            def search(self, query, label=None, limit=10):
+                return [{"id": "conv-1"}, {"id": "conv-2"}][:limit]
+
+        client = SekhaClient("http://test", "key", controller=Controller())
+        stream = io.StringIO()
+
+        assert client.export_to("Work", stream, format="jsonl", page_size=5) == 2
+
+    def test_label_scan_with_server_page_cap(self):
+        """Test label counts page past a server that caps page sizes."""
+
+        class Controller:
+            def search(self, query, label=None, limit=10, offset=0):
+                rows = [
+                    {"id": f"conv-{i}", "label": "Work" if i % 2 else "Home"}
+                    for i in range(250)
+                ]
+                return rows[offset : offset + min(limit, 100)]
+
+        client = SekhaClient("http://test", "key", controller=Controller())
+
+        assert client.list_labels() == [
+            {"name": "Home", "count": 125},
+            {"name": "Work", "count": 125},
+        ]
+
+    @patch("sekha_cli.client.MemoryController")
+    def test_export_json_empty(self, mock_controller_class):
+        """Test JSON export with no matches is still a valid document."""
+        mock_controller = MagicMock()
+        mock_controller_class.return_value = mock_controller
+        mock_controller.search.return_value = []
+
+        client = SekhaClient(
+            base_url="http://test.com", api_key="sk-test-valid-key-1234567890"
+        )
+
+        assert json.loads(client.export("Empty", format="json")) == []
+
+    @patch("sekha_cli.client.MemoryController")
+    def test_export_jsonl(self, mock_controller_class):
+        """Test JSONL export writes one compact conversation per line."""
+        mock_controller = MagicMock()
+        mock_controller_class.return_value = mock_controller
+        mock_controller.search.return_value = [{"id": "conv-1"}, {"id": "conv-2"}]
+
+        client = SekhaClient(
+            base_url="http://test.com", api_key="sk-test-valid-key-1234567890"
+        )
+
+        output = client.export("Work", format="jsonl")
+
+        assert output.splitlines() == ['{"id":"conv-1"}', '{"id":"conv-2"}']
+
+    @patch("sekha_cli.client.MemoryController")
+    def test_export_since_filters_and_tracks_watermark(self, mock_controller_class):
+        """Test --since keeps recent conversations and records the newest timestamp."""
+        mock_controller = MagicMock()
+        mock_controller_class.return_value = mock_controller
+        mock_controller.search.return_value = [
+            {"id": "old", "created_at": "2026-01-01T00:00:00Z"},
+            {"id": "new", "created_at": "2026-01-01T00:00:00Z",
+             "updated_at": "2026-03-01T00:00:00Z"},
+        ]
+
+        client = SekhaClient(
+            base_url="http://test.com", api_key="sk-test-valid-key-1234567890"
+        )
+        stream = io.StringIO()
+
+        count = client.export_to(
+            "Work",
+            stream,
+            format="jsonl",
+            since=datetime(2026, 2, 1, tzinfo=timezone.utc),
+        )
+
+        assert count == 1
+        assert json.loads(stream.getvalue())["id"] == "new"
+        assert client.last_export_watermark == "2026-03-01T00:00:00+00:00"
+
         @patch("sekha_cli.client.MemoryController")
         def test_export_invalid_format(self, mock_controller_class):
             """Test export with invalid format."""
@@ -158,6 +338,62 @@ class TestExportOperations:
                 client.export("test", format="invalid")
 
 
+class TestConversationCaching:
+    """Test cached conversation reads."""
+
+    @patch("sekha_cli.client.MemoryController")
+    def test_not_modified_skips_transfer(self, mock_controller_class, tmp_path):
+        """Test a conditional get returning None serves the cached copy."""
+        mock_controller = MagicMock()
+        mock_controller_class.return_value = mock_controller
+        cache = ConversationCache(tmp_path / "cache.sqlite3")
+        cache.put({"id": "conv-1", "etag": "v1", "label": "Cached"})
+        mock_controller.get.return_value = None
+
+        client = SekhaClient(
+            base_url="http://test.com", api_key="sk-test-valid-key-1234567890"
+        )
+        conv = client.get_conversation("conv-1", cache=cache)
+
+        assert conv["label"] == "Cached"
+        mock_controller.get.assert_called_once_with("conv-1", if_none_match="v1")
+
+    @patch("sekha_cli.client.MemoryController")
+    def test_changed_conversation_is_refreshed(self, mock_controller_class, tmp_path):
+        """Test a modified conversation replaces the cached copy."""
+        mock_controller = MagicMock()
+        mock_controller_class.return_value = mock_controller
+        cache = ConversationCache(tmp_path / "cache.sqlite3")
+        cache.put({"id": "conv-1", "updated_at": "2024-01-01", "label": "Old"})
+        mock_controller.get.return_value = {
+            "id": "conv-1",
+            "updated_at": "2024-02-01",
+            "label": "New",
+        }
+
+        client = SekhaClient(
+            base_url="http://test.com", api_key="sk-test-valid-key-1234567890"
+        )
+
+        assert client.get_conversation("conv-1", cache=cache)["label"] == "New"
+        assert cache.get("conv-1").updated_at == "2024-02-01"
+
+    @patch("sekha_cli.client.MemoryController")
+    def test_archived_served_locally(self, mock_controller_class, tmp_path):
+        """Test archived conversations never hit the controller once cached."""
+        mock_controller = MagicMock()
+        mock_controller_class.return_value = mock_controller
+        cache = ConversationCache(tmp_path / "cache.sqlite3")
+        cache.put({"id": "conv-1", "status": "archived"})
+
+        client = SekhaClient(
+            base_url="http://test.com", api_key="sk-test-valid-key-1234567890"
+        )
+        client.get_conversation("conv-1", cache=cache)
+
+        mock_controller.get.assert_not_called()
+
+
 class TestErrorHandling:
     """Test error handling."""
 
@@ -172,3 +408,245 @@ class TestErrorHandling:
 
         with pytest.raises(RuntimeError):
             client.get_conversation("nonexistent")
+
+
+class TestArchiveOperations:
+    """Test bulk archiving."""
+
+    @patch("sekha_cli.client.MemoryController")
+    def test_archive_many_reports_failures(self, mock_controller_class):
+        """Test a failing id is retried, then reported without stopping others."""
+        mock_controller = MagicMock()
+        mock_controller_class.return_value = mock_controller
+
+        def archive(conversation_id):
+            if conversation_id == "bad":
+                raise RuntimeError("not found")
+
+        mock_controller.archive.side_effect = archive
+
+        client = SekhaClient(
+            base_url="http://test.com", api_key="sk-test-valid-key-1234567890"
+        )
+        with patch("sekha_cli.pipeline.time.sleep"):
+            outcomes = dict(client.archive_many(["a", "bad", "b"], concurrency=2))
+
+        assert outcomes["a"] is None and outcomes["b"] is None
+        assert str(outcomes["bad"]) == "not found"
+        archived = [c.args[0] for c in mock_controller.archive.call_args_list]
+        assert archived.count("bad") == 3
+
+    @patch("sekha_cli.client.MemoryController")
+    def test_archive_many_uses_bulk_endpoint(self, mock_controller_class):
+        """Test the bulk endpoint is used in batches when the SDK provides it."""
+
+        class BulkController:
+            archive = MagicMock()
+            archive_many = MagicMock()
+
+        mock_controller_class.return_value = BulkController()
+        ids = [f"conv-{i}" for i in range(150)]
+
+        client = SekhaClient(
+            base_url="http://test.com", api_key="sk-test-valid-key-1234567890"
+        )
+        outcomes = list(client.archive_many(ids))
+
+        assert [cid for cid, _ in outcomes] == ids
+        assert BulkController.archive_many.call_count == 2
+        BulkController.archive.assert_not_called()
+
+
+class TestTracing:
+    """Test client tracing hooks."""
+
+    @patch("sekha_cli.client.MemoryController")
+    def test_tracing_wraps_controller(self, mock_controller_class):
+        """Test SDK calls are traced and optional endpoints still detected."""
+        from sekha_cli.trace import TracedController, tracer
+
+        class Controller:
+            def search(self, query, label=None, limit=10, fields=None):
+                return [{"id": "conv-1"}]
+
+            def search_batch(self, requests):
+                return []
+
+        mock_controller_class.return_value = Controller()
+        tracer.enable()
+        try:
+            client = SekhaClient(
+                base_url="http://test.com", api_key="sk-test-valid-key-1234567890"
+            )
+            client.query("test")
+            names = [span.name for span in tracer.spans]
+        finally:
+            tracer.disable()
+
+        assert isinstance(client.controller, TracedController)
+        assert client._supports("search_batch")
+        assert client._accepts(client.controller.search, "fields")
+        assert names == ["sdk.search", "client.query"]
+
+    @patch("sekha_cli.client.MemoryController")
+    def test_metrics_wrap_controller(self, mock_controller_class):
+        """Test SDK calls are counted while metrics are enabled."""
+        from sekha_cli.metrics import MeteredController, registry
+
+        class Controller:
+            def search(self, query, label=None, limit=10):
+                return [{"id": "conv-1"}]
+
+            def label_counts(self):
+                return {}
+
+        mock_controller_class.return_value = Controller()
+        registry.enable()
+        try:
+            client = SekhaClient(
+                base_url="http://test.com", api_key="sk-test-valid-key-1234567890"
+            )
+            client.query("test")
+            requests = dict(registry.requests)
+        finally:
+            registry.disable()
+
+        assert isinstance(client.controller, MeteredController)
+        assert client._supports("label_counts")
+        assert requests == {("query", "ok"): 1}
+
+
+def make_mirror_conv(index, label="Work"):
+    """Build a mirrored conversation with two messages."""
+    return {
+        "id": f"conv-{index:03d}",
+        "label": label,
+        "created_at": f"2024-01-{index + 1:02d}T00:00:00+00:00",
+        "messages": [
+            {"role": "user", "content": f"question {index} about tokens"},
+            {"role": "assistant", "content": f"answer {index}", "model": "m1"},
+        ],
+    }
+
+
+class PagingController:
+    """Controller paging an in-memory list, honouring ``updated_since``."""
+
+    def __init__(self, conversations):
+        self.conversations = conversations
+        self.calls = []
+
+    def search(self, query, label=None, limit=10, offset=0, updated_since=None):
+        self.calls.append(updated_since)
+        rows = self.conversations
+        if updated_since:
+            rows = [
+                c
+                for c in rows
+                if (c.get("updated_at") or c["created_at"]) >= updated_since
+            ]
+        return rows[offset : offset + limit]
+
+
+class TestIncrementalExportRuns:
+    """Test incremental exports through the CLI on a paging controller."""
+
+    def test_unchanged_label_gives_empty_delta(self, tmp_path):
+        """Test a rerun without changes writes nothing, ties are still caught."""
+        convs = [make_mirror_conv(i) for i in range(1, 4)]
+        controller = PagingController(convs)
+        backup = tmp_path / "backup"
+        args = [
+            "--api-key",
+            "sk-test-valid-key-1234567890",
+            "--no-daemon",
+            "export",
+            "--label",
+            "Work",
+            "--output",
+            str(backup),
+            "--format",
+            "jsonl",
+            "--incremental",
+        ]
+
+        def make_client(base_url, api_key):
+            return SekhaClient(base_url, api_key, controller=controller)
+
+        runner = CliRunner()
+        with patch("sekha_cli.client.SekhaClient", make_client):
+            first = runner.invoke(cli, args)
+            second = runner.invoke(cli, args)
+            # Stored after the last run, at the same instant as the watermark.
+            late = make_mirror_conv(9)
+            late["created_at"] = convs[-1]["created_at"]
+            convs.append(late)
+            third = runner.invoke(cli, args)
+
+        assert first.exit_code == 0, first.output
+        assert "No changes since the last export" in second.output
+        assert third.exit_code == 0, third.output
+        manifest = json.loads((backup / "manifest.json").read_text())
+        assert [d["count"] for d in manifest["deltas"]] == [3, 1]
+        delta = (backup / manifest["deltas"][1]["file"]).read_text()
+        assert [json.loads(line)["id"] for line in delta.splitlines()] == ["conv-009"]
+        assert manifest["watermark_ids"] == ["conv-003", "conv-009"]
+
+
+class TestMirrorSync:
+    """Test syncing into the local mirror and reading it back."""
+
+    def test_sync_pulls_only_the_delta(self, tmp_path):
+        """Test a second sync asks for changes since the watermark."""
+        mirror = Mirror(tmp_path / "mirror.sqlite3")
+        convs = [make_mirror_conv(i) for i in range(1, 6)]
+        remote = SekhaClient("http://test", "key", controller=PagingController(convs))
+
+        assert remote.sync_to(mirror, page_size=2) == (5, 0)
+        watermark = mirror.watermark
+
+        convs[1]["updated_at"] = "2024-03-01T00:00:00+00:00"
+        convs[1]["label"] = "Moved"
+        remote.controller.calls.clear()
+        # The conversation at the old watermark is pulled again as well.
+        assert remote.sync_to(mirror, page_size=2) == (2, 0)
+
+        assert remote.controller.calls[0] == watermark
+        assert mirror.get("conv-002")["label"] == "Moved"
+        assert mirror.watermark == "2024-03-01T00:00:00+00:00"
+
+    def test_local_client_reads(self, tmp_path):
+        """Test the usual client paths answer from the mirror."""
+        mirror = Mirror(tmp_path / "mirror.sqlite3")
+        remote = SekhaClient(
+            "http://test",
+            "key",
+            controller=PagingController(
+                [
+                    make_mirror_conv(1),
+                    make_mirror_conv(2, label="Home"),
+                    make_mirror_conv(3),
+                ]
+            ),
+        )
+        remote.sync_to(mirror)
+        local = SekhaClient("http://test", "", controller=MirrorController(mirror))
+
+        assert local.list_labels() == [
+            {"name": "Home", "count": 1},
+            {"name": "Work", "count": 2},
+        ]
+        assert local.last_labels_path == "aggregate"
+        assert [r["id"] for r in local.query("tokens", label="Work")] == [
+            "conv-003",
+            "conv-001",
+        ]
+        assert local.get_conversation("conv-002")["label"] == "Home"
+        with pytest.raises(LookupError):
+            local.get_conversation("missing")
+
+        buffer = io.StringIO()
+        assert local.export_to("Work", buffer, format="jsonl") == 2
+        lines = [json.loads(line) for line in buffer.getvalue().splitlines()]
+        assert [c["id"] for c in lines] == ["conv-001", "conv-003"]
+        assert lines[0]["messages"][1]["model"] == "m1"
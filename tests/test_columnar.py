@@ -0,0 +1,59 @@
+"""Test columnar Parquet/Arrow export."""
+import pytest
+
+from sekha_cli.columnar import write_columnar
+
+pa = pytest.importorskip("pyarrow")
+
+PAGES = [
+    [
+        {
+            "id": "conv-1",
+            "label": "Work",
+            "created_at": "2026-01-01T10:00:00Z",
+            "messages": [
+                {"role": "user", "content": "Hi"},
+                {"role": "assistant", "content": "Hello"},
+            ],
+        }
+    ],
+    [
+        {
+            "id": "conv-2",
+            "label": "Work",
+            "messages": [{"role": "user", "content": "Bye"}],
+        },
+        {"id": "conv-3", "label": "Work", "messages": []},
+    ],
+]
+
+
+class TestColumnarExport:
+    """Test message tables written page by page."""
+
+    def test_parquet_row_group_per_page(self, tmp_path):
+        """Test one row per message and one row group per page."""
+        import pyarrow.parquet as pq
+
+        path = tmp_path / "messages.parquet"
+
+        conversations, rows = write_columnar(iter(PAGES), path)
+
+        assert (conversations, rows) == (3, 3)
+        parquet = pq.ParquetFile(path)
+        assert parquet.metadata.num_row_groups == 2
+        table = pq.read_table(path, columns=["conversation_id", "content"])
+        assert table.column("content").to_pylist() == ["Hi", "Hello", "Bye"]
+        assert table.column_names == ["conversation_id", "content"]
+
+    def test_arrow_ipc(self, tmp_path):
+        """Test Arrow IPC output keeps message order and timestamps."""
+        path = tmp_path / "messages.arrow"
+
+        write_columnar(iter(PAGES), path, format="arrow")
+
+        table = pa.ipc.open_file(str(path)).read_all()
+        assert table.column("message_index").to_pylist() == [0, 1, 0]
+        created = table.column("created_at").to_pylist()
+        assert created[0].isoformat() == "2026-01-01T10:00:00+00:00"
+        assert created[2] is None
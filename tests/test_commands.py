@@ -1,5 +1,8 @@
 """Test CLI command functionality."""
+import gzip
+import io
 import json
+import threading
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -10,8 +13,8 @@ import sekha.utils
 original_validate = sekha.utils.validate_api_key
 sekha.utils.validate_api_key = lambda key: True
 
-# Mock SekhaClient class before import
-sekha_client_patcher = patch("sekha_cli.main.SekhaClient")
+# Mock SekhaClient class; the CLI imports it lazily when a command needs it
+sekha_client_patcher = patch("sekha_cli.client.SekhaClient")
 mock_sekha_client_class = sekha_client_patcher.start()
 MOCK_CLIENT_INSTANCE = MagicMock()
 
@@ -21,12 +24,13 @@ MOCK_CLIENT_INSTANCE.list_labels.return_value = []
 MOCK_CLIENT_INSTANCE.get_conversation.return_value = {}
 MOCK_CLIENT_INSTANCE.get_pruning_suggestions.return_value = []
 MOCK_CLIENT_INSTANCE.export.return_value = ""
+MOCK_CLIENT_INSTANCE.export_to.return_value = 0
 MOCK_CLIENT_INSTANCE.store_conversation.return_value = {"id": "conv-123"}
 
 mock_sekha_client_class.return_value = MOCK_CLIENT_INSTANCE
 
 # NOW safe to import the CLI (it will use the mocked client)
-from sekha_cli.main import cli
+from sekha_cli.main import cli, completion
 
 
 @pytest.fixture
@@ -41,14 +45,26 @@ def mock_client():
     MOCK_CLIENT_INSTANCE.reset_mock()
     # Reset to safe defaults
     MOCK_CLIENT_INSTANCE.query.return_value = []
+    MOCK_CLIENT_INSTANCE.query.side_effect = None
     MOCK_CLIENT_INSTANCE.list_labels.return_value = []
     MOCK_CLIENT_INSTANCE.get_conversation.return_value = {}
     MOCK_CLIENT_INSTANCE.get_pruning_suggestions.return_value = []
     MOCK_CLIENT_INSTANCE.export.return_value = ""
+    MOCK_CLIENT_INSTANCE.export_to.return_value = 0
+    MOCK_CLIENT_INSTANCE.export_to.side_effect = None
+    MOCK_CLIENT_INSTANCE.store_messages.side_effect = None
+    MOCK_CLIENT_INSTANCE.archive.side_effect = None
+    MOCK_CLIENT_INSTANCE._supports.return_value = False
+    MOCK_CLIENT_INSTANCE._supports.side_effect = None
     MOCK_CLIENT_INSTANCE.store_conversation.return_value = {"id": "conv-123"}
     return MOCK_CLIENT_INSTANCE
 
 
+def _raise(error):
+    """Raise ``error``; lets lambdas used as side effects fail."""
+    raise error
+
+
 def cleanup():
     """Cleanup module-level mocks."""
     sekha_client_patcher.stop()
@@ -98,6 +114,25 @@ class TestQueryCommand:
         output = json.loads(result.output)
         assert output[0]["id"] == "conv-123"
 
+    def test_query_jsonl_format(self, runner, mock_client):
+        """Test query with one compact JSON record per line."""
+        mock_client.query.return_value = [{"id": "conv-1"}, {"id": "conv-2"}]
+
+        result = runner.invoke(
+            cli,
+            [
+                "--api-key",
+                "sk-test-valid-key-1234567890",
+                "query",
+                "test",
+                "--format",
+                "jsonl",
+            ],
+        )
+
+        assert result.exit_code == 0
+        assert result.output == '{"id":"conv-1"}\n{"id":"conv-2"}\n'
+
     def test_query_no_results(self, runner, mock_client):
         """Test query with no results."""
         mock_client.query.return_value = []
@@ -107,6 +142,158 @@ class TestQueryCommand:
         assert result.exit_code == 0
         assert "No results found" in result.output
 
+    def test_help_keeps_example_lines(self, runner):
+        """Test multi-line examples are not rewrapped into one paragraph."""
+        result = runner.invoke(cli, ["query", "--help"])
+
+        assert "--limit 10\n      sekha query" in result.output
+
+
+class TestQueryCache:
+    """Test the opt-in query cache."""
+
+    def test_cached_query_skips_controller(self, runner, mock_client):
+        """Test a repeated cached query is served locally."""
+        mock_client.query.return_value = [{"id": "conv-123", "label": "Work"}]
+        args = [
+            "--api-key",
+            "sk-test-valid-key-1234567890",
+            "query",
+            "test",
+            "--cache",
+            "--format",
+            "json",
+        ]
+
+        first = runner.invoke(cli, args)
+        second = runner.invoke(cli, args)
+
+        assert first.exit_code == 0 and second.exit_code == 0
+        assert json.loads(second.output)[0]["id"] == "conv-123"
+        assert mock_client.query.call_count == 1
+
+    def test_refresh_bypasses_cache(self, runner, mock_client):
+        """Test --refresh always goes to the controller."""
+        args = ["--api-key", "sk-test-valid-key-1234567890", "query", "test", "--cache"]
+
+        runner.invoke(cli, args)
+        runner.invoke(cli, args + ["--refresh"])
+
+        assert mock_client.query.call_count == 2
+
+    def test_cache_stats_and_clear(self, runner, mock_client):
+        """Test cache stats reports hit rate and clear empties the cache."""
+        args = ["--api-key", "sk-test-valid-key-1234567890", "query", "test", "--cache"]
+        runner.invoke(cli, args)
+        runner.invoke(cli, args)
+
+        stats = runner.invoke(cli, ["cache", "stats"])
+        cleared = runner.invoke(cli, ["cache", "clear"])
+
+        assert "Hit rate: 50.0%" in stats.output
+        assert "Query and conversation caches cleared (1 query results, 0 conv" in (
+            cleared.output
+        )
+        assert "Entries: 0" in runner.invoke(cli, ["cache", "stats"]).output
+
+
+class TestQueryBatch:
+    """Test multi-query batch mode."""
+
+    def test_batch_streams_jsonl_and_latency_summary(
+        self, runner, mock_client, tmp_path
+    ):
+        """Test each line becomes one JSON record plus a percentile summary."""
+        mock_client.query.side_effect = lambda query, label=None, limit=10: [
+            {"id": f"conv-{query}", "label": label}
+        ]
+        batch = tmp_path / "queries.txt"
+        batch.write_text(
+            'alpha\n\n{"query": "beta", "label": "Work", "limit": 3}\n',
+            encoding="utf-8",
+        )
+
+        result = runner.invoke(
+            cli,
+            [
+                "--api-key",
+                "sk-test-valid-key-1234567890",
+                "query",
+                "--batch",
+                str(batch),
+            ],
+        )
+
+        assert result.exit_code == 0
+        records = [
+            json.loads(line)
+            for line in result.output.splitlines()
+            if line.startswith("{")
+        ]
+        by_query = {r["query"]: r for r in records}
+        assert set(by_query) == {"alpha", "beta"}
+        assert by_query["beta"]["results"] == [{"id": "conv-beta", "label": "Work"}]
+        assert by_query["beta"]["limit"] == 3
+        assert "latency_ms" in by_query["alpha"]
+        assert "2 queries, 0 failed" in result.output
+        assert "p95" in result.output and "p99" in result.output
+
+    def test_batch_endpoint_latency_is_per_request(self, runner, mock_client, tmp_path):
+        """Test chunked queries report their request's latency, not their own."""
+        mock_client._supports.side_effect = lambda method: method == "search_batch"
+        mock_client.query_batch.side_effect = lambda requests: [
+            [{"id": f"conv-{r['query']}"}] for r in requests
+        ]
+        batch = tmp_path / "queries.txt"
+        batch.write_text("alpha\nbeta\ngamma\n", encoding="utf-8")
+
+        result = runner.invoke(
+            cli,
+            [
+                "--api-key",
+                "sk-test-valid-key-1234567890",
+                "query",
+                "--batch",
+                str(batch),
+            ],
+        )
+
+        assert result.exit_code == 0
+        records = [
+            json.loads(line)
+            for line in result.output.splitlines()
+            if line.startswith("{")
+        ]
+        assert len(records) == 3
+        assert all("latency_ms" not in r and r["chunk"] == 0 for r in records)
+        assert "3 queries, 0 failed" in result.output
+        assert "latency per batch request (1 sent)" in result.output
+
+    def test_batch_reports_failures(self, runner, mock_client):
+        """Test a failing query is reported inline and sets the exit code."""
+        mock_client.query.side_effect = lambda query, label=None, limit=10: _raise(
+            RuntimeError("boom")
+        )
+
+        result = runner.invoke(
+            cli,
+            ["--api-key", "sk-test-valid-key-1234567890", "query", "--batch", "-"],
+            input="alpha\n",
+        )
+
+        assert result.exit_code == 1
+        assert '"error":"boom"' in result.output
+        assert "1 failed" in result.output
+
+    def test_query_or_batch_required(self, runner, mock_client):
+        """Test a query argument and --batch are mutually exclusive."""
+        result = runner.invoke(
+            cli, ["--api-key", "sk-test-valid-key-1234567890", "query"]
+        )
+
+        assert result.exit_code != 0
+        assert "Pass either a QUERY or --batch FILE" in result.output
+
 
 class TestStoreCommand:
     """Test store command."""
@@ -156,6 +343,93 @@ class TestStoreCommand:
         assert result.exit_code != 0
 
 
+class TestBulkStoreCommand:
+    """Test bulk store mode."""
+
+    def test_bulk_store_jsonl(self, runner, mock_client, tmp_path):
+        """Test bulk import stores each line and writes failures to a retry file."""
+        mock_client.store_messages.side_effect = [
+            {"id": "conv-1"},
+            RuntimeError("boom"),
+        ]
+        source = tmp_path / "batch.jsonl"
+        source.write_text(
+            json.dumps({"messages": [{"role": "user", "content": "one"}]})
+            + "\n"
+            + json.dumps({"messages": [{"role": "user", "content": "two"}]})
+            + "\n"
+        )
+        retry = tmp_path / "retry.jsonl"
+
+        result = runner.invoke(
+            cli,
+            [
+                "--api-key",
+                "sk-test-valid-key-1234567890",
+                "store",
+                "--input",
+                str(source),
+                "--label",
+                "Imported",
+                "--concurrency",
+                "1",
+                "--retry-file",
+                str(retry),
+                "--journal",
+                str(tmp_path / "journal"),
+            ],
+        )
+
+        assert result.exit_code == 1
+        assert "Stored 1 conversations" in result.output
+        assert "1 failed" in result.output
+        assert json.loads(retry.read_text())["_error"] == "boom"
+        assert (tmp_path / "journal").read_text().endswith(" conv-1\n# complete\n")
+
+    def test_bulk_store_keeps_interrupted_journal(self, runner, mock_client, tmp_path):
+        """Test a plain run refuses to overwrite an interrupted import's journal."""
+        mock_client.store_messages.side_effect = None
+        mock_client.store_messages.return_value = {"id": "conv-1"}
+        source = tmp_path / "batch.jsonl"
+        source.write_text(
+            json.dumps({"messages": [{"role": "user", "content": "one"}]}) + "\n"
+        )
+        journal = tmp_path / "journal"
+        journal.write_text("abc conv-0\n")
+        args = [
+            "--api-key",
+            "sk-test-valid-key-1234567890",
+            "store",
+            "--input",
+            str(source),
+            "--label",
+            "Imported",
+            "--journal",
+            str(journal),
+        ]
+
+        refused = runner.invoke(cli, args)
+
+        assert refused.exit_code == 2
+        assert "--resume" in refused.output
+        assert journal.read_text() == "abc conv-0\n"
+
+        forced = runner.invoke(cli, args + ["--force"])
+
+        assert forced.exit_code == 0
+        assert journal.read_text().endswith(" conv-1\n# complete\n")
+        assert runner.invoke(cli, args).exit_code == 0
+
+    def test_store_requires_one_source(self, runner, mock_client):
+        """Test --file and --input are mutually exclusive."""
+        result = runner.invoke(
+            cli, ["--api-key", "sk-test-valid-key-1234567890", "store", "--label", "X"]
+        )
+
+        assert result.exit_code != 0
+        assert "exactly one of --file or --input" in result.output
+
+
 class TestLabelsCommand:
     """Test labels command."""
 
@@ -181,6 +455,36 @@ class TestLabelsCommand:
         assert result.exit_code == 0
         assert "No labels found" in result.output
 
+    def test_labels_list_concurrency(self, runner, mock_client):
+        """Test labels list forwards the concurrency option."""
+        result = runner.invoke(
+            cli,
+            [
+                "--api-key",
+                "sk-test-valid-key-1234567890",
+                "labels",
+                "list",
+                "--concurrency",
+                "2",
+            ],
+        )
+
+        assert result.exit_code == 0
+        mock_client.list_labels.assert_called_once_with(concurrency=2)
+
+    def test_labels_list_timing(self, runner, mock_client):
+        """Test --timing reports the counting path."""
+        mock_client.list_labels.return_value = [{"name": "Work", "count": 5}]
+        mock_client.last_labels_path = "aggregate"
+
+        result = runner.invoke(
+            cli,
+            ["--api-key", "sk-test-valid-key-1234567890", "labels", "list", "--timing"],
+        )
+
+        assert result.exit_code == 0
+        assert "Counted labels via aggregate" in result.output
+
 
 class TestConversationCommand:
     """Test conversation command."""
@@ -251,6 +555,153 @@ class TestConversationCommand:
         assert "# Test" in result.output
         assert "**User:** Hello" in result.output
 
+    def test_conversation_show_markdown_template(self, runner, mock_client, tmp_path):
+        """Test showing a conversation with a custom Markdown template."""
+        mock_client.get_conversation.return_value = {
+            "id": "conv-123",
+            "label": "Test",
+            "messages": [{"role": "user", "content": "Hello there"}],
+        }
+        template = tmp_path / "brief.yaml"
+        template.write_text("header: {}\nrole_format: '{raw_role}> '\ntruncate: 5\n")
+
+        result = runner.invoke(
+            cli,
+            [
+                "--api-key",
+                "sk-test-valid-key-1234567890",
+                "conversation",
+                "show",
+                "conv-123",
+                "--format",
+                "markdown",
+                "--template",
+                str(template),
+            ],
+        )
+
+        assert result.exit_code == 0
+        assert result.output == "# Test\n\nuser> Hello...\n\n---\n\n"
+
+    def test_export_rejects_bad_template_field(self, runner, mock_client, tmp_path):
+        """Test a template with an unknown placeholder fails before exporting."""
+        template = tmp_path / "brief.yaml"
+        template.write_text("role_format: '{speaker}: '\n")
+
+        result = runner.invoke(
+            cli,
+            [
+                "--api-key",
+                "sk-test-valid-key-1234567890",
+                "export",
+                "--label",
+                "Work",
+                "--output",
+                str(tmp_path / "out.md"),
+                "--template",
+                str(template),
+            ],
+        )
+
+        assert result.exit_code == 2
+        assert "brief.yaml" in result.output
+        assert "{speaker}" in result.output
+        mock_client.export_to.assert_not_called()
+
+
+class TestConversationOffline:
+    """Test offline conversation reads."""
+
+    def test_offline_serves_cached_copy(self, runner, mock_client, isolated_cache_dir):
+        """Test --offline reads the cache without building a client."""
+        from sekha_cli.cache import ConversationCache
+
+        ConversationCache(isolated_cache_dir / "cache.sqlite3").put(
+            {"id": "conv-123", "label": "Cached", "messages": []}
+        )
+
+        result = runner.invoke(
+            cli, ["conversation", "show", "conv-123", "--offline", "--format", "json"]
+        )
+
+        assert result.exit_code == 0
+        assert json.loads(result.output)["label"] == "Cached"
+        mock_client.get_conversation.assert_not_called()
+
+    def test_offline_miss(self, runner, mock_client):
+        """Test --offline reports conversations that were never cached."""
+        result = runner.invoke(cli, ["conversation", "show", "conv-404", "--offline"])
+
+        assert result.exit_code != 0
+        assert "not in the local cache" in result.output
+
+    def test_daemon_read_opens_no_cache(self, runner, mock_client):
+        """Test a daemon-forwarded show leaves the cache to the daemon."""
+        from sekha_cli.daemon import DaemonClient
+
+        sock = MagicMock()
+        sock.makefile.return_value = io.StringIO(
+            json.dumps({"ok": True, "result": {"id": "conv-123"}}) + "\n"
+        )
+        remote = DaemonClient(sock, "http://localhost:8080", "key")
+
+        with patch.object(DaemonClient, "connect", return_value=remote), patch(
+            "sekha_cli.main._open_conversation_cache"
+        ) as open_cache:
+            result = runner.invoke(
+                cli,
+                [
+                    "--api-key",
+                    "sk-test-valid-key-1234567890",
+                    "conversation",
+                    "show",
+                    "conv-123",
+                    "--format",
+                    "json",
+                ],
+            )
+
+        assert result.exit_code == 0, result.output
+        open_cache.assert_not_called()
+        request = json.loads(sock.sendall.call_args.args[0])
+        assert request["kwargs"] == {"use_cache": True}
+
+    def test_cache_handles_are_closed(self, runner, mock_client):
+        """Test show, cache stats and cache clear close what they open."""
+        mock_client.get_conversation.return_value = {"id": "conv-123"}
+        with patch("sekha_cli.main._open_conversation_cache") as open_conv, patch(
+            "sekha_cli.main._open_query_cache"
+        ) as open_query:
+            open_query.return_value.stats.return_value = {
+                "path": "x",
+                "entries": 0,
+                "bytes": 0,
+                "max_bytes": 1,
+                "hits": 0,
+                "misses": 0,
+                "hit_rate": 0.0,
+            }
+            open_conv.return_value.stats.return_value = {
+                "conversations": 0,
+                "bytes": 0,
+            }
+            runner.invoke(
+                cli,
+                [
+                    "--api-key",
+                    "sk-test-valid-key-1234567890",
+                    "--no-daemon",
+                    "conversation",
+                    "show",
+                    "conv-123",
+                ],
+            )
+            runner.invoke(cli, ["cache", "stats"])
+            runner.invoke(cli, ["cache", "clear"])
+
+        assert open_conv.return_value.close.call_count == 3
+        assert open_query.return_value.close.call_count == 2
+
 
 class TestPruneCommand:
     """Test prune command."""
@@ -297,6 +748,68 @@ class TestPruneCommand:
         assert result.exit_code == 0
         mock_client.archive.assert_called_once_with("conv-1")
 
+    def test_prune_reports_failures_and_skips(self, runner, mock_client):
+        """Test one failing id is reported without aborting the run."""
+        mock_client.get_pruning_suggestions.return_value = [
+            {"id": "conv-1", "reason": "Low importance"},
+            {"id": "conv-2", "reason": "Low importance"},
+            {"reason": "Missing id"},
+        ]
+        mock_client.archive.side_effect = lambda cid: (
+            _raise(RuntimeError("not found")) if cid == "conv-2" else None
+        )
+
+        with patch("sekha_cli.pipeline.time.sleep"):
+            result = runner.invoke(
+                cli,
+                [
+                    "--api-key",
+                    "sk-test-valid-key-1234567890",
+                    "prune",
+                    "--concurrency",
+                    "2",
+                ],
+                input="y\n",
+            )
+
+        assert result.exit_code == 1
+        assert "Archived 1, failed 1, skipped 1" in result.output
+        assert "not found" in result.output
+        archived = sorted(c.args[0] for c in mock_client.archive.call_args_list)
+        assert archived == ["conv-1", "conv-2", "conv-2", "conv-2"]
+
+    def test_prune_runs_concurrently_with_daemon(self, runner, mock_client):
+        """Test archives overlap when a daemon serves the other requests."""
+        from sekha_cli.daemon import DaemonClient
+
+        suggestions = [{"id": f"conv-{i}", "reason": "Old"} for i in range(3)]
+        sock = MagicMock()
+        sock.makefile.return_value = io.StringIO(
+            json.dumps({"ok": True, "result": suggestions}) + "\n"
+        )
+        remote = DaemonClient(sock, "http://localhost:8080", "key")
+        # Every archive waits until all three are in flight at once.
+        barrier = threading.Barrier(3, timeout=5)
+        mock_client.archive.side_effect = lambda cid: barrier.wait()
+
+        with patch.object(DaemonClient, "connect", return_value=remote):
+            result = runner.invoke(
+                cli,
+                [
+                    "--api-key",
+                    "sk-test-valid-key-1234567890",
+                    "prune",
+                    "--concurrency",
+                    "3",
+                ],
+                input="y\n",
+            )
+
+        assert result.exit_code == 0, result.output
+        assert "Pruning complete." in result.output
+        assert mock_client.archive.call_count == 3
+        mock_client.get_pruning_suggestions.assert_not_called()
+
     def test_prune_no_suggestions(self, runner, mock_client):
         """Test prune when no suggestions exist."""
         mock_client.get_pruning_suggestions.return_value = []
@@ -312,7 +825,11 @@ class TestExportCommand:
 
     def test_export_markdown(self, runner, mock_client, tmp_path):
         """Test export in markdown format."""
-        mock_client.export.return_value = "# Test Label\n\n**User:** Hello\n\n"
+        def fake_export(label, stream, **kwargs):
+            stream.write("# Test Label\n\n**User:** Hello\n\n")
+            return 1
+
+        mock_client.export_to.side_effect = fake_export
 
         output_file = tmp_path / "export.md"
 
@@ -337,7 +854,11 @@ class TestExportCommand:
 
     def test_export_json(self, runner, mock_client, tmp_path):
         """Test export in JSON format."""
-        mock_client.export.return_value = '[{"id": "conv-123"}]'
+        def fake_export(label, stream, **kwargs):
+            stream.write('[{"id": "conv-123"}]')
+            return 1
+
+        mock_client.export_to.side_effect = fake_export
 
         output_file = tmp_path / "export.json"
 
@@ -360,6 +881,252 @@ class TestExportCommand:
         output = json.loads(output_file.read_text())
         assert output[0]["id"] == "conv-123"
 
+    def test_export_passes_paging_options(self, runner, mock_client, tmp_path):
+        """Test export forwards label and paging options to the streaming export."""
+        output_file = tmp_path / "export.md"
+
+        result = runner.invoke(
+            cli,
+            [
+                "--api-key",
+                "sk-test-valid-key-1234567890",
+                "export",
+                "--label",
+                "Test",
+                "--output",
+                str(output_file),
+                "--page-size",
+                "25",
+                "--concurrency",
+                "8",
+            ],
+        )
+
+        assert result.exit_code == 0
+        args, kwargs = mock_client.export_to.call_args
+        assert args[0] == "Test"
+        assert kwargs == {
+            "format": "markdown",
+            "page_size": 25,
+            "concurrency": 8,
+            "since": None,
+            "template": None,
+        }
+        assert "Exported 0 conversations" in result.output
+
+
+class TestCompressedExport:
+    """Test compressed and chunked export output."""
+
+    def test_compress_flag_adds_extension(self, runner, mock_client, tmp_path):
+        """Test --compress gzip writes a .gz file."""
+        def fake_export(label, stream, **kwargs):
+            stream.write("# Test\n")
+            return 1
+
+        mock_client.export_to.side_effect = fake_export
+
+        result = runner.invoke(
+            cli,
+            [
+                "--api-key",
+                "sk-test-valid-key-1234567890",
+                "export",
+                "--label",
+                "Test",
+                "--output",
+                str(tmp_path / "backup.md"),
+                "--compress",
+                "gzip",
+            ],
+        )
+
+        assert result.exit_code == 0
+        assert gzip.decompress((tmp_path / "backup.md.gz").read_bytes()) == b"# Test\n"
+
+    def test_invalid_split_size(self, runner, mock_client, tmp_path):
+        """Test --split-size must be a size."""
+        result = runner.invoke(
+            cli,
+            [
+                "--api-key",
+                "sk-test-valid-key-1234567890",
+                "export",
+                "--label",
+                "Test",
+                "--output",
+                str(tmp_path / "backup.md"),
+                "--split-size",
+                "huge",
+            ],
+        )
+
+        assert result.exit_code != 0
+        assert "Not a size" in result.output
+
+    def test_columnar_rejects_text_options(self, runner, mock_client, tmp_path):
+        """Test text-only options are refused for parquet output."""
+        result = runner.invoke(
+            cli,
+            [
+                "--api-key",
+                "sk-test-valid-key-1234567890",
+                "export",
+                "--label",
+                "Test",
+                "--output",
+                str(tmp_path / "messages.parquet"),
+                "--format",
+                "parquet",
+                "--compress",
+                "gzip",
+            ],
+        )
+
+        assert result.exit_code != 0
+        assert "do not apply to parquet" in result.output
+        mock_client.export_columnar.assert_not_called()
+
+
+class TestIncrementalExport:
+    """Test incremental export and snapshot rebuilds."""
+
+    def test_deltas_then_snapshot(self, runner, mock_client, tmp_path):
+        """Test each run writes only changes and snapshot keeps latest copies."""
+        runs = [
+            [
+                {"id": "a", "v": 1, "updated_at": "2026-01-01T00:00:00+00:00"},
+                {"id": "b", "v": 1, "updated_at": "2026-01-02T00:00:00+00:00"},
+            ],
+            [{"id": "a", "v": 2, "updated_at": "2026-01-03T00:00:00+00:00"}],
+        ]
+        seen_since = []
+
+        def fake_export(label, stream, **kwargs):
+            seen_since.append(kwargs["since"])
+            batch = runs[len(seen_since) - 1]
+            for conv in batch:
+                stream.write(json.dumps(conv) + "\n")
+            mock_client.last_export_watermark = batch[-1]["updated_at"]
+            return len(batch)
+
+        mock_client.export_to.side_effect = fake_export
+        backup = tmp_path / "backup"
+        args = [
+            "--api-key",
+            "sk-test-valid-key-1234567890",
+            "export",
+            "--label",
+            "Work",
+            "--output",
+            str(backup),
+            "--format",
+            "jsonl",
+            "--incremental",
+        ]
+
+        assert runner.invoke(cli, args).exit_code == 0
+        assert runner.invoke(cli, args).exit_code == 0
+
+        manifest = json.loads((backup / "manifest.json").read_text())
+        assert [d["file"] for d in manifest["deltas"]] == [
+            "delta-000001.jsonl",
+            "delta-000002.jsonl",
+        ]
+        assert manifest["watermark"] == "2026-01-03T00:00:00+00:00"
+        assert seen_since[0] is None
+        assert seen_since[1].isoformat() == "2026-01-02T00:00:00+00:00"
+
+        full = tmp_path / "full.jsonl"
+        result = runner.invoke(cli, ["snapshot", str(backup), "--output", str(full)])
+
+        assert result.exit_code == 0
+        records = [json.loads(line) for line in full.read_text().splitlines()]
+        assert [(r["id"], r["v"]) for r in records] == [("b", 1), ("a", 2)]
+
+    def test_json_snapshot(self, runner, mock_client, tmp_path):
+        """Test a snapshot from JSON array deltas keeps the latest copies."""
+        from sekha_cli.output import record_writer
+
+        runs = [[{"id": "a", "v": 1}, {"id": "b", "v": 1}], [{"id": "a", "v": 2}]]
+
+        def fake_export(label, stream, **kwargs):
+            batch = runs.pop(0)
+            writer = record_writer("json", stream)
+            writer.begin()
+            for conv in batch:
+                writer.write(conv)
+            writer.end()
+            mock_client.last_export_watermark = "2026-01-01T00:00:00+00:00"
+            return len(batch)
+
+        mock_client.export_to.side_effect = fake_export
+        backup = tmp_path / "backup"
+        args = [
+            "--api-key",
+            "sk-test-valid-key-1234567890",
+            "export",
+            "--label",
+            "Work",
+            "--output",
+            str(backup),
+            "--format",
+            "json",
+            "--incremental",
+        ]
+        assert runner.invoke(cli, args).exit_code == 0
+        assert runner.invoke(cli, args).exit_code == 0
+
+        full = tmp_path / "full.json"
+        result = runner.invoke(cli, ["snapshot", str(backup), "--output", str(full)])
+
+        assert result.exit_code == 0
+        records = json.loads(full.read_text())
+        assert [(r["id"], r["v"]) for r in records] == [("b", 1), ("a", 2)]
+
+    def test_rejects_mismatched_directory(self, runner, mock_client, tmp_path):
+        """Test a backup directory is tied to one label and format."""
+        (tmp_path / "manifest.json").write_text(
+            json.dumps({"label": "Other", "format": "jsonl", "deltas": []})
+        )
+
+        result = runner.invoke(
+            cli,
+            [
+                "--api-key",
+                "sk-test-valid-key-1234567890",
+                "export",
+                "--label",
+                "Work",
+                "--output",
+                str(tmp_path),
+                "--incremental",
+            ],
+        )
+
+        assert result.exit_code != 0
+        assert "label 'Other'" in result.output
+
+    def test_invalid_since(self, runner, mock_client, tmp_path):
+        """Test --since must be a timestamp."""
+        result = runner.invoke(
+            cli,
+            [
+                "--api-key",
+                "sk-test-valid-key-1234567890",
+                "export",
+                "--label",
+                "Work",
+                "--output",
+                str(tmp_path / "out.md"),
+                "--since",
+                "yesterday",
+            ],
+        )
+
+        assert result.exit_code != 0
+        assert "Not an ISO-8601 timestamp" in result.output
+
 
 class TestConfigCommand:
     """Test config command."""
@@ -404,4 +1171,276 @@ class TestErrorHandling:
         result = runner.invoke(cli, ["--api-key", "sk-test-valid-key-1234567890", "query", "test"])
         
         assert result.exit_code != 0
-        assert "Search failed" in result.output
\ No newline at end of file
+        assert "Search failed" in result.output
+
+class TestTracing:
+    """Test --trace and --trace-file."""
+
+    def test_trace_prints_summary(self, runner, mock_client):
+        """Test --trace adds a span table to the output."""
+        result = runner.invoke(
+            cli,
+            [
+                "--api-key",
+                "sk-test-valid-key-1234567890",
+                "--trace",
+                "query",
+                "test",
+            ],
+        )
+
+        assert result.exit_code == 0
+        assert "Span" in result.output
+        assert "command.query" in result.output
+        assert "startup" in result.output
+
+    def test_trace_file_writes_chrome_trace(self, runner, mock_client, tmp_path):
+        """Test --trace-file writes loadable trace events."""
+        path = tmp_path / "trace.json"
+
+        result = runner.invoke(
+            cli,
+            [
+                "--api-key",
+                "sk-test-valid-key-1234567890",
+                "--trace-file",
+                str(path),
+                "query",
+                "test",
+                "--format",
+                "json",
+            ],
+        )
+
+        assert result.exit_code == 0
+        assert json.loads(result.output) == []
+        events = json.loads(path.read_text(encoding="utf-8"))["traceEvents"]
+        names = {event["name"] for event in events}
+        assert {"startup", "command.query", "client.init"} <= names
+        assert all(event["ph"] == "X" for event in events)
+
+    def test_trace_off_by_default(self, runner, mock_client):
+        """Test no trace output without the flag."""
+        from sekha_cli.trace import tracer
+
+        result = runner.invoke(
+            cli, ["--api-key", "sk-test-valid-key-1234567890", "query", "test"]
+        )
+
+        assert result.exit_code == 0
+        assert "Span" not in result.output
+        assert not tracer.enabled
+
+
+class TestMetricsOption:
+    """Test --metrics-file."""
+
+    def test_metrics_recorded_during_command(self, runner, mock_client, tmp_path):
+        """Test requests made while a command runs reach the metrics file."""
+        from sekha_cli.metrics import registry
+
+        path = tmp_path / "sekha.prom"
+        mock_client.query.side_effect = lambda *args, **kwargs: (
+            registry.observe("query", 0.01) or []
+        )
+
+        result = runner.invoke(
+            cli,
+            [
+                "--api-key",
+                "sk-test-valid-key-1234567890",
+                "--metrics-file",
+                str(path),
+                "query",
+                "test",
+            ],
+        )
+
+        assert result.exit_code == 0
+        assert 'sekha_client_requests_total{operation="query",outcome="ok"} 1' in (
+            path.read_text(encoding="utf-8")
+        )
+        assert not registry.enabled
+
+
+class TestLocalMirror:
+    """Test sync and --local read modes."""
+
+    def test_local_without_sync_explains(self, runner, mock_client):
+        """Test --local before any sync points at `sekha sync`."""
+        result = runner.invoke(cli, ["query", "tokens", "--local"])
+
+        assert result.exit_code != 0
+        assert "sekha sync" in result.output
+        mock_client.query.assert_not_called()
+
+    def test_sync_reports_counts(self, runner, mock_client):
+        """Test sync prints what it pulled."""
+        mock_client.sync_to.return_value = (3, 1)
+
+        result = runner.invoke(
+            cli, ["--api-key", "sk-test-valid-key-1234567890", "sync", "--full"]
+        )
+
+        assert result.exit_code == 0
+        assert "Synced 3 conversations" in result.output
+        assert "removed 1" in result.output
+        assert mock_client.sync_to.call_args.kwargs["full"] is True
+
+    def test_sync_from_file_then_fts(self, runner, mock_client, tmp_path):
+        """Test an export loaded into the mirror is searchable offline."""
+        export = tmp_path / "backup.jsonl"
+        export.write_text(
+            json.dumps(
+                {
+                    "id": "conv-42",
+                    "label": "Work",
+                    "created_at": "2024-01-01T00:00:00Z",
+                    "messages": [{"role": "user", "content": "the token limit"}],
+                }
+            )
+            + "\n",
+            encoding="utf-8",
+        )
+
+        loaded = runner.invoke(cli, ["sync", "--from-file", str(export)])
+        result = runner.invoke(cli, ["fts", "token", "--format", "jsonl"])
+
+        assert loaded.exit_code == 0
+        assert "Loaded 1 conversations" in loaded.output
+        assert result.exit_code == 0
+        hit = json.loads(result.output)
+        assert hit["id"] == "conv-42"
+        assert hit["snippet"] == "the **token** limit"
+        mock_client.sync_to.assert_not_called()
+
+    def test_fts_without_mirror(self, runner, mock_client):
+        """Test fts before any sync points at `sekha sync`."""
+        result = runner.invoke(cli, ["fts", "token"])
+
+        assert result.exit_code != 0
+        assert "sekha sync" in result.output
+
+    def test_find_needs_a_terminal(self, runner, mock_client):
+        """Test find refuses to run without an interactive terminal."""
+        result = runner.invoke(cli, ["find"])
+
+        assert result.exit_code != 0
+        assert "interactive terminal" in result.output
+        mock_client.query.assert_not_called()
+
+
+class TestCompletion:
+    """Test shell completion commands and the completion cache."""
+
+    @pytest.mark.parametrize("shell", ["bash", "zsh", "fish"])
+    def test_prints_script(self, runner, shell):
+        """Test the completion script targets the sekha completion variable."""
+        result = runner.invoke(cli, ["completion", shell])
+
+        assert result.exit_code == 0
+        assert f"_SEKHA_COMPLETE={shell}_complete" in result.output
+
+    def test_query_results_feed_the_cache(self, runner, mock_client):
+        """Test ids seen by query become completions."""
+        mock_client.query.return_value = [
+            {"id": "conv-777", "label": "Work", "preview": "token limits"}
+        ]
+
+        result = runner.invoke(
+            cli, ["--api-key", "sk-test-valid-key-1234567890", "query", "tokens"]
+        )
+
+        assert result.exit_code == 0
+        (item,) = completion.conversation_items("conv-7", completion.load())
+        assert item == ("conv-777", "[Work] token limits")
+        assert completion.load()["labels"] == ["Work"]
+
+    def test_refresh_reads_labels(self, runner, mock_client):
+        """Test the background refresh stores the controller's labels."""
+        mock_client.list_labels.return_value = [{"name": "Home", "count": 2}]
+
+        result = runner.invoke(
+            cli, ["--api-key", "sk-test-valid-key-1234567890", "completion-refresh"]
+        )
+
+        assert result.exit_code == 0
+        assert completion.label_items("H", completion.load()) == [("Home", "")]
+
+
+class TestIdPrefixes:
+    """Test short id prefixes for conversation show and archive."""
+
+    @pytest.fixture
+    def known_ids(self, runner, mock_client):
+        """Let a query put two similar ids in the index."""
+        mock_client.query.return_value = [
+            {"id": "3f2a9c1e-aaaa", "label": "Work", "preview": "first"},
+            {"id": "3f2a9c1e-bbbb", "label": "Home", "preview": "second"},
+        ]
+        runner.invoke(cli, ["--api-key", "sk-test-valid-key-1234567890", "query", "x"])
+        mock_client.reset_mock()
+
+    def test_show_resolves_prefix(self, runner, mock_client, known_ids):
+        """Test show fetches the full id for an unambiguous prefix."""
+        mock_client.get_conversation.return_value = {"label": "Work", "messages": []}
+
+        result = runner.invoke(
+            cli,
+            [
+                "--api-key",
+                "sk-test-valid-key-1234567890",
+                "conversation",
+                "show",
+                "3f2a9c1e-b",
+                "--no-cache",
+            ],
+        )
+
+        assert result.exit_code == 0
+        assert mock_client.get_conversation.call_args.args[0] == "3f2a9c1e-bbbb"
+
+    def test_ambiguous_prefix_lists_candidates(self, runner, mock_client, known_ids):
+        """Test an ambiguous prefix fails without contacting the controller."""
+        result = runner.invoke(
+            cli,
+            [
+                "--api-key",
+                "sk-test-valid-key-1234567890",
+                "conversation",
+                "show",
+                "3f2a",
+            ],
+        )
+
+        assert result.exit_code != 0
+        assert "matches 2 conversations" in result.output
+        assert "3f2a9c1e-aaaa  [Work] first" in result.output
+        assert "3f2a9c1e-bbbb  [Home] second" in result.output
+        mock_client.get_conversation.assert_not_called()
+
+    def test_archive_resolves_prefixes(self, runner, mock_client, known_ids):
+        """Test archive resolves each prefix and reports failures."""
+        mock_client.archive_many.return_value = iter(
+            [("3f2a9c1e-aaaa", None), ("unknown-id", RuntimeError("not found"))]
+        )
+
+        result = runner.invoke(
+            cli,
+            [
+                "--api-key",
+                "sk-test-valid-key-1234567890",
+                "conversation",
+                "archive",
+                "3f2a9c1e-a",
+                "unknown-id",
+            ],
+        )
+
+        assert result.exit_code == 1
+        assert mock_client.archive_many.call_args.args[0] == [
+            "3f2a9c1e-aaaa",
+            "unknown-id",
+        ]
+        assert "Archived 1 conversations" in result.output
+        assert "not found" in result.output
@@ -0,0 +1,203 @@
+"""Test shell completion from the local completion cache."""
+import os
+import time
+
+import click
+import pytest
+
+from sekha_cli import completion
+from sekha_cli.main import cli
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Path of a completion cache holding two labels and two conversations."""
+    path = str(tmp_path / "completion.tsv")
+    completion.remember(
+        labels=["Work", "Home"],
+        conversations=[
+            {"id": "conv-abc", "label": "Work", "preview": "token\tlimits\nnotes"},
+            {"id": "conv-xyz", "messages": [{"role": "user", "content": "garden"}]},
+        ],
+        path=path,
+        refreshed=True,
+    )
+    return path
+
+
+def complete(instruction, words, cword, monkeypatch, capsys):
+    """Run the fast path like the shell script would; returns (handled, output)."""
+    monkeypatch.setattr(completion, "refresh_in_background", lambda data: False)
+    environ = {
+        completion.COMPLETE_VAR: instruction,
+        "COMP_WORDS": words,
+        "COMP_CWORD": str(cword),
+    }
+    handled = completion.fast_complete(environ)
+    return handled, capsys.readouterr().out
+
+
+class TestCompletionCache:
+    """Test the completion cache file."""
+
+    def test_round_trip(self, cache):
+        """Test labels and conversations survive a save and load."""
+        data = completion.load(cache)
+
+        assert data["labels"] == ["Home", "Work"]
+        assert data["conversations"][0] == {
+            "id": "conv-abc",
+            "label": "Work",
+            "preview": "token limits notes",
+        }
+        assert data["conversations"][1]["preview"] == "garden"
+        assert time.time() - data["updated_at"] < 60
+
+    def test_recent_first_and_bounded(self, cache, monkeypatch):
+        """Test the newest conversations come first and old ones fall off."""
+        monkeypatch.setattr(completion, "MAX_CONVERSATIONS", 2)
+        completion.remember(conversations=[{"id": "conv-new"}], path=cache)
+
+        ids = [c["id"] for c in completion.load(cache)["conversations"]]
+        assert ids == ["conv-new", "conv-abc"]
+
+    def test_remember_appends(self, cache):
+        """Test remembering a conversation appends rows instead of rewriting."""
+        before = os.stat(cache)
+
+        completion.remember(
+            conversations=[{"id": "conv-abc", "label": "Home"}], path=cache
+        )
+
+        after = os.stat(cache)
+        assert after.st_ino == before.st_ino and after.st_size > before.st_size
+        data = completion.load(cache)
+        assert [c["id"] for c in data["conversations"]] == ["conv-abc", "conv-xyz"]
+        assert data["conversations"][0]["label"] == "Home"
+
+    def test_large_cache_is_compacted(self, cache, monkeypatch):
+        """Test appended rows are folded into one row each past the size limit."""
+        monkeypatch.setattr(completion, "COMPACT_AFTER", 1)
+        completion.remember(
+            labels=["Work"], conversations=[{"id": "conv-abc"}], path=cache
+        )
+
+        with open(cache, encoding="utf-8") as f:
+            rows = [line.rstrip("\n").split("\t")[:2] for line in f]
+        assert rows[1:] == [
+            ["label", "Home"],
+            ["label", "Work"],
+            ["conversation", "conv-xyz"],
+            ["conversation", "conv-abc"],
+        ]
+
+    def test_refresh_replaces_labels(self, cache):
+        """Test a refresh drops labels the controller no longer has."""
+        completion.remember(labels=["Archive"], path=cache)
+        assert completion.load(cache)["labels"] == ["Archive", "Home", "Work"]
+
+        completion.remember(labels=["Work"], path=cache, refreshed=True)
+        assert completion.load(cache)["labels"] == ["Work"]
+
+    def test_missing_cache_is_empty(self, tmp_path):
+        """Test a missing cache loads as empty and stale."""
+        data = completion.load(str(tmp_path / "nope.tsv"))
+
+        assert data == {"labels": [], "conversations": [], "updated_at": 0.0}
+
+    def test_stale_cache_refreshes_once(self, cache, monkeypatch):
+        """Test a stale cache starts one detached refresh per interval."""
+        started = []
+        monkeypatch.setattr(
+            "subprocess.Popen", lambda args, **kwargs: started.append(args)
+        )
+        stale = {"updated_at": time.time() - completion.REFRESH_AFTER - 1}
+
+        assert completion.refresh_in_background(completion.load(cache), cache) is False
+        assert completion.refresh_in_background(stale, cache) is True
+        assert completion.refresh_in_background(stale, cache) is False
+        assert started[0][-1] == "completion-refresh"
+
+
+class TestFastComplete:
+    """Test completions answered before click is imported."""
+
+    def test_label_bash(self, cache, monkeypatch, capsys):
+        """Test --label values complete from the cache."""
+        monkeypatch.setattr(completion, "cache_path", lambda: cache)
+
+        handled, out = complete(
+            "bash_complete", "sekha query --label Wo", 3, monkeypatch, capsys
+        )
+
+        assert handled
+        assert out == "plain,Work\n"
+
+    def test_conversation_id_zsh_with_global_options(self, cache, monkeypatch, capsys):
+        """Test ids complete with their preview after global options."""
+        monkeypatch.setattr(completion, "cache_path", lambda: cache)
+
+        handled, out = complete(
+            "zsh_complete",
+            "sekha --api-url http://x:1 --trace conversation show conv-a",
+            6,
+            monkeypatch,
+            capsys,
+        )
+
+        assert handled
+        assert out == "plain\nconv-abc\n[Work] token limits notes\n"
+
+    def test_conversation_id_fish(self, cache, monkeypatch, capsys):
+        """Test fish gets tab-separated help."""
+        monkeypatch.setattr(completion, "cache_path", lambda: cache)
+        environ_words = "sekha conversation show conv-x"
+
+        handled, out = complete(
+            "fish_complete", environ_words, "conv-x", monkeypatch, capsys
+        )
+
+        assert handled
+        assert out == "plain,conv-xyz\tgarden\n"
+
+    def test_archive_takes_many_ids(self, cache, monkeypatch, capsys):
+        """Test every id argument of archive completes."""
+        monkeypatch.setattr(completion, "cache_path", lambda: cache)
+
+        handled, out = complete(
+            "bash_complete",
+            "sekha conversation archive conv-abc conv-x",
+            4,
+            monkeypatch,
+            capsys,
+        )
+
+        assert handled
+        assert out == "plain,conv-xyz\n"
+
+    @pytest.mark.parametrize(
+        "words,cword",
+        [
+            ("sekha query --li", 2),
+            ("sekha conversation show conv-abc --for", 4),
+            ("sekha query tok", 2),
+            ("sekha conversation archive --concurrency ", 4),
+        ],
+    )
+    def test_other_completions_go_to_click(self, words, cword, monkeypatch, capsys):
+        """Test anything but labels and ids is left to click."""
+        handled, out = complete("bash_complete", words, cword, monkeypatch, capsys)
+
+        assert not handled
+        assert out == ""
+
+    def test_global_value_options_match_cli(self):
+        """Test the fast path knows every group option that takes a value."""
+        options = {
+            opt
+            for param in cli.params
+            if isinstance(param, click.Option) and not param.is_flag
+            for opt in param.opts
+        }
+
+        assert options == set(completion.GLOBAL_VALUE_OPTIONS)
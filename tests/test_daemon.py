@@ -0,0 +1,134 @@
+"""Test daemon forwarding."""
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from sekha_cli import daemon
+
+pytestmark = pytest.mark.skipif(
+    not daemon.is_supported(), reason="Unix domain sockets not available"
+)
+
+
+@pytest.fixture
+def runtime_dir(monkeypatch):
+    """Use a short socket directory; AF_UNIX paths are length-limited."""
+    path = Path(tempfile.mkdtemp(prefix="sekha-", dir="/tmp"))
+    monkeypatch.setenv("SEKHA_RUNTIME_DIR", str(path))
+    yield path
+    shutil.rmtree(path, ignore_errors=True)
+
+
+@pytest.fixture
+def running_daemon(runtime_dir):
+    """Serve a mock client on the socket for test credentials."""
+    client = MagicMock()
+    client.base_url = "http://test.com"
+    path = daemon.socket_path("http://test.com", "sk-test")
+    server = daemon.DaemonServer(path, client)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield client
+    server.shutdown()
+    server.server_close()
+    thread.join(timeout=5)
+
+
+class TestSocketPath:
+    """Test socket naming."""
+
+    def test_depends_on_credentials(self, runtime_dir):
+        """Test different keys or controllers never share a daemon."""
+        base = daemon.socket_path("http://a", "key-1")
+
+        assert base == daemon.socket_path("http://a/", "key-1")
+        assert base != daemon.socket_path("http://a", "key-2")
+        assert base != daemon.socket_path("http://b", "key-1")
+        assert base.parent == runtime_dir / "sekha"
+
+
+class TestSocketDirectory:
+    """Test socket directories other users could tamper with are refused."""
+
+    def test_foreign_owner(self, runtime_dir, monkeypatch):
+        """Test a directory created by another user is never used."""
+        path = daemon.socket_path("http://test.com", "sk-test")
+        path.parent.mkdir(mode=0o700)
+        monkeypatch.setattr(daemon.os, "getuid", lambda: path.parent.stat().st_uid + 1)
+
+        with pytest.raises(daemon.DaemonError, match="another user"):
+            daemon.DaemonServer(path, MagicMock())
+        assert daemon.DaemonClient.connect("http://test.com", "sk-test") is None
+
+    def test_open_mode(self, running_daemon, runtime_dir):
+        """Test a directory others can write to is never trusted."""
+        path = daemon.socket_path("http://test.com", "sk-test")
+        path.parent.chmod(0o777)
+
+        assert daemon.DaemonClient.connect("http://test.com", "sk-test") is None
+        with pytest.raises(daemon.DaemonError, match="mode 777"):
+            daemon.DaemonServer(path, MagicMock())
+
+    def test_symlink(self, runtime_dir, tmp_path):
+        """Test a symlink in place of the directory is refused."""
+        path = daemon.socket_path("http://test.com", "sk-test")
+        target = tmp_path / "elsewhere"
+        target.mkdir(mode=0o700)
+        path.parent.symlink_to(target)
+
+        with pytest.raises(daemon.DaemonError, match="not a directory"):
+            daemon.DaemonServer(path, MagicMock())
+
+
+class TestDaemonClient:
+    """Test forwarding through a live socket."""
+
+    def test_connect_without_daemon(self, runtime_dir):
+        """Test connecting returns None when nothing is listening."""
+        assert daemon.DaemonClient.connect("http://test.com", "sk-test") is None
+
+    def test_forwards_calls(self, running_daemon):
+        """Test client methods run on the daemon's client."""
+        running_daemon.query.return_value = [{"id": "conv-1"}]
+        running_daemon.get_conversation.return_value = {"id": "conv-1"}
+        remote = daemon.DaemonClient.connect("http://test.com", "sk-test")
+
+        assert remote.query("hello", label="Work") == [{"id": "conv-1"}]
+        assert remote.get_conversation("conv-1", cache=None) == {"id": "conv-1"}
+        running_daemon.query.assert_called_once_with("hello", label="Work", limit=10)
+        running_daemon.get_conversation.assert_called_once_with("conv-1")
+        remote.close()
+
+    def test_labels_path_comes_from_daemon(self, running_daemon):
+        """Test the counting path the daemon's client used is reported."""
+        running_daemon.count_labels.return_value = (
+            [{"name": "Work", "count": 2}],
+            "aggregate",
+        )
+        remote = daemon.DaemonClient.connect("http://test.com", "sk-test")
+
+        assert remote.list_labels() == [{"name": "Work", "count": 2}]
+        assert remote.last_labels_path == "aggregate"
+        remote.close()
+
+    def test_errors_are_raised(self, running_daemon):
+        """Test a failing call surfaces as a DaemonError."""
+        running_daemon.archive.side_effect = RuntimeError("not found")
+        remote = daemon.DaemonClient.connect("http://test.com", "sk-test")
+
+        with pytest.raises(daemon.DaemonError, match="not found"):
+            remote.archive("conv-404")
+        remote.close()
+
+    def test_ping_and_unknown_method(self, running_daemon):
+        """Test status pings and rejection of methods outside the allow-list."""
+        remote = daemon.DaemonClient.connect("http://test.com", "sk-test")
+
+        assert remote.call("ping")["base_url"] == "http://test.com"
+        with pytest.raises(daemon.DaemonError, match="Unsupported method"):
+            remote.call("export_to", "Work")
+        remote.close()
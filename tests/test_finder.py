@@ -0,0 +1,230 @@
+"""Test the interactive finder's ranking and remote search logic."""
+from concurrent.futures import Future
+
+import pytest
+
+from sekha_cli.finder import Finder, FinderIndex, Ranking, RemoteSearch, fuzzy_score
+
+
+class ManualClock:
+    """Clock advanced by hand."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class ManualExecutor:
+    """Executor whose futures finish only when the test says so."""
+
+    def __init__(self):
+        self.calls = []
+
+    def submit(self, fn, *args):
+        future = Future()
+        self.calls.append((future, fn, args))
+        return future
+
+    def finish(self, index):
+        future, fn, args = self.calls[index]
+        if future.set_running_or_notify_cancel():
+            future.set_result(fn(*args))
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        pass
+
+
+def entry(conversation_id, label, preview):
+    return {"id": conversation_id, "label": label, "preview": preview}
+
+
+@pytest.fixture
+def index():
+    """Index a few conversations."""
+    return FinderIndex(
+        [
+            entry("a1", "Work", "token limits in long chats"),
+            entry("b2", "Home", "tomato garden notes"),
+            entry("c3", "Work", "kubernetes ingress setup"),
+        ]
+    )
+
+
+class TestFuzzyScore:
+    """Test subsequence scoring."""
+
+    def test_missing_character_does_not_match(self):
+        """Test a pattern that is not a subsequence scores None."""
+        assert fuzzy_score("xyz", "token limits") is None
+
+    def test_consecutive_and_word_start_score_higher(self):
+        """Test tight matches at word starts beat scattered ones."""
+        tight = fuzzy_score("lim", "token limits")
+        scattered = fuzzy_score("lim", "low impact mode")
+        assert tight > scattered
+
+
+class TestFinderIndex:
+    """Test ranking of the in-memory index."""
+
+    def test_rank_orders_by_score(self, index):
+        """Test the best fuzzy match comes first."""
+        assert [e["id"] for e in index.rank("tok")][0] == "a1"
+        assert [e["id"] for e in index.rank("kubing")] == ["c3"]
+
+    def test_empty_pattern_lists_in_order(self, index):
+        """Test an empty query shows entries in index order."""
+        assert [e["id"] for e in index.rank("", limit=2)] == ["a1", "b2"]
+
+    def test_narrowing_matches_full_rescan(self, index):
+        """Test extending the pattern gives the same result as a fresh rank."""
+        index.rank("to")
+        narrowed = index.rank("tom")
+        assert narrowed == FinderIndex(index.entries).rank("tom")
+        assert len(index.rank("t")) == 3
+
+    def test_ranking_in_chunks_matches_full_rank(self, index):
+        """Test chunked ranking ends where a one-shot rank does."""
+        ranking = Ranking(index, "w", 50)
+        assert not ranking.step(1)
+        assert not ranking.step(1)
+        assert ranking.step(1)
+        assert ranking.results == FinderIndex(index.entries).rank("w")
+
+    def test_narrowing_from_unfinished_ranking(self, index):
+        """Test a longer pattern reuses what an interrupted ranking skipped."""
+        ranking = Ranking(index, "to", 50)
+        ranking.step(1)
+        narrowed = Ranking(index, "tok", 50, previous=ranking)
+
+        assert list(narrowed.candidates) == [0, 1, 2]
+        narrowed.step()
+        assert [e["id"] for e in narrowed.results] == ["a1"]
+
+    def test_add_replaces_by_id(self, index):
+        """Test re-adding an id refreshes it instead of duplicating it."""
+        index.add([entry("b2", "Home", "potato garden notes")])
+        assert len(index) == 3
+        assert [e["id"] for e in index.rank("potato")] == ["b2"]
+
+
+class TestRemoteSearch:
+    """Test debouncing and dropping stale replies."""
+
+    def make(self, search=None):
+        clock = ManualClock()
+        executor = ManualExecutor()
+        remote = RemoteSearch(
+            search or (lambda q: [entry(q, "Remote", q)]),
+            debounce=0.25,
+            clock=clock,
+            executor=executor,
+        )
+        return remote, clock, executor
+
+    def test_waits_for_typing_to_pause(self):
+        """Test nothing is sent until the debounce interval passes."""
+        remote, clock, executor = self.make()
+        remote.schedule("tok")
+        clock.now = 0.1
+        remote.schedule("toke")
+        clock.now = 0.3
+        assert remote.poll() is None
+        assert executor.calls == []
+
+        clock.now = 0.4
+        remote.poll()
+        assert [args for _, _, args in executor.calls] == [("toke",)]
+        executor.finish(0)
+        query, results, error = remote.poll()
+        assert (query, error) == ("toke", None)
+        assert results[0]["id"] == "toke"
+
+    def test_stale_reply_is_dropped(self):
+        """Test a reply for an older query never reaches the UI."""
+        remote, clock, executor = self.make()
+        remote.schedule("old")
+        clock.now = 1.0
+        remote.poll()
+        remote.schedule("new")
+        executor.finish(0)
+        assert remote.poll() is None
+
+        clock.now = 2.0
+        remote.poll()
+        executor.finish(1)
+        assert remote.poll()[0] == "new"
+
+    def test_queued_request_is_cancelled(self):
+        """Test a superseded request that has not started is never run."""
+        seen = []
+        remote, clock, executor = self.make(lambda q: seen.append(q) or [])
+        remote.schedule("first")
+        clock.now = 1.0
+        remote.poll()
+        remote.schedule("second")
+        clock.now = 2.0
+        remote.poll()
+
+        assert executor.calls[0][0].cancelled()
+        executor.finish(0)
+        executor.finish(1)
+        assert seen == ["second"]
+
+    def test_error_is_reported(self):
+        """Test a failing search comes back as an error, not an exception."""
+
+        def fail(query):
+            raise RuntimeError("offline")
+
+        remote, clock, executor = self.make(fail)
+        remote.schedule("tok")
+        clock.now = 1.0
+        remote.poll()
+        future = executor.calls[0][0]
+        future.set_running_or_notify_cancel()
+        future.set_exception(RuntimeError("offline"))
+        assert str(remote.poll()[2]) == "offline"
+
+
+class TestFinder:
+    """Test the finder's keyboard state."""
+
+    def test_typing_reranks_and_resets_selection(self, index):
+        """Test each keystroke re-ranks locally."""
+        finder = Finder(index)
+        finder.move(2)
+        finder.type("g")
+        finder.type("ard")
+
+        assert finder.selected == 0
+        assert finder.choice["id"] == "b2"
+        finder.backspace()
+        assert finder.query == "gar"
+
+    def test_move_stays_in_range(self, index):
+        """Test the selection is clamped to the results."""
+        finder = Finder(index)
+        finder.move(10)
+        assert finder.selected == 2
+        finder.move(-10)
+        assert finder.selected == 0
+
+    def test_remote_hits_are_appended(self, index):
+        """Test semantic results not found locally are added and marked."""
+        remote = RemoteSearch(
+            lambda q: [entry("a1", "Work", "dup"), entry("z9", "Misc", "other")],
+            debounce=0,
+            executor=ManualExecutor(),
+        )
+        finder = Finder(index, remote)
+        finder.type("token")
+        finder.tick()
+        remote.executor.finish(0)
+
+        assert finder.tick()
+        assert [e["id"] for e in finder.results] == ["a1", "z9"]
+        assert finder.results[1]["remote"] is True
+        assert len(index) == 4
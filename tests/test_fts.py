@@ -0,0 +1,112 @@
+"""Test full-text search over the local mirror."""
+import sqlite3
+
+import pytest
+
+from sekha_cli.fts import MATCH_END, MATCH_START, highlight, match_expression
+from sekha_cli.mirror import Mirror
+
+
+def make_conv(index, label="Work", *contents):
+    """Build a conversation whose messages have the given text."""
+    return {
+        "id": f"conv-{index:03d}",
+        "label": label,
+        "created_at": f"2024-01-{index:02d}T00:00:00+00:00",
+        "messages": [{"role": "user", "content": text} for text in contents],
+    }
+
+
+@pytest.fixture
+def mirror(tmp_path):
+    """Open a mirror with a few indexed conversations."""
+    with Mirror(tmp_path / "mirror.sqlite3") as m:
+        m.apply(
+            [
+                make_conv(1, "Work", "The token limit was hit twice", "unrelated"),
+                make_conv(2, "Home", "Token budgets for the token limit"),
+                make_conv(3, "Work", "Embeddings and vector search"),
+            ]
+        )
+        yield m
+
+
+class TestMatchExpression:
+    """Test keyword to FTS5 query translation."""
+
+    def test_words_are_quoted(self):
+        """Test operators and punctuation are taken literally."""
+        assert match_expression("token OR limit!") == '"token" "OR" "limit"'
+
+    def test_prefix(self):
+        """Test a trailing star keeps prefix matching."""
+        assert match_expression("embed*") == '"embed"*'
+
+    def test_nothing_searchable(self):
+        """Test punctuation-only input is rejected."""
+        with pytest.raises(ValueError):
+            match_expression("?!")
+
+
+class TestFullTextSearch:
+    """Test ranked search and snippets."""
+
+    def test_ranked_hits_with_snippets(self, mirror):
+        """Test BM25 ranks the denser match first and marks matches."""
+        hits = mirror.full_text_search("token limit")
+
+        assert [h["id"] for h in hits] == ["conv-002", "conv-001"]
+        assert hits[0]["score"] >= hits[1]["score"]
+        assert f"{MATCH_START}token{MATCH_END}" in hits[1]["snippet"]
+        assert hits[1]["message_index"] == 0
+
+    def test_label_filter_and_prefix(self, mirror):
+        """Test label filtering and prefix queries."""
+        assert [h["id"] for h in mirror.full_text_search("token", label="Work")] == [
+            "conv-001"
+        ]
+        assert [h["id"] for h in mirror.full_text_search("embed*")] == ["conv-003"]
+
+    def test_label_filter_before_limit(self, tmp_path):
+        """Test a label whose matches rank below many others is still found."""
+        with Mirror(tmp_path / "mirror.sqlite3") as m:
+            m.apply([make_conv(i, "Work", "token token") for i in range(1, 301)])
+            m.apply([make_conv(301, "Rare", "a long message that mentions token once")])
+
+            hits = m.full_text_search("token", label="Rare", limit=5)
+
+        assert [h["id"] for h in hits] == ["conv-301"]
+
+    def test_index_follows_resync(self, mirror):
+        """Test re-synced and removed messages leave the index."""
+        mirror.apply([make_conv(1, "Work", "nothing to see")])
+        mirror.begin(full=True)
+        mirror.apply([make_conv(1, "Work", "nothing to see")])
+        mirror.finish(None)
+
+        assert mirror.full_text_search("token") == []
+        assert [h["id"] for h in mirror.full_text_search("nothing")] == ["conv-001"]
+
+    def test_raw_queries(self, mirror):
+        """Test raw FTS5 syntax and its errors."""
+        hits = mirror.full_text_search('"vector search" OR twice', raw=True)
+        assert {h["id"] for h in hits} == {"conv-001", "conv-003"}
+        with pytest.raises(sqlite3.OperationalError):
+            mirror.full_text_search('"unbalanced', raw=True)
+
+    def test_existing_mirror_is_indexed_on_open(self, tmp_path):
+        """Test a mirror created before the index gets indexed on open."""
+        path = tmp_path / "old.sqlite3"
+        with Mirror(path) as m:
+            m.conn.executescript(
+                "DROP TRIGGER messages_fts_insert; DROP TRIGGER messages_fts_delete; "
+                "DROP TRIGGER messages_fts_update; DROP TABLE messages_fts;"
+            )
+            m.apply([make_conv(4, "Work", "legacy message")])
+
+        with Mirror(path) as m:
+            assert [h["id"] for h in m.full_text_search("legacy")] == ["conv-004"]
+
+    def test_highlight(self):
+        """Test match markers are replaced."""
+        assert highlight(f"a {MATCH_START}b{MATCH_END}", "<", ">") == "a <b>"
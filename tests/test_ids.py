@@ -0,0 +1,110 @@
+"""Test the conversation id prefix index."""
+import random
+
+import pytest
+
+from sekha_cli import ids as ids_module
+from sekha_cli.ids import IdIndex
+
+
+@pytest.fixture
+def index(tmp_path):
+    """Index holding a few ids that share prefixes."""
+    idx = IdIndex(tmp_path / "ids.idx")
+    idx.add(["3f2a9c1e-aaaa", "3f2a9c1e-bbbb", "3f2b0000-cccc", "77b04d2a-dddd"])
+    return idx
+
+
+def stored(index):
+    """Every id in file order."""
+    with index._mapped() as records:
+        return [records[i].decode("utf-8") for i in range(len(records))]
+
+
+class TestIdIndex:
+    """Test prefix lookups and updates."""
+
+    def test_unique_prefix(self, index):
+        """Test a prefix of one id returns just that id."""
+        assert index.lookup("77") == (["77b04d2a-dddd"], 1)
+        assert index.lookup("3f2b") == (["3f2b0000-cccc"], 1)
+
+    def test_ambiguous_prefix_counts_all(self, index):
+        """Test an ambiguous prefix returns candidates and the full count."""
+        assert index.lookup("3f2a") == (["3f2a9c1e-aaaa", "3f2a9c1e-bbbb"], 2)
+        assert index.lookup("3f", limit=1) == (["3f2a9c1e-aaaa"], 3)
+
+    def test_unknown_prefix(self, index):
+        """Test a prefix nothing starts with finds nothing."""
+        assert index.lookup("ff") == ([], 0)
+        assert index.lookup("3f2a9c1e-aaaa-more") == ([], 0)
+
+    def test_missing_or_corrupt_file_is_empty(self, tmp_path):
+        """Test unreadable index files read as empty and get rebuilt."""
+        path = tmp_path / "ids.idx"
+        assert IdIndex(path).lookup("a") == ([], 0)
+        path.write_bytes(b"junk")
+        assert len(IdIndex(path)) == 0
+
+        assert IdIndex(path).add(["abc"]) == 1
+        assert IdIndex(path).lookup("a") == (["abc"], 1)
+
+    def test_add_only_writes_new_ids(self, index):
+        """Test re-adding known ids leaves the files alone."""
+        before = index.log_path.stat().st_mtime_ns
+
+        assert index.add(["77b04d2a-dddd", "3f2a9c1e-aaaa"]) == 0
+        assert index.log_path.stat().st_mtime_ns == before
+        assert not index.path.exists()
+
+    def test_small_adds_append_to_log(self, index):
+        """Test a few new ids are appended without rewriting the sorted index."""
+        index._merge(set(index._logged()))
+        before = index.path.stat().st_mtime_ns
+
+        assert index.add(["3f2a0000-eeee"]) == 1
+        assert index.path.stat().st_mtime_ns == before
+        assert index.log_path.read_bytes() == b"3f2a0000-eeee\n"
+        assert index.lookup("3f2a") == (
+            ["3f2a0000-eeee", "3f2a9c1e-aaaa", "3f2a9c1e-bbbb"],
+            3,
+        )
+        assert len(index) == 5
+
+    def test_full_log_is_merged(self, index, monkeypatch):
+        """Test the log is folded into the sorted records once it fills up."""
+        monkeypatch.setattr(ids_module, "MERGE_AFTER", 5)
+
+        assert index.add(["0000-ffff"]) == 1
+
+        assert not index.log_path.exists()
+        assert stored(index) == [
+            "0000-ffff",
+            "3f2a9c1e-aaaa",
+            "3f2a9c1e-bbbb",
+            "3f2b0000-cccc",
+            "77b04d2a-dddd",
+        ]
+
+    def test_spliced_adds_stay_sorted(self, tmp_path, monkeypatch):
+        """Test many small merges give the same file as one sorted write."""
+        monkeypatch.setattr(ids_module, "MERGE_AFTER", 1)
+        rng = random.Random(0)
+        ids = [f"{rng.getrandbits(64):016x}" for _ in range(500)]
+        index = IdIndex(tmp_path / "ids.idx")
+        for start in range(0, len(ids), 37):
+            index.add(ids[start : start + 37])
+
+        assert stored(index) == sorted(ids)
+
+    def test_longer_ids_widen_records(self, index, monkeypatch):
+        """Test an id longer than the current records re-pads the index."""
+        index._merge(set(index._logged()))
+        monkeypatch.setattr(ids_module, "MERGE_AFTER", 1)
+        index.add(["3f2a9c1e-aaaa-with-a-longer-tail"])
+
+        assert index.lookup("3f2a9c1e-aaaa") == (
+            ["3f2a9c1e-aaaa", "3f2a9c1e-aaaa-with-a-longer-tail"],
+            2,
+        )
+        assert stored(index)[-1] == "77b04d2a-dddd"
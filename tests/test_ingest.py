@@ -0,0 +1,183 @@
+"""Test bulk import helpers."""
+import json
+
+import pytest
+
+from sekha_cli.ingest import (
+    ImportJournal,
+    ImportSummary,
+    content_hash,
+    default_journal_path,
+    iter_import_items,
+    prepare_item,
+)
+
+
+def write_conversation(path, content="Hello", **extra):
+    """Write a single-conversation JSON file."""
+    data = {"messages": [{"role": "user", "content": content}], **extra}
+    path.write_text(json.dumps(data))
+    return path
+
+
+@pytest.fixture
+def archive(tmp_path):
+    """Create a small archive of JSON and JSONL inputs."""
+    (tmp_path / "nested").mkdir()
+    write_conversation(tmp_path / "a.json", "first")
+    write_conversation(tmp_path / "nested" / "b.json", "second")
+    (tmp_path / "batch.jsonl").write_text(
+        json.dumps({"messages": [{"role": "user", "content": "third"}]})
+        + "\n\n"
+        + json.dumps({"messages": [{"role": "user", "content": "fourth"}]})
+        + "\n"
+    )
+    (tmp_path / "notes.txt").write_text("ignored")
+    return tmp_path
+
+
+class TestIterImportItems:
+    """Test expanding import sources."""
+
+    def test_directory_is_recursive(self, archive):
+        """Test a directory yields JSON files and JSONL lines, skipping others."""
+        sources = [item.source for item in iter_import_items(str(archive))]
+
+        assert sources == [
+            str(archive / "a.json"),
+            f"{archive / 'batch.jsonl'}:1",
+            f"{archive / 'batch.jsonl'}:3",
+            str(archive / "nested" / "b.json"),
+        ]
+
+    def test_glob(self, archive):
+        """Test glob patterns are expanded."""
+        items = list(iter_import_items(str(archive / "**" / "*.json")))
+
+        assert [item.load()["messages"][0]["content"] for item in items] == [
+            "first",
+            "second",
+        ]
+
+    def test_missing_source(self, tmp_path):
+        """Test a missing path raises."""
+        with pytest.raises(FileNotFoundError):
+            list(iter_import_items(str(tmp_path / "missing.json")))
+
+
+class TestPrepareItem:
+    """Test preparing a single item for storage."""
+
+    def test_record_label_wins(self, archive):
+        """Test a label inside the record overrides the default label."""
+        path = write_conversation(archive / "labelled.json", label="Inline")
+        item = next(iter_import_items(str(path)))
+
+        messages, label = prepare_item(item, "Default")
+
+        assert messages == [{"role": "user", "content": "Hello"}]
+        assert label == "Inline"
+        assert item.digest == content_hash(messages, "Inline")
+
+    def test_requires_a_label(self, archive):
+        """Test records without any label are rejected."""
+        item = next(iter_import_items(str(archive / "a.json")))
+
+        with pytest.raises(ValueError, match="No label"):
+            prepare_item(item, None)
+
+    def test_retry_file(self, archive, tmp_path):
+        """Test failed inputs are written back out as importable JSONL."""
+        item = next(iter_import_items(str(archive / "a.json")))
+        item.load()
+        summary = ImportSummary()
+        summary.record(item, None, RuntimeError("timeout"))
+
+        retry = tmp_path / "retry.jsonl"
+        summary.write_retry_file(retry)
+
+        record = json.loads(retry.read_text())
+        assert record["messages"][0]["content"] == "first"
+        assert record["_error"] == "timeout"
+        assert summary.stored == 0
+
+    def test_retry_file_keeps_unparseable_text(self, tmp_path):
+        """Test inputs that fail to parse are written with their original text."""
+        source = tmp_path / "batch.jsonl"
+        source.write_text('{"messages": [oops\n')
+        item = next(iter_import_items(str(source)))
+        summary = ImportSummary()
+        with pytest.raises(ValueError) as error:
+            prepare_item(item, "Work")
+        summary.record(item, None, error.value)
+
+        retry = tmp_path / "retry.jsonl"
+        summary.write_retry_file(retry)
+
+        record = json.loads(retry.read_text())
+        assert record["_raw"] == '{"messages": [oops'
+        assert record["_source"] == f"{source}:1"
+
+
+class TestImportJournal:
+    """Test checkpointing and resume."""
+
+    def test_content_hash_ignores_key_order(self):
+        """Test equal conversations hash equally regardless of key order."""
+        a = content_hash([{"role": "user", "content": "hi"}], "Work")
+        b = content_hash([{"content": "hi", "role": "user"}], "Work")
+
+        assert a == b
+        assert a != content_hash([{"role": "user", "content": "hi"}], "Home")
+
+    def test_resume_skips_journaled_items(self, archive, tmp_path):
+        """Test a resumed run does not store content already in the journal."""
+        journal_path = tmp_path / "state" / "journal"
+        first = ImportJournal(journal_path)
+        item = next(iter_import_items(str(archive / "a.json")))
+        assert prepare_item(item, "Work", first) is not None
+        first.add(item.digest, "conv-1")
+        first.close()
+
+        resumed = ImportJournal(journal_path, resume=True)
+        again = next(iter_import_items(str(archive / "a.json")))
+
+        assert prepare_item(again, "Work", resumed) is None
+        resumed.close()
+
+    def test_fresh_run_truncates_journal(self, tmp_path):
+        """Test starting without --resume begins a new journal."""
+        journal_path = tmp_path / "journal"
+        journal_path.write_text("abc conv-1\n")
+
+        journal = ImportJournal(journal_path)
+        journal.close()
+
+        assert "abc" not in journal
+        assert journal_path.read_text() == ""
+
+    def test_unfinished_until_marked_complete(self, tmp_path):
+        """Test only an import that ran to the end leaves a finished journal."""
+        journal_path = tmp_path / "journal"
+        assert not ImportJournal.unfinished(journal_path)
+
+        journal = ImportJournal(journal_path)
+        journal.add("abc", "conv-1")
+        assert ImportJournal.unfinished(journal_path)
+
+        journal.finish()
+        journal.close()
+        assert not ImportJournal.unfinished(journal_path)
+        resumed = ImportJournal(journal_path, resume=True)
+        assert "abc" in resumed
+        resumed.close()
+
+    def test_default_path_per_input(self, archive, tmp_path):
+        """Test each import source gets its own journal."""
+        state = tmp_path / "state"
+        a = default_journal_path(state, str(archive / "a.json"))
+
+        nested = archive / "nested" / ".." / "a.json"
+        assert a == default_journal_path(state, str(nested))
+        assert a != default_journal_path(state, str(archive / "batch.jsonl"))
+        assert a.parent == state
@@ -0,0 +1,69 @@
+"""Test the streaming Markdown renderer."""
+import pytest
+
+from sekha_cli.markdown import WRITE_BATCH, MarkdownRenderer, MarkdownTemplate
+
+CONVERSATION = {
+    "id": "conv-1",
+    "label": "Project:AI",
+    "created_at": "2024-01-01",
+    "messages": [
+        {"role": "user", "content": "Hello"},
+        {"role": "assistant", "content": "Hi there"},
+    ],
+}
+
+
+class TestMarkdownRenderer:
+    """Test rendering and templates."""
+
+    def test_default_layout(self):
+        """Test the default template's exact output."""
+        assert MarkdownRenderer().render(CONVERSATION) == (
+            "# Project:AI\n"
+            "**Created:** 2024-01-01\n"
+            "**ID:** conv-1\n\n"
+            "**User:** Hello\n\n"
+            "**Assistant:** Hi there\n\n"
+            "---\n\n"
+        )
+
+    def test_long_conversations_are_written_in_batches(self):
+        """Test output reaches the writer before the conversation is done."""
+        conv = {"messages": [{"role": "user", "content": "x"}] * WRITE_BATCH}
+        chunks = []
+
+        MarkdownRenderer().write(conv, chunks.append)
+
+        assert len(chunks) > 1
+        assert "".join(chunks).count("**User:** x") == WRITE_BATCH
+
+    def test_template_from_json(self, tmp_path):
+        """Test header fields, role format and truncation are configurable."""
+        path = tmp_path / "template.json"
+        path.write_text(
+            '{"header": {"When": "created_at"}, "role_format": "_{role}_ ",'
+            ' "truncate": 2, "separator": ""}'
+        )
+
+        rendered = MarkdownRenderer(MarkdownTemplate.load(path)).render(CONVERSATION)
+
+        assert rendered == (
+            "# Project:AI\n**When:** 2024-01-01\n\n"
+            "_User_ He...\n\n_Assistant_ Hi...\n\n"
+        )
+
+    def test_unknown_template_keys(self):
+        """Test typos in template files are reported."""
+        with pytest.raises(ValueError, match="Unknown template keys: colour"):
+            MarkdownTemplate.from_dict({"colour": "red"})
+
+    def test_bad_role_format_field(self, tmp_path):
+        """Test an unknown role_format placeholder is reported at load time."""
+        path = tmp_path / "template.json"
+        path.write_text('{"role_format": "**{speaker}:** "}')
+
+        with pytest.raises(
+            ValueError, match=r"template.json: Unknown field \{speaker\}"
+        ):
+            MarkdownTemplate.load(path)
@@ -0,0 +1,160 @@
+"""Test controller request metrics and their file exporters."""
+import json
+
+import pytest
+
+from sekha_cli.metrics import (
+    DURATION_BUCKETS,
+    Histogram,
+    MeteredController,
+    MetricsRegistry,
+    detect_format,
+    parse_prometheus,
+    registry,
+    start_periodic_flush,
+)
+
+
+@pytest.fixture
+def active_registry():
+    """Enable the shared registry for one test."""
+    registry.enable()
+    yield registry
+    registry.disable()
+
+
+class TestHistogram:
+    """Test latency bucketing."""
+
+    def test_observations_land_in_first_matching_bucket(self):
+        """Test bucket boundaries are inclusive upper bounds."""
+        histogram = Histogram()
+
+        histogram.observe(0.005)
+        histogram.observe(0.3)
+        histogram.observe(60)
+
+        assert histogram.counts[0] == 1
+        assert histogram.counts[DURATION_BUCKETS.index(0.5)] == 1
+        assert histogram.counts[-1] == 1
+        assert histogram.count == 3
+        assert histogram.sum == pytest.approx(60.305)
+
+
+class TestPrometheusExport:
+    """Test the textfile-collector exporter."""
+
+    def test_flush_writes_counters_and_histograms(self, tmp_path):
+        """Test the textfile holds typed counter and histogram series."""
+        metrics = MetricsRegistry()
+        metrics.observe("query", 0.02)
+        metrics.observe("query", 0.2, ok=False)
+        path = tmp_path / "sekha.prom"
+
+        assert metrics.flush(path)
+        text = path.read_text(encoding="utf-8")
+
+        assert "# TYPE sekha_client_requests_total counter" in text
+        assert "# TYPE sekha_client_request_duration_seconds histogram" in text
+        samples = parse_prometheus(text)
+        ok = (
+            "sekha_client_requests_total",
+            (("operation", "query"), ("outcome", "ok")),
+        )
+        assert samples[ok] == 1
+        bucket = "sekha_client_request_duration_seconds_bucket"
+        assert samples[(bucket, (("operation", "query"), ("le", "0.025")))] == 1
+        assert samples[(bucket, (("operation", "query"), ("le", "+Inf")))] == 2
+        assert not (tmp_path / "sekha.prom.tmp").exists()
+
+    def test_flushes_accumulate_across_runs(self, tmp_path):
+        """Test a second run adds to the counters already in the file."""
+        path = tmp_path / "sekha.prom"
+        for _ in range(2):
+            metrics = MetricsRegistry()
+            metrics.observe("get", 0.01)
+            metrics.flush(path)
+
+        samples = parse_prometheus(path.read_text(encoding="utf-8"))
+
+        count = ("sekha_client_request_duration_seconds_count", (("operation", "get"),))
+        assert samples[count] == 2
+        ok = ("sekha_client_requests_total", (("operation", "get"), ("outcome", "ok")))
+        assert samples[ok] == 2
+
+    def test_flush_without_requests_leaves_file_alone(self, tmp_path):
+        """Test nothing is written when nothing was recorded."""
+        path = tmp_path / "sekha.prom"
+
+        assert not MetricsRegistry().flush(path)
+        assert not path.exists()
+
+
+class TestOtlpExport:
+    """Test the OTLP/JSON file exporter."""
+
+    def test_flush_appends_delta_documents(self, tmp_path):
+        """Test each flush appends one delta-temporality document."""
+        metrics = MetricsRegistry()
+        path = tmp_path / "sekha.jsonl"
+        metrics.observe("search_page", 0.05)
+        metrics.flush(path)
+        metrics.observe("search_page", 0.05)
+        metrics.observe("create", 1.5, ok=False)
+        metrics.flush(path)
+
+        lines = path.read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 2
+        scope = json.loads(lines[1])["resourceMetrics"][0]["scopeMetrics"][0]
+        requests, duration = scope["metrics"]
+        assert requests["sum"]["aggregationTemporality"] == 1
+        points = {
+            tuple(a["value"]["stringValue"] for a in p["attributes"]): p["asInt"]
+            for p in requests["sum"]["dataPoints"]
+        }
+        assert points == {("create", "error"): "1", ("search_page", "ok"): "1"}
+        (create, page) = duration["histogram"]["dataPoints"]
+        assert len(create["bucketCounts"]) == len(create["explicitBounds"]) + 1
+        assert page["count"] == "1"
+
+    def test_detect_format(self, tmp_path):
+        """Test the extension picks the exporter."""
+        assert detect_format(tmp_path / "a.prom") == "prometheus"
+        assert detect_format(tmp_path / "a.json") == "otlp"
+        assert detect_format(tmp_path / "a.metrics") == "prometheus"
+
+
+class TestMeteredController:
+    """Test the SDK proxy."""
+
+    class Controller:
+        def search(self, query, limit=10):
+            return []
+
+        def get(self, conversation_id):
+            raise RuntimeError("503 Service Unavailable")
+
+    def test_calls_recorded_by_operation(self, active_registry):
+        """Test searches, page fetches and failures are told apart."""
+        controller = MeteredController(self.Controller())
+
+        controller.search("tokens")
+        controller.search("", limit=100)
+        with pytest.raises(RuntimeError):
+            controller.get("conv-1")
+
+        assert active_registry.requests == {
+            ("query", "ok"): 1,
+            ("search_page", "ok"): 1,
+            ("get", "error"): 1,
+        }
+
+    def test_periodic_flush_stops_with_final_flush(self, active_registry, tmp_path):
+        """Test stopping the flusher writes what is left."""
+        path = tmp_path / "daemon.prom"
+        stop = start_periodic_flush(path, interval=3600)
+
+        active_registry.observe("archive", 0.01)
+        stop()
+
+        assert "archive" in path.read_text(encoding="utf-8")
@@ -0,0 +1,125 @@
+"""Test the local SQLite mirror."""
+import pytest
+
+from sekha_cli.mirror import Mirror, mirror_path
+
+
+def make_conv(index, label="Work", updated_at=None, **extra):
+    """Build a conversation with two messages."""
+    conv = {
+        "id": f"conv-{index:03d}",
+        "label": label,
+        "created_at": f"2024-01-{index % 28 + 1:02d}T00:00:00+00:00",
+        "messages": [
+            {"role": "user", "content": f"question {index} about tokens"},
+            {"role": "assistant", "content": f"answer {index}", "model": "m1"},
+        ],
+    }
+    if updated_at:
+        conv["updated_at"] = updated_at
+    conv.update(extra)
+    return conv
+
+
+@pytest.fixture
+def mirror(tmp_path):
+    """Open an empty mirror."""
+    with Mirror(tmp_path / "mirror.sqlite3") as m:
+        yield m
+
+
+class TestMirror:
+    """Test storing and reading mirrored conversations."""
+
+    def test_round_trip_keeps_messages_and_extra_fields(self, mirror):
+        """Test a mirrored conversation reads back unchanged."""
+        conv = make_conv(1, status="active")
+        mirror.apply([conv])
+
+        assert mirror.get("conv-001") == conv
+        assert mirror.get("missing") is None
+
+    def test_apply_replaces_messages(self, mirror):
+        """Test re-syncing a conversation replaces its messages."""
+        mirror.apply([make_conv(1)])
+        changed = make_conv(1)
+        changed["messages"] = [{"role": "user", "content": "edited"}]
+        mirror.apply([changed])
+
+        assert mirror.get("conv-001")["messages"] == changed["messages"]
+        assert mirror.stats()["messages"] == 1
+
+    def test_page_orders_by_creation_and_filters_label(self, mirror):
+        """Test pages come back in creation order for one label."""
+        mirror.apply([make_conv(3), make_conv(1), make_conv(2, label="Home")])
+
+        page = mirror.page("Work", 0, 10)
+
+        assert [c["id"] for c in page] == ["conv-001", "conv-003"]
+        assert mirror.page(None, 1, 1)[0]["id"] == "conv-002"
+        assert mirror.page(None, 0, 1, fields=["id", "label"]) == [
+            {"id": "conv-001", "label": "Work"}
+        ]
+
+    def test_search_requires_every_word(self, mirror):
+        """Test keyword search matches words across label and messages."""
+        mirror.apply([make_conv(1), make_conv(2, label="Home"), make_conv(3)])
+
+        results = mirror.search("answer 3")
+        assert [r["id"] for r in results] == ["conv-003"]
+        assert results[0]["preview"] == "question 3 about tokens"
+        assert [r["id"] for r in mirror.search("tokens", label="Home")] == [
+            "conv-002"
+        ]
+        assert mirror.search("50%") == []
+
+    def test_entries_newest_first(self, mirror):
+        """Test finder entries carry id, label and preview, newest first."""
+        mirror.apply([make_conv(1), make_conv(2, label="Home"), make_conv(3)])
+
+        assert [e["id"] for e in mirror.entries()] == [
+            "conv-003",
+            "conv-002",
+            "conv-001",
+        ]
+        (entry,) = mirror.entries(label="Home")
+        assert entry["preview"] == "question 2 about tokens"
+
+    def test_ids(self, mirror):
+        """Test every mirrored id is listed for the prefix index."""
+        mirror.apply([make_conv(1), make_conv(2)])
+
+        assert sorted(mirror.ids()) == ["conv-001", "conv-002"]
+
+    def test_label_counts(self, mirror):
+        """Test labels are counted from the mirror."""
+        mirror.apply([make_conv(1), make_conv(2), make_conv(3, label="Home")])
+
+        assert mirror.label_counts() == {"Work": 2, "Home": 1}
+
+    def test_full_sync_drops_unseen_conversations(self, mirror):
+        """Test a full sync removes conversations it did not see."""
+        mirror.apply([make_conv(1), make_conv(2)])
+        mirror.finish("2024-01-03T00:00:00+00:00")
+
+        mirror.begin(full=True)
+        mirror.apply([make_conv(2)])
+        removed = mirror.finish(None)
+
+        assert removed == 1
+        assert mirror.get("conv-001") is None
+        assert mirror.stats()["messages"] == 2
+
+    def test_watermark_never_moves_back(self, mirror):
+        """Test an older watermark is ignored."""
+        mirror.finish("2024-02-01T00:00:00+00:00")
+        mirror.finish("2024-01-01T00:00:00Z")
+
+        assert mirror.watermark == "2024-02-01T00:00:00+00:00"
+        assert mirror.last_sync is not None
+
+    def test_mirror_path_per_controller(self, tmp_path):
+        """Test each controller URL gets its own database."""
+        a = mirror_path(tmp_path, "http://a:8080/")
+        assert a == mirror_path(tmp_path, "http://a:8080")
+        assert a != mirror_path(tmp_path, "http://b:8080")
@@ -0,0 +1,136 @@
+"""Test streaming record writers."""
+import gzip
+import io
+import json
+
+import pytest
+
+from sekha_cli.output import (
+    OutputFile,
+    detect_compression,
+    iter_records,
+    parse_size,
+    record_writer,
+)
+
+
+def write_all(format, records):
+    """Write records with a fresh writer and return the output."""
+    stream = io.StringIO()
+    writer = record_writer(format, stream)
+    writer.begin()
+    for record in records:
+        writer.write(record)
+    writer.end()
+    return stream.getvalue()
+
+
+class TestRecordWriters:
+    """Test JSON and JSON Lines writers."""
+
+    def test_json_array_is_compact_and_valid(self):
+        """Test the JSON writer emits one compact record per line."""
+        output = write_all("json", [{"id": "a", "n": 1}, {"id": "b"}])
+
+        assert output == '[\n{"id":"a","n":1},\n{"id":"b"}\n]\n'
+        assert json.loads(output)[1] == {"id": "b"}
+
+    def test_empty_json_array(self):
+        """Test an empty result is still a valid document."""
+        assert json.loads(write_all("json", [])) == []
+
+    def test_jsonl(self):
+        """Test JSON Lines keeps non-ASCII text readable."""
+        output = write_all("jsonl", [{"text": "café"}, {"text": "b"}])
+
+        assert output == '{"text":"café"}\n{"text":"b"}\n'
+
+    def test_unknown_format(self):
+        """Test unsupported formats are rejected."""
+        with pytest.raises(ValueError, match="Unsupported format"):
+            record_writer("xml", io.StringIO())
+
+
+class TestOutputFile:
+    """Test buffered, compressed and chunked output files."""
+
+    def test_gzip_round_trip(self, tmp_path):
+        """Test gzip output decompresses to what was written."""
+        path = tmp_path / "out.jsonl.gz"
+        with OutputFile(path, compress="gzip", buffer_size=16) as f:
+            write_records = record_writer("jsonl", f)
+            write_records.begin()
+            for i in range(100):
+                write_records.write({"id": i})
+            write_records.end()
+
+        lines = gzip.decompress(path.read_bytes()).decode("utf-8").splitlines()
+        assert [json.loads(line)["id"] for line in lines] == list(range(100))
+
+    def test_split_rotates_at_record_boundaries(self, tmp_path):
+        """Test each chunk is a complete JSON document."""
+        path = tmp_path / "out.json"
+        with OutputFile(path, split_size=40) as f:
+            writer = record_writer("json", f)
+            writer.begin()
+            for i in range(10):
+                writer.write({"id": i, "pad": "xxxxxxxx"})
+            writer.end()
+
+        assert len(f.paths) > 1
+        assert f.paths[0].name == "out-00001.json"
+        ids = [r["id"] for p in f.paths for r in json.loads(p.read_text())]
+        assert ids == list(range(10))
+
+    def test_zstd_round_trip(self, tmp_path):
+        """Test zstd output when the optional package is installed."""
+        zstandard = pytest.importorskip("zstandard")
+        path = tmp_path / "out.md.zst"
+        with OutputFile(path, compress="zstd") as f:
+            f.write("# Work\n")
+
+        with zstandard.open(path, "rt") as f:
+            assert f.read() == "# Work\n"
+
+    def test_parse_size(self):
+        """Test human-readable sizes."""
+        assert parse_size("1024") == 1024
+        assert parse_size("500M") == 500 * 1024**2
+        assert parse_size("2GB") == 2 * 1024**3
+        with pytest.raises(ValueError):
+            parse_size("lots")
+
+
+class TestIterRecords:
+    """Test reading exports back."""
+
+    RECORDS = [{"id": "a", "n": 1}, {"id": "b", "n": 2}]
+
+    @pytest.mark.parametrize("name", ["out.json", "out.jsonl", "out.jsonl.gz"])
+    def test_round_trip(self, tmp_path, name):
+        """Test records written by the writers read back unchanged."""
+        path = tmp_path / name
+        format = "json" if name.endswith(".json") else "jsonl"
+        with OutputFile(path, compress=detect_compression(path)) as f:
+            writer = record_writer(format, f)
+            writer.begin()
+            for record in self.RECORDS:
+                writer.write(record)
+            writer.end()
+
+        assert list(iter_records(path)) == self.RECORDS
+
+    def test_pretty_json(self, tmp_path):
+        """Test an indented JSON array is loaded whole."""
+        path = tmp_path / "pretty.json"
+        path.write_text(json.dumps(self.RECORDS, indent=2), encoding="utf-8")
+
+        assert list(iter_records(path)) == self.RECORDS
+
+    def test_rejects_markdown(self, tmp_path):
+        """Test only json and jsonl exports can be read."""
+        path = tmp_path / "export.md"
+        path.write_text("# Work\n", encoding="utf-8")
+
+        with pytest.raises(ValueError):
+            list(iter_records(path))
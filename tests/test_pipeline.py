@@ -0,0 +1,150 @@
+"""Test concurrency helpers."""
+import threading
+import time
+
+from sekha_cli.pipeline import prefetch_pages, run_bounded
+
+
+def make_fetcher(total, delays=None, cap=None):
+    """Build a page fetcher over ``total`` synthetic conversations.
+
+    ``cap`` limits rows per page the way a server with a maximum page size does.
+    """
+    state = {"in_flight": 0, "max_in_flight": 0, "offsets": []}
+    lock = threading.Lock()
+
+    def fetch(offset, limit):
+        with lock:
+            state["in_flight"] += 1
+            state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+            state["offsets"].append(offset)
+        if delays:
+            time.sleep(delays.get(offset, 0))
+        with lock:
+            state["in_flight"] -= 1
+        limit = min(limit, cap or limit)
+        return [{"id": str(i)} for i in range(offset, min(offset + limit, total))]
+
+    return fetch, state
+
+
+class TestPrefetchPages:
+    """Test ordered page prefetching."""
+
+    def test_sequential(self):
+        """Test single-request paging confirms a short page is the last one."""
+        fetch, state = make_fetcher(25)
+
+        pages = list(prefetch_pages(fetch, page_size=10))
+
+        assert [len(p) for p in pages] == [10, 10, 5]
+        assert state["offsets"] == [0, 10, 20, 25]
+
+    def test_server_page_cap(self):
+        """Test a server capping pages below page_size is paged to the end."""
+        fetch, state = make_fetcher(23, cap=4)
+
+        pages = list(prefetch_pages(fetch, page_size=10))
+
+        assert [len(p) for p in pages] == [4, 4, 4, 4, 4, 3]
+        assert state["offsets"] == [0, 4, 8, 12, 16, 20]
+
+    def test_concurrent_short_last_page_probes_once(self):
+        """Test a short last page ends with one probe, not a new fan-out."""
+        fetch, state = make_fetcher(25)
+
+        pages = list(prefetch_pages(fetch, page_size=10, concurrency=3))
+
+        assert [len(p) for p in pages] == [10, 10, 5]
+        past_end = [offset for offset in state["offsets"] if offset >= 25]
+        # Only requests already in flight at 30 and 40, plus the probe at 25.
+        assert past_end.count(25) == 1
+        assert set(past_end) <= {25, 30, 40}
+
+    def test_concurrent_short_probe_ends_iteration(self):
+        """Test an empty probe after a short first page stops without fan-out."""
+        fetch, state = make_fetcher(10)
+
+        pages = list(prefetch_pages(fetch, page_size=500, concurrency=4))
+
+        assert [len(p) for p in pages] == [10]
+        assert sorted(state["offsets"]) == [0, 10, 500, 1000]
+
+    def test_offset_ignored(self):
+        """Test a fetcher returning the same page for every offset stops."""
+        page = [{"id": "a"}, {"id": "b"}]
+
+        pages = list(prefetch_pages(lambda offset, limit: page, page_size=10))
+
+        assert pages == [page]
+
+    def test_concurrent_server_page_cap(self):
+        """Test prefetches spaced by page_size are re-issued at the server's cap."""
+        fetch, _ = make_fetcher(47, cap=4)
+
+        pages = list(prefetch_pages(fetch, page_size=10, concurrency=3))
+
+        ids = [c["id"] for page in pages for c in page]
+        assert ids == [str(i) for i in range(47)]
+
+    def test_concurrent_preserves_order(self):
+        """Test pages come back in offset order even when early pages are slow."""
+        fetch, state = make_fetcher(50, delays={0: 0.05, 10: 0.02})
+
+        pages = list(prefetch_pages(fetch, page_size=10, concurrency=4))
+
+        ids = [c["id"] for page in pages for c in page]
+        assert ids == [str(i) for i in range(50)]
+        assert state["max_in_flight"] > 1
+
+    def test_in_flight_bounded_by_concurrency(self):
+        """Test a slow consumer never lets more than N requests be outstanding."""
+        fetch, state = make_fetcher(200)
+
+        pages = prefetch_pages(fetch, page_size=10, concurrency=3)
+        for consumed, _ in enumerate(pages):
+            time.sleep(0.005)
+            assert len(state["offsets"]) <= consumed + 1 + 3
+
+        assert state["max_in_flight"] <= 3
+
+    def test_exact_multiple_ends_on_empty_page(self):
+        """Test a result count that is a multiple of the page size terminates."""
+        fetch, _ = make_fetcher(20)
+
+        pages = list(prefetch_pages(fetch, page_size=10, concurrency=2))
+
+        assert [len(p) for p in pages] == [10, 10]
+
+
+class TestRunBounded:
+    """Test the bounded worker pool."""
+
+    def test_collects_results_and_errors(self):
+        """Test every item is reported, with failures as errors."""
+
+        def work(n):
+            if n == 3:
+                raise ValueError("bad item")
+            return n * 2
+
+        outcomes = sorted(
+            run_bounded(work, range(6), concurrency=3), key=lambda o: o[0]
+        )
+
+        assert [o[1] for o in outcomes if o[2] is None] == [0, 2, 4, 8, 10]
+        assert str(outcomes[3][2]) == "bad item"
+
+    def test_pulls_input_lazily(self):
+        """Test the input stream is not drained ahead of the worker window."""
+        pulled = []
+
+        def source():
+            for n in range(100):
+                pulled.append(n)
+                yield n
+
+        outcomes = run_bounded(lambda n: n, source(), concurrency=2)
+        next(outcomes)
+
+        assert len(pulled) <= 5
@@ -0,0 +1,82 @@
+"""Test CLI startup cost stays within budget."""
+import os
+import subprocess
+import sys
+
+# Modules that must only be imported by the commands that need them.
+HEAVY_MODULES = ("sekha", "rich", "yaml")
+
+# Generous cumulative import budget for ``sekha_cli.main`` so slow CI runners
+# pass, while still catching an eager import of the SDK or rich.
+IMPORT_BUDGET_US = 250_000
+
+
+def import_profile(code, env=None):
+    """Run ``code`` under ``-X importtime`` and return cumulative us per module."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=env,
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        if cumulative.strip().isdigit():
+            modules[name.strip()] = int(cumulative)
+    return modules
+
+
+def heavy_imports(modules):
+    """Return imported modules that belong to a heavy top-level package."""
+    return sorted(
+        name for name in modules if name.split(".")[0] in HEAVY_MODULES
+    )
+
+
+class TestStartup:
+    """Test import-time behaviour of the entry point."""
+
+    def test_import_skips_heavy_dependencies(self):
+        """Test importing the entry point does not pull in the SDK, rich or yaml."""
+        modules = import_profile("import sekha_cli.main")
+
+        assert heavy_imports(modules) == []
+
+    def test_help_skips_heavy_dependencies(self):
+        """Test ``sekha query --help`` never builds a client."""
+        modules = import_profile(
+            "from sekha_cli.main import cli\n"
+            "try:\n"
+            "    cli(['query', '--help'])\n"
+            "except SystemExit:\n"
+            "    pass\n"
+        )
+
+        assert heavy_imports(modules) == []
+
+    def test_import_time_budget(self):
+        """Test the cumulative import time of the entry point."""
+        modules = import_profile("import sekha_cli.main")
+
+        assert modules["sekha_cli.main"] < IMPORT_BUDGET_US
+
+    def test_completion_skips_click(self):
+        """Test completing a label imports neither click nor typing."""
+        env = dict(
+            os.environ,
+            _SEKHA_COMPLETE="bash_complete",
+            COMP_WORDS="sekha query --label ",
+            COMP_CWORD="3",
+        )
+        modules = import_profile(
+            "from sekha_cli.__main__ import main\nmain()\n", env=env
+        )
+
+        assert "sekha_cli.completion" in modules
+        assert "click" not in modules
+        assert "typing" not in modules
+        assert heavy_imports(modules) == []
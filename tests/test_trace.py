@@ -0,0 +1,169 @@
+"""Test span tracing."""
+import json
+import time
+
+import pytest
+
+from sekha_cli.trace import (
+    SUMMARY_COLUMNS,
+    TracedController,
+    Tracer,
+    format_summary,
+    traced,
+    tracer,
+)
+
+
+@pytest.fixture
+def active_tracer():
+    """Enable the shared tracer for one test."""
+    tracer.enable()
+    yield tracer
+    tracer.disable()
+
+
+class TestTracer:
+    """Test span recording and aggregation."""
+
+    def test_disabled_tracer_records_nothing(self):
+        """Test spans are no-ops until tracing is enabled."""
+        local = Tracer()
+
+        with local.span("client.query") as span:
+            span.set(bytes=10)
+
+        assert local.spans == []
+
+    def test_summary_aggregates_by_name(self):
+        """Test calls, bytes, retries and errors are summed per span name."""
+        local = Tracer()
+        local.enable()
+
+        for size in (10, 20):
+            with local.span("sdk.search") as span:
+                span.set(bytes=size)
+        with local.span("retry.wait", retries=1):
+            pass
+        with pytest.raises(ValueError):
+            with local.span("sdk.search"):
+                raise ValueError("boom")
+
+        rows = {row["name"]: row for row in local.summary()}
+        assert rows["sdk.search"]["count"] == 3
+        assert rows["sdk.search"]["bytes"] == 30
+        assert rows["sdk.search"]["errors"] == 1
+        assert rows["retry.wait"]["retries"] == 1
+        assert local.spans[-1].attrs["error"] == "ValueError"
+
+    def test_error_records_http_status(self):
+        """Test an exception carrying a status code tags the span."""
+        local = Tracer()
+        local.enable()
+        error = RuntimeError("unavailable")
+        error.status_code = 503
+
+        with pytest.raises(RuntimeError):
+            with local.span("sdk.get"):
+                raise error
+
+        assert local.spans[0].attrs["http_status"] == 503
+
+    def test_add_records_elapsed_span(self):
+        """Test a span can be recorded from an earlier start time."""
+        local = Tracer()
+        local.enable()
+        start = time.perf_counter() - 0.5
+
+        local.add("startup", start)
+
+        assert local.spans[0].duration >= 0.5
+
+    def test_chrome_trace_format(self, tmp_path):
+        """Test the Chrome trace holds complete events in microseconds."""
+        local = Tracer()
+        local.enable()
+        with local.span("command.query", label="Work"):
+            time.sleep(0.01)
+
+        path = tmp_path / "trace.json"
+        local.write_chrome_trace(path)
+        data = json.loads(path.read_text(encoding="utf-8"))
+
+        (event,) = data["traceEvents"]
+        assert event["ph"] == "X"
+        assert event["name"] == "command.query"
+        assert event["cat"] == "command"
+        assert event["ts"] >= 0
+        assert event["dur"] >= 10_000
+        assert event["args"] == {"label": "Work"}
+
+    def test_format_summary(self):
+        """Test summary rows become display strings."""
+        local = Tracer()
+        local.enable()
+        with local.span("sdk.search", bytes=42):
+            pass
+
+        (row,) = format_summary(local.summary())
+
+        assert len(row) == len(SUMMARY_COLUMNS)
+        assert row[0] == "sdk.search"
+        assert row[5] == "42"
+        assert row[6] == "-"
+
+
+class TestTracedCalls:
+    """Test the decorator and the SDK proxy."""
+
+    def test_traced_decorator(self, active_tracer):
+        """Test decorated functions record one span per call."""
+
+        @traced("client.query")
+        def query(text):
+            return [text]
+
+        assert query("a") == ["a"]
+        assert [span.name for span in active_tracer.spans] == ["client.query"]
+
+    def test_traced_decorator_skips_when_disabled(self):
+        """Test nothing is recorded with tracing off."""
+
+        @traced("client.query")
+        def query(text):
+            return [text]
+
+        query("a")
+
+        assert tracer.spans == []
+
+    def test_traced_generator_spans_iteration(self, active_tracer):
+        """Test a decorated generator's span stays open until it is exhausted."""
+
+        @traced("client.archive_many")
+        def archive_many(ids):
+            for conversation_id in ids:
+                time.sleep(0.01)
+                yield conversation_id, None
+
+        outcomes = archive_many(["a", "b"])
+        assert active_tracer.spans == []
+
+        assert list(outcomes) == [("a", None), ("b", None)]
+        [span] = active_tracer.spans
+        assert span.name == "client.archive_many"
+        assert span.duration >= 0.02
+
+    def test_traced_controller_records_sdk_calls(self, active_tracer):
+        """Test proxied SDK calls record size and item count."""
+
+        class Controller:
+            def search(self, query, limit=10):
+                return [{"id": "conv-1"}, {"id": "conv-2"}]
+
+        controller = TracedController(Controller())
+
+        assert len(controller.search("x", limit=2)) == 2
+        (span,) = active_tracer.spans
+        assert span.name == "sdk.search"
+        assert span.attrs["items"] == 2
+        assert span.attrs["bytes"] == len('[{"id":"conv-1"},{"id":"conv-2"}]')